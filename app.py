@@ -2,8 +2,9 @@ import streamlit as st
 from streamlit_option_menu import option_menu
 
 # Importando nossos novos módulos
-from src.utils import ui_helper
-from src.views import optimization_view, physics_view, thermal_view
+# As views (e o Plotly que elas puxam) são importadas dentro do roteamento, só
+# quando a aba é aberta pela primeira vez; depois ficam em sys.modules.
+from src.utils import ui_helper, profiling
 
 # 1. Configuração Global
 st.set_page_config(
@@ -12,50 +13,78 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Instrumentação opcional (?debug=1 na URL ou TANK_PROFILE=1), só para esta sessão
+debug_mode = profiling.ENABLED_BY_ENV or st.query_params.get("debug") == "1"
+profiling.set_enabled(debug_mode)
+
 # 2. Carregar Recursos
-ui_helper.load_css("assets/style.css")
-ui_helper.render_header()
+with profiling.span("app.css"):
+    ui_helper.load_css("assets/style.css")
+with profiling.span("app.header"):
+    ui_helper.render_header()
 
 # 3. Sidebar (Inputs Globais)
-st.sidebar.markdown("""
-<div class="sidebar-header">
-    <i class='bi bi-sliders icon-blue'></i> &nbsp; Parâmetros de Projeto
-</div>
-""", unsafe_allow_html=True)
-
-st.sidebar.markdown("**Forma do Recipiente:**")
-geometry_type = st.sidebar.selectbox("Selecione:", ["Cilindro (Padrão)", "Prisma Regular (Polígono)"], label_visibility="collapsed")
-
-num_sides = 0
-if geometry_type == "Prisma Regular (Polígono)":
-    num_sides = st.sidebar.slider("Lados (n)", 3, 12, 4)
-
-st.sidebar.markdown("---")
-target_volume = st.sidebar.number_input("Volume Alvo (m³)", min_value=10.0, value=1000.0)
-cost_base = st.sidebar.number_input("Custo Base (R$/m²)", min_value=1.0, value=20.0)
-cost_side = st.sidebar.number_input("Custo Lateral (R$/m²)", min_value=1.0, value=10.0)
-
-st.sidebar.markdown("---")
-st.sidebar.caption("Projeto - Grupo só por DX")
-
-# 4. Navegação
-selected = option_menu(
-    menu_title=None,
-    options=["Otimização", "Massa & Volume", "Simulação Térmica"],
-    icons=["calculator", "box-seam", "thermometer-sun"], 
-    orientation="horizontal",
-    styles={
-        "container": {"background-color": "transparent"},
-        "nav-link-selected": {"background-color": "#0d6efd"},
-    }
-)
+with profiling.span("app.sidebar"):
+    st.sidebar.markdown("""
+    <div class="sidebar-header">
+        <i class='bi bi-sliders icon-blue'></i> &nbsp; Parâmetros de Projeto
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.sidebar.markdown("**Forma do Recipiente:**")
+    geometry_type = st.sidebar.selectbox("Selecione:", ["Cilindro (Padrão)", "Prisma Regular (Polígono)"], label_visibility="collapsed")
+
+    num_sides = 0
+    if geometry_type == "Prisma Regular (Polígono)":
+        num_sides = st.sidebar.slider("Lados (n)", 3, 12, 4)
+
+    st.sidebar.markdown("---")
+    target_volume = st.sidebar.number_input("Volume Alvo (m³)", min_value=10.0, value=1000.0)
+    cost_base = st.sidebar.number_input("Custo Base (R$/m²)", min_value=1.0, value=20.0)
+    cost_side = st.sidebar.number_input("Custo Lateral (R$/m²)", min_value=1.0, value=10.0)
+
+    st.sidebar.markdown("---")
+    st.sidebar.checkbox("Gráficos leves (conexões lentas)", key="light_charts",
+                        help="Menos pontos, WebGL e números compactos: reduz o payload de cada gráfico.")
+    st.sidebar.caption("Projeto - Grupo só por DX")
+
+# 4. Navegação (?aba=<nome> abre direto numa aba: links e o teste de carga multi-sessão)
+with profiling.span("app.menu"):
+    tabs = ["Otimização", "Varredura", "Parque", "Massa & Volume", "Simulação Térmica"]
+    requested_tab = st.query_params.get("aba")
+    selected = option_menu(
+        menu_title=None,
+        options=tabs,
+        icons=["calculator", "grid-3x3", "buildings", "box-seam", "thermometer-sun"], 
+        default_index=tabs.index(requested_tab) if requested_tab in tabs else 0,
+        orientation="horizontal",
+        styles={
+            "container": {"background-color": "transparent"},
+            "nav-link-selected": {"background-color": "#0d6efd"},
+        }
+    )
 
 # 5. Roteamento (Controller Principal)
-if selected == "Otimização":
-    optimization_view.render(geometry_type, num_sides, target_volume, cost_base, cost_side)
+with profiling.span(f"view.{selected}"):
+    if selected == "Otimização":
+        from src.views import optimization_view
+        optimization_view.render(geometry_type, num_sides, target_volume, cost_base, cost_side)
+
+    elif selected == "Varredura":
+        from src.views import sweep_view
+        sweep_view.render(target_volume, cost_base, cost_side)
+
+    elif selected == "Parque":
+        from src.views import farm_view
+        farm_view.render(geometry_type, num_sides, target_volume, cost_base, cost_side)
+
+    elif selected == "Massa & Volume":
+        from src.views import physics_view
+        physics_view.render(geometry_type, num_sides, target_volume, cost_base, cost_side)
 
-elif selected == "Massa & Volume":
-    physics_view.render(geometry_type, num_sides, target_volume, cost_base, cost_side)
+    elif selected == "Simulação Térmica":
+        from src.views import thermal_view
+        thermal_view.render(geometry_type, num_sides, target_volume, cost_base, cost_side)
 
-elif selected == "Simulação Térmica":
-    thermal_view.render()
+if debug_mode:
+    ui_helper.render_timing_panel()
@@ -0,0 +1,106 @@
+"""
+Suíte de benchmarks (offline). Roda todos os módulos, grava uma linha de base e
+aponta regressões em relação a ela.
+
+    python -m benchmarks                      # roda tudo e compara com a linha de base
+    python -m benchmarks --quick              # lotes até 10^5, menos repetições
+    python -m benchmarks --save-baseline      # grava os tempos atuais como linha de base
+    python -m benchmarks --only controllers views
+
+Código de saída 1 quando alguma medição fica mais lenta que a linha de base além da tolerância
+e 2 quando não há linha de base (ou ela foi gravada no outro modo, com/sem --quick).
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+SUITES = ("controllers", "physics", "heat", "views", "farm", "app", "startup")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Tempos abaixo disso variam mais com ruído do que com o código
+NOISE_FLOOR_S = 50e-6
+
+
+def run_suites(names, quick):
+    results = []
+    for name in names:
+        module = importlib.import_module(f"benchmarks.bench_{name}")
+        start = time.perf_counter()
+        suite_results = module.run(quick=quick)
+        print(f"[{name}] {len(suite_results)} medições em {time.perf_counter() - start:.1f} s", file=sys.stderr)
+        results.extend(dict(r, suite=name) for r in suite_results)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Retorna as linhas do relatório e a lista de regressões."""
+    base = {r["name"]: r["seconds"] for r in baseline.get("results", [])}
+    lines, regressions = [], []
+    width = max(len(r["name"]) for r in results)
+    for r in results:
+        old = base.get(r["name"])
+        now = r["seconds"]
+        if old is None:
+            status, ratio = "novo", float("nan")
+        else:
+            ratio = now / old if old > 0 else float("inf")
+            slower = ratio > 1 + tolerance and now - old > NOISE_FLOOR_S
+            faster = ratio < 1 - tolerance and old - now > NOISE_FLOOR_S
+            status = "REGRESSÃO" if slower else ("melhor" if faster else "ok")
+            if slower:
+                regressions.append(r["name"])
+        lines.append(f"{r['name']:<{width}}  {now * 1e3:>11.4f} ms  x{ratio:>6.2f}  {status}")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos controllers, das views e do app.")
+    parser.add_argument("--quick", action="store_true", help="Versão rápida (lotes até 10^5)")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=list(SUITES), help="Suítes a rodar")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Arquivo JSON da linha de base")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como nova linha de base")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Lentidão relativa tolerada (padrão: 0.25)")
+    args = parser.parse_args(argv)
+
+    # Sem linha de base não há o que comparar: falha logo, em vez de medir tudo e passar sem checar nada
+    if not args.save_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"ERRO: sem linha de base em {args.baseline}; nenhuma regressão seria verificada. "
+                  "Rode com --save-baseline (na mesma máquina) para criar uma.", file=sys.stderr)
+            return 2
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("quick", False) != args.quick:
+            print(f"ERRO: a linha de base {args.baseline} foi gravada {'com' if baseline.get('quick') else 'sem'} "
+                  "--quick; compare no mesmo modo.", file=sys.stderr)
+            return 2
+
+    results = run_suites(args.only, args.quick)
+
+    if args.save_baseline:
+        payload = {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "quick": args.quick,
+            "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            "results": results,
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"Linha de base gravada em {args.baseline} ({len(results)} medições)")
+        return 0
+
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.tolerance:.0%}:", *regressions, sep="\n  ")
+        return 1
+    print("\nNenhuma regressão.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import time
+
+
+def best_of(func, repeat=5, number=1):
+    """Menor tempo (s) de `number` chamadas de func entre `repeat` rodadas."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def quiet_streamlit():
+    """Silencia os avisos do Streamlit ('No runtime found', depreciações) durante as medições."""
+    from streamlit import logger
+
+    logger.set_log_level("error")
+
+
+def print_results(results):
+    """Imprime uma tabela simples com os resultados de um módulo de benchmark."""
+    width = max(len(r["name"]) for r in results)
+    for r in results:
+        extra = "  ".join(f"{k}={v:.3g}" for k, v in r.items() if k not in ("name", "seconds", "suite"))
+        print(f"{r['name']:<{width}}  {r['seconds'] * 1e3:>11.4f} ms  {extra}")
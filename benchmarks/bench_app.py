@@ -0,0 +1,56 @@
+"""
+App completo: reruns de app.py pelo harness headless do Streamlit (AppTest).
+Mede a primeira execução (caches vazios) e reruns com os mesmos parâmetros e
+com um parâmetro alterado.
+
+    python -m benchmarks.bench_app
+"""
+import os
+import time
+
+from benchmarks._timing import print_results, quiet_streamlit
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def run(quick=False):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    quiet_streamlit()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+
+    def rerun_seconds(n):
+        best = float("inf")
+        for _ in range(n):
+            start = time.perf_counter()
+            at.run()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    n = 3 if quick else 10
+    warm = rerun_seconds(n)
+
+    volume_input = at.sidebar.number_input[0]
+    changed = float("inf")
+    for i in range(n):
+        volume_input.set_value(1000.0 + 10 * (i + 1))
+        start = time.perf_counter()
+        at.run()
+        changed = min(changed, time.perf_counter() - start)
+
+    return [
+        {"name": "app rerun (frio)", "seconds": cold},
+        {"name": "app rerun (mesmos parâmetros)", "seconds": warm},
+        {"name": "app rerun (volume alterado)", "seconds": changed},
+    ]
+
+
+if __name__ == "__main__":
+    print_results(run())
@@ -0,0 +1,164 @@
+"""
+Controllers: chamadas escalares e lotes de 1 a 10^7 projetos.
+
+    python -m benchmarks.bench_controllers
+"""
+import numpy as np
+
+from benchmarks._timing import best_of, print_results
+from src.controllers import catalog_logic, optimization_logic, physics_logic, thermal_logic
+
+CYL = "Cilindro (Padrão)"
+PRISM = "Prisma Regular (Polígono)"
+
+
+def _fleet(n, seed=0):
+    rng = np.random.default_rng(seed)
+    is_cyl = rng.random(n) < 0.3
+    return {
+        "geo_type": is_cyl,
+        "num_sides": np.where(is_cyl, 0, rng.integers(3, 13, n)),
+        "vol": rng.uniform(10, 5000, n),
+        "c_base": rng.uniform(1, 50, n),
+        "c_lat": rng.uniform(1, 50, n),
+        "c_weld": rng.uniform(0, 200, n),
+        "max_height": rng.uniform(3, 30, n),
+        "max_width": rng.uniform(5, 40, n),
+        "t_amb": rng.uniform(20, 40, n),
+        "k": rng.uniform(0.05, 0.3, n),
+    }
+
+
+def run(quick=False):
+    results = []
+
+    # 1. Chamadas escalares (caminho usado pelas views)
+    scalar_cases = {
+        "escalar geometria cilindro": lambda: optimization_logic.calculate_optimal_geometry(CYL, 0, 1000.0, 20.0, 10.0),
+        "escalar geometria prisma": lambda: optimization_logic.calculate_optimal_geometry(PRISM, 6, 1000.0, 20.0, 10.0),
+        "escalar curva de custo": lambda: optimization_logic.generate_cost_curve_data(4.3, 1000.0, 20.0, 10.0, CYL, 0, np.pi),
+        "escalar massa": lambda: physics_logic.calculate_mass_properties(CYL, 0, 1000.0, 20.0, 10.0, 8000.0, 7500.0),
+        "escalar resfriamento": lambda: thermal_logic.simulate_cooling(35.0, 5.0, 25.0, 24, 0.15),
+    }
+    for name, func in scalar_cases.items():
+        results.append({"name": name, "seconds": best_of(func, repeat=5, number=200)})
+
+    # 2. Lotes vetorizados
+    max_exp = 5 if quick else 7
+    for exp in range(0, max_exp + 1):
+        n = 10**exp
+        d = _fleet(n)
+        repeat = 5 if n <= 10**5 else 2
+        batch_cases = {
+            "lote geometria": lambda: optimization_logic.calculate_optimal_geometry_batch(
+                d["geo_type"], d["num_sides"], d["vol"], d["c_base"], d["c_lat"]),
+            "lote geometria (fórmula)": lambda: optimization_logic.calculate_optimal_geometry_batch(
+                d["geo_type"], d["num_sides"], d["vol"], d["c_base"], d["c_lat"], method="formula"),
+            "lote massa": lambda: physics_logic.calculate_mass_properties_batch(
+                d["geo_type"], d["num_sides"], d["vol"], d["c_base"], d["c_lat"], 8000.0, 7500.0),
+            "lote tempo até falha": lambda: thermal_logic.calculate_time_to_failure(d["t_amb"], 5.0, 25.0, d["k"]),
+            "lote otimizador restrito": lambda: optimization_logic.calculate_constrained_geometry_batch(
+                d["geo_type"], d["num_sides"], d["vol"], d["c_base"], 1.5 * d["c_base"], d["c_lat"],
+                d["c_weld"], d["max_height"], d["max_width"]),
+            "lote otimizador restrito (partida fria)": lambda: optimization_logic.calculate_constrained_geometry_batch(
+                d["geo_type"], d["num_sides"], d["vol"], d["c_base"], 1.5 * d["c_base"], d["c_lat"],
+                d["c_weld"], d["max_height"], d["max_width"], warm_start=False),
+        }
+        for name, func in batch_cases.items():
+            seconds = best_of(func, repeat=repeat)
+            results.append({"name": f"{name} n=10^{exp}", "seconds": seconds, "linhas_por_s": n / seconds})
+        del d
+
+    results.extend(_unit_table_accuracy(10**5 if quick else 10**6))
+    results.extend(_constrained_accuracy(10**4 if quick else 10**5))
+    results.extend(_catalog_search(5 if quick else 6))
+    return results
+
+
+def _catalog_bruteforce(geo_type, num_sides, vol, c_base, c_lat, catalog, widths, chunk=100_000):
+    """Referência: todas as combinações dimensão x largura de chapa, em blocos."""
+    _, _, _, k_area, _ = optimization_logic.calculate_optimal_geometry(geo_type, num_sides, vol, c_base, c_lat)
+    is_cyl = geo_type == CYL
+    scale, perimeter_coef = (0.5, 2 * np.pi) if is_cyl else (1.0, num_sides)
+    best = np.inf
+    for start in range(0, catalog.size, chunk):
+        cost, _ = catalog_logic._catalog_costs(catalog[start:start + chunk] * scale, vol, c_base, c_lat,
+                                               k_area, perimeter_coef, np.asarray(widths))
+        best = min(best, cost.min())
+    return best
+
+
+def _catalog_search(max_exp):
+    """Busca indexada no catálogo vs força bruta, para catálogos de 10^4 até 10^max_exp dimensões."""
+    results = []
+    widths = catalog_logic.STANDARD_PLATE_WIDTHS
+    lo, hi = catalog_logic.CATALOG_RANGE
+    for exp in range(4, max_exp + 1):
+        catalog = catalog_logic.build_catalog_index(np.linspace(lo, hi, 10**exp))
+        for label, geo, sides in (("cilindro", CYL, 0), ("prisma", PRISM, 6)):
+            args = (geo, sides, 1000.0, 20.0, 10.0, catalog)
+            indexed = catalog_logic.select_from_catalog(*args, widths)
+            brute = _catalog_bruteforce(*args, widths)
+            results.append({
+                "name": f"catálogo indexado {label} n=10^{exp}",
+                "seconds": best_of(lambda: catalog_logic.select_from_catalog(*args, widths), repeat=5, number=10),
+                "avaliadas": indexed[6], "igual_forca_bruta": float(abs(indexed[3] - brute) <= 1e-9 * brute),
+            })
+            results.append({
+                "name": f"catálogo força bruta {label} n=10^{exp}",
+                "seconds": best_of(lambda: _catalog_bruteforce(*args, widths), repeat=3),
+            })
+    return results
+
+
+def _unit_table_accuracy(n):
+    """
+    Tabela adimensional vs fórmula de Lagrange (lote) e vs o caminho escalar,
+    com n de 3 até o fim da tabela e o cilindro. Mede também a montagem da tabela.
+    """
+    rng = np.random.default_rng(2)
+    d = _fleet(n, seed=2)
+    sides = np.where(d["geo_type"], 0, rng.integers(3, optimization_logic.UNIT_TABLE_MAX_SIDES + 1, n))
+    args = (d["geo_type"], sides, d["vol"], d["c_base"], d["c_lat"])
+    table = optimization_logic.calculate_optimal_geometry_batch(*args)
+    formula = optimization_logic.calculate_optimal_geometry_batch(*args, method="formula")
+    batch_error = max(float(np.max(np.abs(t / f - 1))) for t, f in zip(table, formula))
+
+    scalar_error = 0.0
+    for i in range(1000):
+        geo = CYL if d["geo_type"][i] else PRISM
+        scalar = optimization_logic.calculate_optimal_geometry(geo, sides[i], d["vol"][i], d["c_base"][i], d["c_lat"][i])
+        scalar_error = max(scalar_error, *(abs(t[i] / v - 1) for t, v in zip(table, scalar[:4])))
+
+    build = optimization_logic.unit_solution_table.__wrapped__
+    return [
+        {"name": f"tabela adimensional vs fórmula n={n}", "seconds": best_of(lambda: optimization_logic.calculate_optimal_geometry_batch(*args), repeat=3),
+         "erro_lote": batch_error, "erro_escalar": scalar_error},
+        {"name": "tabela adimensional (montagem)", "seconds": best_of(build, repeat=5, number=10)},
+    ]
+
+
+def _constrained_accuracy(n):
+    """
+    Otimizador restrito no caso com forma fechada (tampa = fundo, sem solda,
+    sem limites): erro relativo máximo em relação à solução de Lagrange.
+    """
+    d = _fleet(n, seed=1)
+    ref_dim, _, ref_cost, _ = optimization_logic.calculate_optimal_geometry_batch(
+        d["geo_type"], d["num_sides"], d["vol"], d["c_base"], d["c_lat"])
+    results = []
+    for label, warm in (("quente", True), ("fria", False)):
+        func = lambda: optimization_logic.calculate_constrained_geometry_batch(
+            d["geo_type"], d["num_sides"], d["vol"], d["c_base"], d["c_base"], d["c_lat"], warm_start=warm)
+        opt_dim, _, min_cost, _, _ = func()
+        results.append({
+            "name": f"otimizador restrito vs Lagrange (partida {label}) n={n}",
+            "seconds": best_of(func, repeat=3),
+            "erro_dim": float(np.max(np.abs(opt_dim / ref_dim - 1))),
+            "erro_custo": float(np.max(np.abs(min_cost / ref_cost - 1))),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run())
@@ -0,0 +1,87 @@
+"""
+Parque de tanques: custo da malha única (farm_logic) conforme o parque cresce.
+Para cada tamanho mede a montagem da malha, a figura completa e a serialização
+(com o tamanho do payload), nos modos normal e leve. Até 1000 tanques compara com
+o desenho antigo, um go.Surface + dois Scatter3d por tanque.
+
+    python -m benchmarks.bench_farm
+"""
+from benchmarks._timing import best_of, print_results, quiet_streamlit
+
+FARM_SIZES = (10, 100, 1000, 5000, 20000)
+PER_TANK_MAX = 1000  # acima disso o desenho antigo leva segundos só para montar
+
+
+def _designs(n):
+    from src.controllers import farm_logic
+
+    return farm_logic.farm_designs(n, (100.0, 5000.0), "Cilindro (Padrão)", 0, 20.0, 10.0, mixed=True, seed=0)
+
+
+def _per_tank_figure(designs):
+    """Desenho antigo (optimization_view.build_3d_figure) repetido para cada tanque do parque."""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    from src.controllers import farm_logic
+
+    radius = farm_logic.circumradius(designs["is_cyl"], designs["num_sides"], designs["dim"])
+    cx, cy = farm_logic.farm_layout(radius)
+    fig = go.Figure()
+    for t in range(radius.size):
+        sides = designs["num_sides"][t]
+        theta = np.linspace(0, 2 * np.pi, 60 if designs["is_cyl"][t] else sides + 1)
+        theta_grid, z_grid = np.meshgrid(theta, np.linspace(0, designs["h"][t], 2))
+        x_grid = cx[t] + radius[t] * np.cos(theta_grid)
+        y_grid = cy[t] + radius[t] * np.sin(theta_grid)
+        fig.add_trace(go.Surface(z=z_grid, x=x_grid, y=y_grid, colorscale='Blues', showscale=False, opacity=0.8))
+        for ring in (0, 1):
+            fig.add_trace(go.Scatter3d(x=x_grid[ring], y=y_grid[ring], z=z_grid[ring], mode='lines',
+                                       line=dict(color='black', width=2), showlegend=False))
+    return fig
+
+
+def run(quick=False):
+    import inspect
+
+    quiet_streamlit()
+    import plotly.io
+    import streamlit as st
+
+    from src.controllers import farm_logic
+    from src.views import farm_view
+
+    build_figure = inspect.unwrap(farm_view.build_farm_figure)
+    sizes = [n for n in FARM_SIZES if not quick or n <= 1000]
+    results = []
+    for n in sizes:
+        designs = _designs(n)
+        repeat = 5 if n <= 1000 else 2
+        for light in (False, True):
+            label = f"parque {n} tanques{' leve' if light else ''}"
+            mesh = farm_logic.build_farm(designs, light)[0]
+            results.append({"name": f"{label} (malha)", "seconds": best_of(lambda: farm_logic.build_farm(designs, light), repeat),
+                            "vertices": mesh["x"].size, "triangulos": mesh["i"].size})
+
+            def cold():
+                st.cache_data.clear()
+                return build_figure(n, 100.0, 5000.0, "Cilindro (Padrão)", 0, 20.0, 10.0, True, 0, light)
+
+            fig = cold()
+            results.append({"name": f"{label} (figura)", "seconds": best_of(cold, repeat)})
+            results.append({"name": f"{label} (serialização)",
+                            "seconds": best_of(lambda: plotly.io.to_json(fig, validate=False), repeat),
+                            "bytes": len(plotly.io.to_json(fig, validate=False)), "tracos": len(fig.data)})
+
+        if n <= PER_TANK_MAX and not (quick and n > 100):
+            old = _per_tank_figure(designs)
+            results.append({"name": f"parque {n} tanques, um traço por tanque (figura)",
+                            "seconds": best_of(lambda: _per_tank_figure(designs), 1 if n > 100 else 3)})
+            results.append({"name": f"parque {n} tanques, um traço por tanque (serialização)",
+                            "seconds": best_of(lambda: plotly.io.to_json(old, validate=False), 1 if n > 100 else 3),
+                            "bytes": len(plotly.io.to_json(old, validate=False)), "tracos": len(old.data)})
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run())
@@ -0,0 +1,91 @@
+"""
+Perfil térmico por altura (stratification_logic): escala com o número de nós.
+Para cada grade mede a integração de 24 h (1 e muitos tanques), o custo por
+nó·passo e o tempo de um passo isolado de Thomas contra a inversa densa
+pré-calculada (O(n_z) x O(n_z²)). A convergência é o tempo até a primeira
+camada crítica comparado com o da grade mais fina.
+
+    python -m benchmarks.bench_heat
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks._timing import best_of, print_results
+from src.controllers import stratification_logic
+
+GRID_SIZES = (10, 25, 50, 100, 200, 400)
+HORIZON_H = 24.0
+DT = 0.05
+
+
+def _tanks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {"h": rng.uniform(3, 20, n), "k": rng.uniform(0.05, 0.3, n), "t_amb": rng.uniform(30, 40, n)}
+
+
+def _integrate(d, n_z):
+    return stratification_logic.solve_heat_profile(
+        d["t_amb"], 5.0, 25.0, d["k"], d["h"], HORIZON_H, dt=DT, n_z=n_z, output_step=1.0
+    )
+
+
+def _step_operators(d, n_z):
+    lower, diag, upper, _, _ = stratification_logic.heat_operator(
+        d["h"], n_z, stratification_logic.DEFAULT_ALPHA, d["k"], stratification_logic.DEFAULT_H_TOP,
+        stratification_logic.DEFAULT_H_BOTTOM
+    )
+    m_lower, m_diag, m_upper = -DT * lower, 1.0 - DT * diag, -DT * upper
+    factors = stratification_logic.factor_tridiagonal(m_lower, m_diag, m_upper)
+    # Mesma matriz densa, um bloco n_z x n_z por tanque, invertida uma vez
+    dense = np.zeros((diag.shape[1], n_z, n_z))
+    rows = np.arange(n_z)
+    dense[:, rows, rows] = m_diag.T
+    dense[:, rows[1:], rows[:-1]] = m_lower[1:].T
+    dense[:, rows[:-1], rows[1:]] = m_upper[:-1].T
+    return factors, np.linalg.inv(dense)
+
+
+def run(quick=False):
+    sizes = [n for n in GRID_SIZES if not quick or n <= 100]
+    fleets = {1: _tanks(1), (100 if quick else 1000): _tanks(100 if quick else 1000)}
+    n_steps = int(round(HORIZON_H / DT))
+    reference = {n: _integrate(d, max(sizes))[3] for n, d in fleets.items()}
+
+    results = []
+    for n_z in sizes:
+        for n_tanks, d in fleets.items():
+            seconds = best_of(lambda: _integrate(d, n_z), repeat=3 if quick else 5)
+            time_to_fail = _integrate(d, n_z)[3]
+            results.append({
+                "name": f"perfil 24 h, {n_z} nós, {n_tanks} tanque(s)",
+                "seconds": seconds,
+                "ns_no_passo": seconds / (n_steps * n_z * n_tanks) * 1e9,
+                "erro_h": float(np.nanmax(np.abs(time_to_fail - reference[n_tanks]))),
+            })
+
+        d = fleets[max(fleets)]
+        factors, inverse = _step_operators(d, n_z)
+        rhs = np.random.default_rng(1).uniform(5, 35, (n_z, d["h"].size))
+        results.append({"name": f"passo Thomas, {n_z} nós, {d['h'].size} tanques",
+                        "seconds": best_of(lambda: stratification_logic.solve_factored(factors, rhs.copy()), repeat=5)})
+        results.append({"name": f"passo inversa densa, {n_z} nós, {d['h'].size} tanques",
+                        "seconds": best_of(lambda: np.einsum('tij,jt->it', inverse, rhs), repeat=5)})
+
+    # Corrida longa com checkpoint em memmap (1 semana, amostras de hora em hora)
+    d = fleets[max(fleets)]
+    with tempfile.TemporaryDirectory() as directory:
+        def checkpointed():
+            stratification_logic.solve_heat_profile_to_memmap(
+                directory, d["t_amb"], 5.0, 25.0, d["k"], d["h"], 24 * 7, dt=0.1, output_step=1.0, resume=False
+            )
+        seconds = best_of(checkpointed, repeat=1 if quick else 2)
+        written = sum(os.path.getsize(os.path.join(directory, f)) for f in stratification_logic.CHECKPOINT_FILES)
+    results.append({"name": f"perfil 1 semana em memmap, 50 nós, {d['h'].size} tanques",
+                    "seconds": seconds, "bytes": written})
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run())
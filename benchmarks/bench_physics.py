@@ -0,0 +1,44 @@
+"""
+Integração de massa: fórmula fechada (perfil linear) x quadratura de Gauss-Legendre.
+
+    python -m benchmarks.bench_physics
+"""
+import numpy as np
+
+from benchmarks._timing import best_of, print_results
+from src.controllers import physics_logic
+
+
+def run(quick=False):
+    n_tanks = 10_000 if quick else 1_000_000
+    rng = np.random.default_rng(0)
+    num_sides = rng.integers(3, 13, n_tanks)
+    vol = rng.uniform(10, 5000, n_tanks)
+    c_base = rng.uniform(1, 50, n_tanks)
+    c_lat = rng.uniform(1, 50, n_tanks)
+    fill = rng.uniform(0.2, 1.0, n_tanks)
+
+    closed = lambda: physics_logic.calculate_mass_properties_batch(False, num_sides, vol, c_base, c_lat, 8000.0, 7500.0)
+    linear = physics_logic.linear_profile(8000.0, 7500.0)
+    quad = lambda: physics_logic.calculate_mass_properties_profile(False, num_sides, vol, c_base, c_lat, linear, n_nodes=2)
+
+    # Estratificação medida: 500 camadas
+    z_layers = np.linspace(0, 1, 501)
+    layers = physics_logic.make_profile(z_layers, 8000 - 500 * z_layers[:-1] ** 2, kind="step")
+    stratified = lambda: physics_logic.calculate_mass_properties_profile(
+        False, num_sides, vol, c_base, c_lat, layers, fill_level=fill
+    )
+
+    mass_closed, z_closed = closed()[:2]
+    mass_quad, z_quad = quad()[:2]
+    rel_err = float(max(np.max(np.abs(mass_quad / mass_closed - 1)), np.max(np.abs(z_quad / z_closed - 1))))
+
+    return [
+        {"name": f"massa linear fechada (n={n_tanks})", "seconds": best_of(closed)},
+        {"name": f"massa linear quadratura (n={n_tanks})", "seconds": best_of(quad), "erro_rel": rel_err},
+        {"name": f"massa 500 camadas + enchimento (n={n_tanks})", "seconds": best_of(stratified)},
+    ]
+
+
+if __name__ == "__main__":
+    print_results(run())
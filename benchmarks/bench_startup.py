@@ -0,0 +1,139 @@
+"""
+Partida a frio: tempo de import por módulo (python -X importtime) num processo novo.
+
+Cenários:
+    base        só streamlit + streamlit_option_menu (o piso de qualquer partida)
+    app         primeira execução de app.py (AppTest), como num container recém-criado
+    view.<nome> primeiro acesso a cada aba: import da view depois da base
+
+    python -m benchmarks.bench_startup                 # resumo + módulos mais caros do app
+    python -m benchmarks.bench_startup --top 40 --scenario view.optimization_view
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks._timing import print_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VIEWS = ("optimization_view", "sweep_view", "farm_view", "physics_view", "thermal_view")
+
+BASE_CODE = "import streamlit; from streamlit_option_menu import option_menu"
+SCENARIOS = {
+    "base": BASE_CODE,
+    "app": (
+        "from streamlit import logger; logger.set_log_level('error')\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        f"AppTest.from_file({os.path.join(ROOT, 'app.py')!r}, default_timeout=120).run()"
+    ),
+    **{f"view.{name}": f"{BASE_CODE}\nimport src.views.{name}" for name in VIEWS},
+}
+
+
+def parse_importtime(stderr):
+    """
+    Interpreta a saída de -X importtime.
+    Retorna: lista de (módulo, self_s, cumulativo_s, profundidade) na ordem de conclusão
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6, depth))
+    return rows
+
+
+def profile_imports(code, repeat=1):
+    """
+    Roda `code` num interpretador novo, `repeat` vezes, e fica com a rodada mais rápida
+    (a partida a frio varia bastante com o cache de disco e a carga da máquina).
+    Retorna: (segundos de parede, linhas do importtime)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              cwd=ROOT, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(f"Falha no cenário de partida:\n{proc.stderr[-2000:]}")
+        if best is None or elapsed < best[0]:
+            best = (elapsed, parse_importtime(proc.stderr))
+    return best
+
+
+def module_times(rows, exclude=()):
+    """Tempo próprio somado por módulo, ignorando os já carregados em `exclude`."""
+    skip = set(exclude)
+    return {name: self_s for name, self_s, _, _ in rows if name not in skip}
+
+
+def package_totals(times):
+    """Tempo próprio agrupado pelo pacote raiz (numpy, plotly, src, ...)."""
+    totals = {}
+    for name, self_s in times.items():
+        root = name.split(".")[0]
+        totals[root] = totals.get(root, 0.0) + self_s
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def run(quick=False):
+    repeat = 1 if quick else 3
+    _, base_rows = profile_imports(SCENARIOS["base"], repeat)
+    base_modules = {name for name, *_ in base_rows}
+    base_import = sum(self_s for _, self_s, _, _ in base_rows)
+
+    app_wall, app_rows = profile_imports(SCENARIOS["app"], repeat)
+    results = [
+        {"name": "partida import base", "seconds": base_import},
+        {"name": "partida app (processo novo)", "seconds": app_wall},
+    ]
+    for name in VIEWS:
+        _, rows = profile_imports(SCENARIOS[f"view.{name}"], repeat)
+        extra = module_times(rows, exclude=base_modules)
+        results.append({"name": f"partida import {name}", "seconds": sum(extra.values()), "modulos": len(extra)})
+
+    # Quanto do app ficou para depois: módulos de views carregados na primeira execução
+    loaded = {name for name, *_ in app_rows}
+    results[1]["views_carregadas"] = sum(f"src.views.{name}" in loaded for name in VIEWS)
+    return results
+
+
+def report(scenario, top):
+    """Imprime os módulos mais caros (tempo próprio) e o total por pacote de um cenário."""
+    wall, rows = profile_imports(SCENARIOS[scenario])
+    exclude = ()
+    if scenario.startswith("view."):
+        exclude = {name for name, *_ in profile_imports(SCENARIOS["base"])[1]}
+    times = module_times(rows, exclude)
+
+    print(f"Cenário {scenario}: {wall * 1e3:.0f} ms de parede, {len(times)} módulos, "
+          f"{sum(times.values()) * 1e3:.0f} ms em imports\n")
+    print("Por pacote:")
+    for root, seconds in list(package_totals(times).items())[:15]:
+        print(f"  {root:<40} {seconds * 1e3:>9.1f} ms")
+    print(f"\nMódulos mais caros (tempo próprio, top {top}):")
+    for name, seconds in sorted(times.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"  {name:<60} {seconds * 1e3:>9.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de import por módulo na partida a frio do app.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), help="Detalha um cenário em vez do resumo")
+    parser.add_argument("--top", type=int, default=25, help="Módulos listados no detalhe (padrão: 25)")
+    args = parser.parse_args(argv)
+
+    if args.scenario:
+        report(args.scenario, args.top)
+    else:
+        print_results(run())
+        print()
+        report("app", args.top)
+
+
+if __name__ == "__main__":
+    main()
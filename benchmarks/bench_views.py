@@ -0,0 +1,65 @@
+"""
+Views: custo de montar cada figura Plotly (com caches vazios) e de serializá-la
+para JSON, que é o que st.plotly_chart envia ao navegador. Cada figura é medida
+no modo normal e no modo leve, com o tamanho do payload e a economia em bytes.
+
+    python -m benchmarks.bench_views
+"""
+from benchmarks._timing import best_of, print_results, quiet_streamlit
+
+
+def _figure_cases():
+    import inspect
+
+    import streamlit as st
+
+    from src.utils import cache_helper
+    from src.views import optimization_view, physics_view, sweep_view, thermal_view
+
+    def cold(builder, *args):
+        def build(light):
+            st.cache_data.clear()
+            return inspect.unwrap(builder)(*args, light)
+        return build
+
+    opt_dim, opt_h, min_cost, k_area, _ = inspect.unwrap(cache_helper.optimal_geometry)("Cilindro (Padrão)", 0, 1000.0, 20.0, 10.0)
+    _, _, h_mass, rho_b, B = inspect.unwrap(cache_helper.mass_properties)("Cilindro (Padrão)", 0, 1000.0, 20.0, 10.0, 8000.0, 7500.0)
+    sides = tuple(range(3, 13)) + (0,)
+    return {
+        "otimização 3D": cold(optimization_view.build_3d_figure, "Cilindro (Padrão)", 0, opt_dim, opt_h),
+        "otimização curva de custo": cold(optimization_view.build_cost_curve_figure,
+                                          "Cilindro (Padrão)", 0, 1000.0, 20.0, 10.0, opt_dim, min_cost, k_area),
+        "otimização monte carlo": cold(optimization_view.build_cost_histogram_figure,
+                                       "Cilindro (Padrão)", 0, 1000.0, 20.0, 10.0, 0.15, 0.15, 0.05, 100_000, min_cost),
+        "massa densidade": cold(physics_view.build_density_figure, h_mass, rho_b, B),
+        "térmica 24 h": cold(thermal_view.build_temperature_figure, 35.0, 0.0, 5.0, 25.0, 24, 0.15),
+        "térmica ciclo 21 dias": cold(thermal_view.build_temperature_figure, 35.0, 8.0, 5.0, 25.0, 24 * 21, 0.15),
+        "varredura heatmap": cold(sweep_view.build_heatmap_figure, "cost", 10, 60, sides, 1000.0, 10.0),
+    }
+
+
+def run(quick=False):
+    import plotly.io
+
+    quiet_streamlit()
+    results = []
+    for name, build in _figure_cases().items():
+        normal_bytes = None
+        for light in (False, True):
+            label = f"{name} leve" if light else name
+            fig = build(light)
+            n_bytes = len(plotly.io.to_json(fig, validate=False))
+            results.append({"name": f"figura {label} (montagem)",
+                            "seconds": best_of(lambda: build(light), repeat=3 if quick else 5)})
+            serialization = {"name": f"figura {label} (serialização)",
+                             "seconds": best_of(lambda: plotly.io.to_json(fig, validate=False), repeat=5),
+                             "bytes": n_bytes}
+            if light:
+                serialization["economia"] = 1 - n_bytes / normal_bytes
+            normal_bytes = n_bytes
+            results.append(serialization)
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run())
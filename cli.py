@@ -0,0 +1,242 @@
+"""
+Otimização em lote (sem Streamlit).
+
+Lê uma tabela de projetos (CSV ou Parquet) em blocos de tamanho fixo, aplica as
+fórmulas de optimization_logic e physics_logic de forma vetorizada e grava os
+resultados incrementalmente, mantendo a memória limitada ao tamanho do bloco.
+
+Colunas de entrada:
+    vol, c_base, c_lat          (obrigatórias)
+    num_sides                   (opcional, 0 = cilindro; prismas: inteiro >= 3)
+    geo_type                    (opcional, mesmos rótulos do app)
+    rho_base, rho_top           (opcionais, senão usa --rho-base/--rho-top)
+
+Com --store, os resultados são publicados num cache SQLite compartilhado com o
+app (mesmas chaves de src/utils/result_store.py). O lote não consulta o cache:
+as fórmulas fechadas vetorizadas custam menos que a consulta de cada projeto.
+
+Exemplo:
+    python cli.py projetos.csv -o resultados.parquet --chunk-size 500000 --workers 0
+    python cli.py projetos.csv -o resultados.csv --store .cache/results.db
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.controllers.optimization_logic import calculate_optimal_geometry_batch
+from src.controllers.physics_logic import mass_properties_from_geometry
+from src.utils.result_store import ResultStore, design_keys
+
+REQUIRED_COLUMNS = ("vol", "c_base", "c_lat")
+OPTIONAL_COLUMNS = ("num_sides", "geo_type", "rho_base", "rho_top")
+OUTPUT_COLUMNS = ("opt_dim", "opt_h", "min_cost", "k_area", "total_mass", "z_cm")
+CYLINDER_LABEL = "Cilindro (Padrão)"
+
+_stores = {}  # um ResultStore por caminho, reaproveitado pelo processo (ou worker)
+
+
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def iter_chunks(path, chunk_size):
+    """Gera blocos {coluna: np.ndarray} da tabela de entrada."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        wanted = [c for c in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=wanted):
+            yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in wanted}
+    else:
+        import pandas as pd
+
+        usecols = lambda c: c in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+        for frame in pd.read_csv(path, chunksize=chunk_size, usecols=usecols):
+            yield {name: frame[name].to_numpy() for name in frame.columns}
+
+
+def _solve(geo_type, num_sides, vol, c_base, c_lat, rho_b, rho_t):
+    opt_dim, opt_h, min_cost, k_area = calculate_optimal_geometry_batch(geo_type, num_sides, vol, c_base, c_lat)
+    total_mass, z_cm, _, B = mass_properties_from_geometry(opt_dim, opt_h, k_area, rho_b, rho_t)
+    return {"opt_dim": opt_dim, "opt_h": opt_h, "min_cost": min_cost, "k_area": k_area,
+            "total_mass": total_mass, "z_cm": z_cm, "B": B}
+
+
+def _publish(store, geo_type, num_sides, vol, c_base, c_lat, rho_b, rho_t, solved):
+    """
+    Grava os resultados do bloco no cache persistente, no mesmo formato dos
+    resultados escalares (cache_helper.optimal_geometry / mass_properties), para
+    os outros processos (o app). O bloco não consulta o cache antes: as fórmulas
+    fechadas em lote custam bem menos que uma consulta ao SQLite por projeto.
+    """
+    n_rows = len(solved["opt_dim"])
+    geo_type = np.asarray(geo_type)
+    is_cyl = geo_type if geo_type.dtype == bool else (geo_type == CYLINDER_LABEL)
+    is_cyl, rho_b = (np.broadcast_to(np.asarray(x), (n_rows,)) for x in (is_cyl, rho_b))
+    geo_keys = design_keys("optimal_geometry", is_cyl, num_sides, vol, c_base, c_lat)
+    mass_keys = design_keys("mass_properties", is_cyl, num_sides, vol, c_base, c_lat, rho_b, rho_t)
+    label = np.where(is_cyl, "Raio (r)", "Lado (L)")
+    columns = lambda *names: zip(*(np.asarray(solved[n] if isinstance(n, str) else n, dtype=float).tolist() for n in names))
+    store.put_many("optimal_geometry", dict(zip(geo_keys, (
+        (*values, lab) for values, lab in zip(columns("opt_dim", "opt_h", "min_cost", "k_area"), label.tolist())
+    ))))
+    store.put_many("mass_properties", dict(zip(mass_keys, columns("total_mass", "z_cm", "opt_h", rho_b, "B"))))
+
+
+def _store(path):
+    if path not in _stores:
+        _stores[path] = ResultStore(path)
+    return _stores[path]
+
+
+def _process_in_worker(chunk, rho_base, rho_top, store_path):
+    """process_chunk num worker + os contadores do cache gerados no bloco (somados no processo principal)."""
+    result = process_chunk(chunk, rho_base, rho_top, store_path)
+    return result, (_store(store_path).take_counters() if store_path else None)
+
+
+def _check_num_sides(geo_type, num_sides):
+    """Prismas precisam de num_sides inteiro >= 3 (senão a fórmula dá inf/NaN em silêncio)."""
+    geo_type = np.asarray(geo_type)
+    is_cyl = geo_type if geo_type.dtype == bool else (geo_type == CYLINDER_LABEL)
+    is_cyl, n = np.broadcast_arrays(is_cyl, np.asarray(num_sides, dtype=float))
+    bad = ~is_cyl & ~((n >= 3) & (n == np.round(n)))
+    if bad.any():
+        rows = np.flatnonzero(bad)
+        raise ValueError(
+            f"{rows.size} projeto(s) de prisma com num_sides inválido (precisa ser inteiro >= 3), "
+            f"ex.: linha {rows[0]} do bloco com num_sides = {n[rows[0]]:g}"
+        )
+
+
+def process_chunk(chunk, rho_base=8000.0, rho_top=7500.0, store_path=None):
+    """Resolve um bloco inteiro de projetos. Retorna as colunas de entrada + resultados."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk]
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+
+    n_rows = len(chunk["vol"])
+    num_sides = chunk.get("num_sides", np.zeros(n_rows))
+    # Sem geo_type explícito, segue a convenção do app: num_sides = 0 é cilindro
+    geo_type = chunk["geo_type"] if "geo_type" in chunk else (np.asarray(num_sides) == 0)
+    _check_num_sides(geo_type, num_sides)
+    rho_b = chunk.get("rho_base", rho_base)
+    rho_t = chunk.get("rho_top", rho_top)
+
+    args = (geo_type, num_sides, chunk["vol"], chunk["c_base"], chunk["c_lat"], rho_b, rho_t)
+    solved = _solve(*args)
+    if store_path:
+        _publish(_store(store_path), *args, solved)
+
+    result = dict(chunk)
+    result.update((name, solved[name]) for name in OUTPUT_COLUMNS)
+    return result
+
+
+class ResultWriter:
+    """Grava blocos de resultado de forma incremental (CSV em append ou Parquet por row group)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, result):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table(result)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            import pandas as pd
+
+            pd.DataFrame(result).to_csv(
+                self.path, mode="a" if self._wrote_header else "w",
+                header=not self._wrote_header, index=False
+            )
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def run(input_path, output_path, chunk_size=250_000, workers=1, rho_base=8000.0, rho_top=7500.0, log=sys.stderr,
+        store_path=None):
+    """
+    Executa o pipeline completo. workers=1 processa no próprio processo;
+    workers=0 usa todos os núcleos. Retorna: (linhas_processadas, segundos)
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    writer = ResultWriter(output_path)
+    total_rows = 0
+    start = time.perf_counter()
+
+    def report(result, store_counters=None):
+        nonlocal total_rows
+        if store_counters:
+            _store(store_path).add_counters(store_counters)
+        writer.write(result)
+        total_rows += len(result["vol"])
+        elapsed = time.perf_counter() - start
+        print(f"{total_rows:>12,} linhas | {total_rows / elapsed:>12,.0f} linhas/s", file=log)
+
+    try:
+        if workers == 1:
+            for chunk in iter_chunks(input_path, chunk_size):
+                report(process_chunk(chunk, rho_base, rho_top, store_path))
+        else:
+            # Limita os blocos em voo para a memória não crescer com o arquivo
+            max_in_flight = 2 * workers
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for chunk in iter_chunks(input_path, chunk_size):
+                    pending.append(pool.submit(_process_in_worker, chunk, rho_base, rho_top, store_path))
+                    if len(pending) >= max_in_flight:
+                        report(*pending.popleft().result())
+                while pending:
+                    report(*pending.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return total_rows, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Otimização de tanques em lote a partir de CSV/Parquet.")
+    parser.add_argument("input", help="Tabela de projetos (.csv ou .parquet)")
+    parser.add_argument("-o", "--output", required=True, help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=250_000, help="Linhas por bloco (padrão: 250000)")
+    parser.add_argument("--workers", type=int, default=1, help="Processos em paralelo (0 = todos os núcleos)")
+    parser.add_argument("--rho-base", type=float, default=8000.0, help="Densidade na base (kg/m³)")
+    parser.add_argument("--rho-top", type=float, default=7500.0, help="Densidade no topo (kg/m³)")
+    parser.add_argument("--store", help="Publica os resultados no cache SQLite do app (TANK_RESULT_STORE)")
+    args = parser.parse_args(argv)
+
+    try:
+        rows, elapsed = run(args.input, args.output, args.chunk_size, args.workers, args.rho_base, args.rho_top,
+                            store_path=args.store)
+    except ValueError as exc:
+        parser.exit(2, f"Erro: {exc}\n")
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"Concluído: {rows:,} linhas em {elapsed:.2f} s ({rate:,.0f} linhas/s)", file=sys.stderr)
+    if args.store and args.store in _stores:
+        stats = _stores[args.store].stats()
+        print(f"Cache: {stats['puts']:,} resultados publicados, {stats['entries']:,} entradas, "
+              f"{stats['evictions']:,} descartes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
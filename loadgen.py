@@ -0,0 +1,173 @@
+"""
+Gerador de carga para o serviço HTTP/JSON (server.py), numa única máquina.
+
+Abre --connections conexões e, em cada uma, envia requisições em sequência
+(keep-alive) durante --duration segundos. Ao final imprime a vazão e a latência
+p50/p99, e o tamanho médio dos lotes que o servidor montou.
+
+Exemplos:
+    python loadgen.py --spawn                         # sobe o servidor num subprocesso
+    python loadgen.py --url http://127.0.0.1:8765 --connections 256 --endpoint /mass
+    python loadgen.py --spawn --window 0              # compara com o servidor sem janela de lote
+    python loadgen.py --spawn --no-keepalive          # uma conexão nova por requisição
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+SAMPLE_BODIES = {
+    "/optimize": {"vol": 1000.0, "c_base": 20.0, "c_lat": 10.0, "num_sides": 6},
+    "/mass": {"vol": 1000.0, "c_base": 20.0, "c_lat": 10.0, "num_sides": 0, "rho_base": 8000.0, "rho_top": 7500.0},
+    "/thermal": {"t_amb": 35.0, "t_initial": 5.0, "t_critical": 25.0, "k_const": 0.15},
+}
+
+
+def _request_bytes(host, path, body, keep_alive):
+    payload = json.dumps(body).encode("utf-8")
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + payload
+
+
+async def _read_response(reader):
+    """Lê uma resposta HTTP completa. Retorna: (status, corpo)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Conexão fechada pelo servidor")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length)
+    return int(status_line.split()[1]), body
+
+
+async def _client(host, port, path, body, keep_alive, deadline, latencies, errors):
+    request = _request_bytes(host, path, body, keep_alive)
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, _ = await _read_response(reader)
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            errors.append("conexão")
+            writer = None
+            await asyncio.sleep(0.01)
+            continue
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append(status)
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    _, body = await _read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+
+async def run_load(host, port, path="/optimize", connections=64, duration=10.0, keep_alive=True, body=None):
+    """
+    Executa a carga e devolve o resumo.
+    Retorna: dict com requests, errors, seconds, throughput, p50_ms, p99_ms e mean_batch
+    """
+    body = body if body is not None else SAMPLE_BODIES[path]
+    latencies, errors = [], []
+    before = (await _get_json(host, port, "/health"))["endpoints"][path]
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        _client(host, port, path, body, keep_alive, deadline, latencies, errors) for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    after = (await _get_json(host, port, "/health"))["endpoints"][path]
+    batches = after["batches"] - before["batches"]
+    ms = np.array(latencies) * 1e3 if latencies else np.array([np.nan])
+    return {
+        "requests": len(latencies), "errors": len(errors), "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(ms, 50)), "p99_ms": float(np.percentile(ms, 99)),
+        "mean_batch": (after["designs"] - before["designs"]) / batches if batches else 0.0,
+    }
+
+
+def _spawn_server(port, window):
+    """Sobe server.py num subprocesso e espera a porta aceitar conexões."""
+    server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+    process = subprocess.Popen(
+        [sys.executable, server_path, "--port", str(port), "--window", str(window)],
+        stderr=subprocess.DEVNULL,
+    )
+
+    async def wait_ready():
+        for _ in range(200):
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+                return
+            except OSError:
+                await asyncio.sleep(0.05)
+        raise RuntimeError("O servidor não respondeu a tempo")
+
+    asyncio.run(wait_ready())
+    return process
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço de tanques.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="Endereço do servidor")
+    parser.add_argument("--endpoint", choices=sorted(SAMPLE_BODIES), default="/optimize", help="Endpoint alvo")
+    parser.add_argument("--connections", type=int, default=64, help="Conexões simultâneas (padrão: 64)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Duração em segundos (padrão: 10)")
+    parser.add_argument("--no-keepalive", action="store_true", help="Abre uma conexão nova por requisição")
+    parser.add_argument("--spawn", action="store_true", help="Sobe server.py num subprocesso na porta da --url")
+    parser.add_argument("--window", type=float, default=2.0, help="Janela de lote (ms) do servidor com --spawn")
+    args = parser.parse_args(argv)
+
+    target = urlsplit(args.url)
+    host, port = target.hostname or "127.0.0.1", target.port or 80
+    process = _spawn_server(port, args.window) if args.spawn else None
+    try:
+        result = asyncio.run(run_load(host, port, args.endpoint, args.connections, args.duration,
+                                      not args.no_keepalive))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(f"{args.endpoint}: {args.connections} conexões, {'sem' if args.no_keepalive else 'com'} keep-alive")
+    print(f"  requisições  {result['requests']:>10,}  ({result['errors']} erros) em {result['seconds']:.1f} s")
+    print(f"  vazão        {result['throughput']:>10,.0f} req/s")
+    print(f"  latência p50 {result['p50_ms']:>10.2f} ms")
+    print(f"  latência p99 {result['p99_ms']:>10.2f} ms")
+    print(f"  lote médio   {result['mean_batch']:>10.1f} projetos")
+
+
+if __name__ == "__main__":
+    main()
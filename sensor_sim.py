@@ -0,0 +1,82 @@
+"""
+Simulador de sensores de temperatura para a frota (alimenta a aba Simulação Térmica).
+
+Cada tanque segue a Lei de Resfriamento de Newton com k e T_amb próprios (e um
+ruído de medição). As leituras saem no formato id_tanque,t_horas,temperatura_c,
+anexadas a um arquivo ou enviadas a um socket TCP local. O app lê a fonte
+configurada no servidor por TANK_SENSOR_SOURCE (arquivo:caminho ou socket:host:porta).
+
+Exemplos:
+    python sensor_sim.py --tanks 5000 --file leituras.csv
+    python sensor_sim.py --tanks 5000 --socket 127.0.0.1:9009 --speed 0.5
+    TANK_SENSOR_SOURCE=arquivo:leituras.csv streamlit run app.py
+"""
+import argparse
+import socket
+import sys
+import time
+
+import numpy as np
+
+
+def fleet(n_tanks, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "k": rng.uniform(0.05, 0.3, n_tanks),
+        "t_amb": rng.uniform(15, 40, n_tanks),
+        "t_initial": rng.uniform(0, 12, n_tanks),
+    }
+
+
+def readings(params, t_hours, noise, rng):
+    temp = params["t_amb"] + (params["t_initial"] - params["t_amb"]) * np.exp(-params["k"] * t_hours)
+    return temp + rng.normal(0, noise, temp.size)
+
+
+def format_batch(t_hours, temp):
+    ids = np.arange(temp.size)
+    return "".join(f"{i},{t_hours:.4f},{v:.3f}\n" for i, v in zip(ids.tolist(), temp.tolist()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador de leituras de temperatura da frota.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--file", help="Arquivo onde anexar as leituras")
+    target.add_argument("--socket", help="Destino TCP host:porta")
+    parser.add_argument("--tanks", type=int, default=1000, help="Número de tanques (padrão: 1000)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Segundos reais entre lotes (padrão: 1)")
+    parser.add_argument("--speed", type=float, default=0.25, help="Horas simuladas por lote (padrão: 0.25)")
+    parser.add_argument("--noise", type=float, default=0.05, help="Ruído de medição em °C (padrão: 0.05)")
+    parser.add_argument("--batches", type=int, default=0, help="Para após N lotes (0 = sem fim)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    params = fleet(args.tanks, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    sink = None
+    if args.socket:
+        host, _, port = args.socket.rpartition(":")
+        sink = socket.create_connection((host or "127.0.0.1", int(port)))
+
+    batch = 0
+    try:
+        while not args.batches or batch < args.batches:
+            t_hours = batch * args.speed
+            text = format_batch(t_hours, readings(params, t_hours, args.noise, rng))
+            if sink is not None:
+                sink.sendall(text.encode("utf-8"))
+            else:
+                with open(args.file, "a", encoding="utf-8") as f:
+                    f.write(text)
+            batch += 1
+            print(f"lote {batch}: t = {t_hours:.2f} h, {args.tanks} leituras", file=sys.stderr)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Serviço HTTP/JSON local (sem Streamlit) para as calculadoras do app.
+
+Só usa a biblioteca padrão (asyncio) + numpy. Requisições simultâneas que chegam
+dentro de uma janela curta (--window, em ms) são agrupadas num único lote e
+resolvidas de uma vez pelas funções vetorizadas dos controllers. As conexões
+HTTP/1.1 ficam abertas (keep-alive) entre requisições.
+
+Endpoints (POST, corpo JSON = um projeto ou uma lista de projetos):
+    /optimize   vol, c_base, c_lat, [num_sides=0], [geo_type]
+                -> opt_dim, opt_h, min_cost, k_area
+    /mass       os mesmos + [rho_base=8000], [rho_top=7500]
+                -> total_mass, z_cm, opt_h, B
+    /thermal    t_amb, t_initial, t_critical, k_const, [time_span]
+                -> time_to_fail (null se não cruza o limite)
+    GET /health -> status e estatísticas dos lotes
+
+Exemplo:
+    python server.py --port 8765
+    curl -s localhost:8765/optimize -d '{"vol": 1000, "c_base": 20, "c_lat": 10}'
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+from src.controllers.optimization_logic import calculate_optimal_geometry_batch
+from src.controllers.physics_logic import calculate_mass_properties_batch
+from src.controllers.thermal_logic import calculate_time_to_failure
+
+CYLINDER_LABEL = "Cilindro (Padrão)"
+BATCH_WINDOW_S = 0.002
+MAX_BATCH = 8192
+MAX_BODY_BYTES = 1 << 20
+KEEPALIVE_TIMEOUT_S = 15.0
+
+
+# --- Avaliadores vetorizados: colunas (arrays) -> colunas de resultado ---
+
+def _evaluate_optimize(cols):
+    opt_dim, opt_h, min_cost, k_area = calculate_optimal_geometry_batch(
+        cols["is_cyl"] > 0, cols["num_sides"], cols["vol"], cols["c_base"], cols["c_lat"]
+    )
+    return {"opt_dim": opt_dim, "opt_h": opt_h, "min_cost": min_cost, "k_area": k_area}
+
+
+def _evaluate_mass(cols):
+    total_mass, z_cm, opt_h, B = calculate_mass_properties_batch(
+        cols["is_cyl"] > 0, cols["num_sides"], cols["vol"], cols["c_base"], cols["c_lat"],
+        cols["rho_base"], cols["rho_top"]
+    )
+    return {"total_mass": total_mass, "z_cm": z_cm, "opt_h": opt_h, "B": B}
+
+
+def _evaluate_thermal(cols):
+    time_to_fail = calculate_time_to_failure(
+        cols["t_amb"], cols["t_initial"], cols["t_critical"], cols["k_const"], cols["time_span"]
+    )
+    return {"time_to_fail": np.atleast_1d(time_to_fail)}
+
+
+# Campos de cada endpoint: (nome, padrão). Padrão None = obrigatório.
+GEOMETRY_FIELDS = (("vol", None), ("c_base", None), ("c_lat", None), ("num_sides", 0.0))
+ENDPOINTS = {
+    "/optimize": (GEOMETRY_FIELDS, _evaluate_optimize),
+    "/mass": (GEOMETRY_FIELDS + (("rho_base", 8000.0), ("rho_top", 7500.0)), _evaluate_mass),
+    "/thermal": ((("t_amb", None), ("t_initial", None), ("t_critical", None), ("k_const", None),
+                  ("time_span", math.inf)), _evaluate_thermal),
+}
+
+
+def _has_geometry(fields):
+    return fields[0][0] == "vol"
+
+
+def endpoint_columns(fields):
+    """Nomes das colunas do lote: os campos do endpoint (+ is_cyl para geometrias)."""
+    return [name for name, _ in fields] + (["is_cyl"] if _has_geometry(fields) else [])
+
+
+def _check_geometry(i, row, is_cyl):
+    """
+    vol, c_base e c_lat finitos e positivos; prismas com num_sides inteiro >= 3
+    (a mesma regra de cli._check_num_sides). Fora disso as fórmulas devolvem
+    custos negativos ou lixo finito em vez de falhar.
+    """
+    for name, value in zip(("vol", "c_base", "c_lat"), row[:3]):
+        if not (math.isfinite(value) and value > 0):
+            raise ValueError(f"Projeto {i}: {name} deve ser finito e positivo")
+    n = row[3]
+    if not is_cyl and not (math.isfinite(n) and n >= 3 and n == round(n)):
+        raise ValueError(f"Projeto {i}: num_sides inválido para prisma (precisa ser inteiro >= 3): {n:g}")
+
+
+def parse_designs(payload, fields):
+    """
+    Valida o corpo JSON (um objeto ou uma lista de objetos) e converte cada
+    projeto numa tupla de floats na ordem de `fields` (+ is_cyl para geometrias).
+    Geometrias passam por _check_geometry.
+    Levanta ValueError com uma mensagem para o cliente.
+    """
+    designs = payload if isinstance(payload, list) else [payload]
+    if not designs:
+        raise ValueError("Lista de projetos vazia")
+
+    with_geometry = _has_geometry(fields)
+    rows = []
+    for i, design in enumerate(designs):
+        if not isinstance(design, dict):
+            raise ValueError(f"Projeto {i}: esperado um objeto JSON")
+        row = []
+        for name, default in fields:
+            value = design.get(name, default)
+            if value is None:
+                raise ValueError(f"Projeto {i}: campo obrigatório ausente: {name}")
+            try:
+                row.append(float(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"Projeto {i}: {name} deve ser numérico") from None
+        if with_geometry:
+            # Mesma convenção do cli.py: sem geo_type, num_sides = 0 é cilindro
+            geo_type = design.get("geo_type")
+            is_cyl = geo_type == CYLINDER_LABEL if geo_type is not None else row[3] == 0
+            _check_geometry(i, row, is_cyl)
+            row.append(float(is_cyl))
+        rows.append(tuple(row))
+    return rows
+
+
+class MicroBatcher:
+    """
+    Junta os projetos de requisições concorrentes e os resolve num único lote.
+    O lote é disparado quando a janela expira (contada a partir do primeiro
+    projeto em espera) ou quando atinge max_batch projetos.
+    """
+
+    def __init__(self, columns, evaluate, window=BATCH_WINDOW_S, max_batch=MAX_BATCH):
+        self.columns = columns
+        self.evaluate = evaluate
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._size = 0
+        self._timer = None
+        self.batches = 0
+        self.designs = 0
+
+    async def submit(self, rows):
+        """Enfileira os projetos de uma requisição. Retorna: {campo: lista de resultados}"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((rows, future))
+        self._size += len(rows)
+        if self._size >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._size = self._pending, [], 0
+        if not pending:
+            return
+
+        table = np.array([row for rows, _ in pending for row in rows], dtype=float)
+        try:
+            results = self.evaluate(dict(zip(self.columns, table.T)))
+        except Exception as exc:  # um erro no lote vira erro em todas as requisições dele
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.designs += len(table)
+        # Fatia as colunas de volta por requisição, na ordem de chegada
+        start = 0
+        columns = {name: values.tolist() for name, values in results.items()}
+        for rows, future in pending:
+            stop = start + len(rows)
+            if not future.done():
+                future.set_result({name: values[start:stop] for name, values in columns.items()})
+            start = stop
+
+
+class TankService:
+    def __init__(self, window=BATCH_WINDOW_S, max_batch=MAX_BATCH):
+        self.started = time.time()
+        self.requests = 0
+        self.batchers = {}
+        for path, (fields, evaluate) in ENDPOINTS.items():
+            self.batchers[path] = MicroBatcher(endpoint_columns(fields), evaluate, window, max_batch)
+
+    def health(self):
+        stats = {}
+        for path, batcher in self.batchers.items():
+            mean = batcher.designs / batcher.batches if batcher.batches else 0.0
+            stats[path] = {"batches": batcher.batches, "designs": batcher.designs, "mean_batch": mean}
+        return {"status": "ok", "uptime_s": time.time() - self.started, "requests": self.requests, "endpoints": stats}
+
+    async def dispatch(self, method, path, body):
+        """Retorna: (status HTTP, objeto JSON de resposta)"""
+        if path == "/health":
+            return (200, self.health()) if method == "GET" else (405, {"erro": "Use GET"})
+        if path not in ENDPOINTS:
+            return 404, {"erro": f"Endpoint desconhecido: {path}"}
+        if method != "POST":
+            return 405, {"erro": "Use POST"}
+
+        try:
+            payload = json.loads(body or b"null")
+            rows = parse_designs(payload, ENDPOINTS[path][0])
+        except json.JSONDecodeError as exc:
+            return 400, {"erro": f"JSON inválido: {exc.msg}"}
+        except ValueError as exc:
+            return 400, {"erro": str(exc)}
+
+        try:
+            columns = await self.batchers[path].submit(rows)
+        except Exception as exc:
+            return 500, {"erro": str(exc)}
+
+        records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        for record in records:
+            for name, value in record.items():
+                if isinstance(value, float) and not math.isfinite(value):
+                    record[name] = None
+        return 200, (records if isinstance(payload, list) else records[0])
+
+    async def handle_connection(self, reader, writer):
+        """Atende requisições em sequência na mesma conexão enquanto houver keep-alive."""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT_S)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"erro": "Linha de requisição inválida"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"erro": "Content-Length inválido"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"erro": f"Corpo maior que {MAX_BODY_BYTES} bytes"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                status, response = await self.dispatch(method.upper(), target.split("?", 1)[0], body)
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  413: "Payload Too Large", 500: "Internal Server Error"}[status]
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            + (f"Connection: keep-alive\r\nKeep-Alive: timeout={KEEPALIVE_TIMEOUT_S:.0f}\r\n" if keep_alive
+               else "Connection: close\r\n")
+            + "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, window=BATCH_WINDOW_S, max_batch=MAX_BATCH, ready=None):
+    """Sobe o serviço e atende até ser cancelado. `ready` (opcional) recebe a porta efetiva."""
+    service = TankService(window, max_batch)
+    server = await asyncio.start_server(service.handle_connection, host, port, backlog=1024)
+    bound_port = server.sockets[0].getsockname()[1]
+    print(f"Servindo em http://{host}:{bound_port} (janela de lote {window * 1e3:.1f} ms, até {max_batch} projetos)",
+          file=sys.stderr)
+    if ready is not None:
+        ready(bound_port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON das calculadoras de tanques.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço (padrão: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Porta (padrão: 8765; 0 = qualquer livre)")
+    parser.add_argument("--window", type=float, default=BATCH_WINDOW_S * 1e3,
+                        help="Janela de agrupamento em ms (padrão: 2; 0 = sem espera)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="Projetos por lote (padrão: 8192)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.window / 1e3, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Teste de carga multi-sessão do app Streamlit, num único processo (como um servidor).
+
+Cada sessão simulada é um AppTest de app.py rodando numa thread própria: troca
+de aba (?aba=<nome>), mexe nos parâmetros da barra lateral e espera um tempo de
+"leitura" entre as ações. Os caches do Streamlit (st.cache_data/cache_resource)
+são do processo, então as sessões se ajudam exatamente como no servidor real.
+
+Para cada número de sessões N mede a latência dos reruns (p50/p95/p99), a vazão
+(reruns/s), a CPU do processo (núcleos ocupados e ms de CPU por rerun) e a
+memória por sessão (alocações vivas criadas pela subida das N sessões, via
+tracemalloc, divididas por N; o RSS do processo vai junto). A varredura de N
+aponta onde o app satura: a vazão para de crescer ou o p95 passa do SLO.
+
+O AppTest também decodifica a árvore de elementos de cada rerun no mesmo
+processo (o navegador faria isso no cliente), então os números são um pouco
+pessimistas em relação ao servidor de verdade.
+
+Exemplos:
+    python sessionload.py                                  # varredura 1, 2, 4, ..., 32 sessões
+    python sessionload.py --sessions 1 4 16 32 --duration 30
+    python sessionload.py --sessions 8 --think 0 --by-action
+    python sessionload.py --json carga.json --slo 500
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from unittest import mock
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Os mesmos nomes do menu de app.py
+TABS = ("Otimização", "Varredura", "Parque", "Massa & Volume", "Simulação Térmica")
+GEOMETRIES = ("Cilindro (Padrão)", "Prisma Regular (Polígono)")
+# Valores discretos: sessões diferentes repetem combinações (acertos de cache realistas)
+VOLUMES = tuple(float(v) for v in np.round(np.geomspace(50, 20000, 40)))
+COSTS = (5.0, 10.0, 15.0, 20.0, 30.0, 50.0)
+ACTION_WEIGHTS = {"aba": 0.3, "volume": 0.3, "custos": 0.2, "geometria": 0.1, "graficos_leves": 0.1}
+
+
+def rss_bytes():
+    """Memória residente atual do processo (Linux); sem /proc, o pico (ru_maxrss)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _apply_action(at, action, rng):
+    """Aplica uma interação de usuário no AppTest (o rerun é feito por quem chama)."""
+    sidebar = at.sidebar
+    if action == "aba":
+        at.query_params["aba"] = str(rng.choice(TABS))
+    elif action == "volume":
+        sidebar.number_input[0].set_value(float(rng.choice(VOLUMES)))
+    elif action == "custos":
+        sidebar.number_input[1].set_value(float(rng.choice(COSTS)))
+        sidebar.number_input[2].set_value(float(rng.choice(COSTS)))
+    elif action == "geometria":
+        sidebar.selectbox[0].set_value(str(rng.choice(GEOMETRIES)))
+    elif action == "graficos_leves":
+        checkbox = sidebar.checkbox(key="light_charts")
+        checkbox.set_value(not checkbox.value)
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """
+    O AppTest instala um Runtime simulado no início de cada execução e o remove
+    no fim (Runtime._instance = None), o que derruba as outras sessões rodando ao
+    mesmo tempo; e compila app.py de novo a cada execução (um ScriptCache por
+    run). Dentro deste contexto Runtime.instance()/exists() devolvem o último
+    Runtime instalado e todas as execuções usam um único ScriptCache, como no
+    servidor, onde os dois são do processo.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    last = []
+    script_cache = ScriptCache()
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        if not last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last[0]
+
+    def exists(cls):
+        return cls._instance is not None or bool(last)
+
+    with mock.patch.multiple(Runtime, instance=classmethod(instance), exists=classmethod(exists)), \
+            mock.patch("streamlit.testing.v1.app_test.ScriptCache", lambda: script_cache):
+        yield
+
+
+class _Recorder:
+    """Latências e erros de todas as sessões (append sob lock)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.actions = []
+        self.errors = 0
+
+    def add(self, action, seconds, failed):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.actions.append(action)
+            self.errors += failed
+
+
+def _session(index, seed, think, warm_barrier, start_event, stop_event, recorder, failures):
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng((seed, index))
+    names, weights = list(ACTION_WEIGHTS), np.array(list(ACTION_WEIGHTS.values()))
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.query_params["aba"] = TABS[index % len(TABS)]
+        at.run()
+    except Exception as exc:  # a sessão morta não pode travar a barreira das outras
+        failures.append(repr(exc))
+        warm_barrier.abort()
+        return
+    warm_barrier.wait()
+    start_event.wait()
+
+    while not stop_event.is_set():
+        action = names[rng.choice(len(names), p=weights / weights.sum())]
+        _apply_action(at, action, rng)
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if not stop_event.is_set():
+            recorder.add(action, elapsed, len(at.exception) > 0)
+        if think > 0:
+            stop_event.wait(rng.exponential(think))
+
+
+def run_level(n_sessions, duration=20.0, think=0.5, seed=0):
+    """
+    Sobe n_sessions sessões, espera todas fazerem a primeira execução e mede
+    durante `duration` segundos.
+    Retorna: dict com sessions, reruns, errors, throughput, p50_ms/p95_ms/p99_ms/max_ms,
+             cpu_cores, cpu_ms_per_rerun, mem_mb_per_session, rss_mb e por_acao {ação: p50_ms}
+    """
+    recorder, failures = _Recorder(), []
+    warm_barrier = threading.Barrier(n_sessions + 1)
+    start_event, stop_event = threading.Event(), threading.Event()
+    # tracemalloc só na subida: o RSS não cai quando o nível anterior libera memória
+    # (o alocador reaproveita), então a diferença de RSS subestimaria as sessões
+    gc.collect()
+    tracemalloc.start()
+    threads = [
+        threading.Thread(target=_session, daemon=True,
+                         args=(i, seed, think, warm_barrier, start_event, stop_event, recorder, failures))
+        for i in range(n_sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        warm_barrier.wait()
+    except threading.BrokenBarrierError:
+        stop_event.set()
+        start_event.set()
+        raise RuntimeError(f"Sessão falhou na primeira execução: {failures[0]}")
+    finally:
+        session_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    start_event.set()
+    time.sleep(duration)
+    stop_event.set()
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    for thread in threads:
+        thread.join()
+
+    ms = np.array(recorder.latencies) * 1e3 if recorder.latencies else np.array([np.nan])
+    actions = np.array(recorder.actions)
+    n_reruns = len(recorder.latencies)
+    return {
+        "sessions": n_sessions, "reruns": n_reruns, "errors": recorder.errors, "seconds": wall,
+        "throughput": n_reruns / wall,
+        "p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)), "max_ms": float(np.max(ms)),
+        "cpu_cores": cpu / wall,
+        "cpu_ms_per_rerun": cpu / n_reruns * 1e3 if n_reruns else float("nan"),
+        "mem_mb_per_session": session_bytes / n_sessions / 2**20, "rss_mb": rss_bytes() / 2**20,
+        "por_acao": {a: float(np.percentile(ms[actions == a], 50)) for a in ACTION_WEIGHTS if np.any(actions == a)},
+    }
+
+
+def saturation(rows, slo_ms, min_gain=0.1):
+    """
+    Primeiro N em que o app satura: p95 acima do SLO ou vazão crescendo menos que
+    min_gain (relativo) enquanto o número de sessões aumenta.
+    Retorna: (N ou None, motivo)
+    """
+    previous = None
+    for row in rows:
+        if row["p95_ms"] > slo_ms:
+            return row["sessions"], f"p95 de {row['p95_ms']:.0f} ms acima do SLO de {slo_ms:.0f} ms"
+        if previous is not None and row["throughput"] < previous["throughput"] * (1 + min_gain):
+            return row["sessions"], (f"vazão parou de crescer ({previous['throughput']:.1f} -> "
+                                     f"{row['throughput']:.1f} reruns/s)")
+        previous = row
+    return None, "não saturou na faixa testada"
+
+
+def warm_up():
+    """Uma sessão passa por todas as abas: os caches partem quentes, como num servidor em uso."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    for tab in TABS:
+        at.query_params["aba"] = tab
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"app.py falhou no aquecimento: {at.exception[0].message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga multi-sessão do app Streamlit (AppTest).")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32],
+                        help="Números de sessões a testar (padrão: 1 2 4 8 16 32)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Segundos medidos por nível (padrão: 20)")
+    parser.add_argument("--think", type=float, default=0.5,
+                        help="Pausa média (s) entre ações de cada sessão; 0 = sem pausa (padrão: 0.5)")
+    parser.add_argument("--slo", type=float, default=1000.0, help="p95 aceitável em ms (padrão: 1000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--by-action", action="store_true", help="Mostra o p50 por tipo de ação")
+    parser.add_argument("--json", help="Grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    from streamlit import logger
+
+    logger.set_log_level("error")
+    print("Aquecendo os caches (todas as abas)...", file=sys.stderr)
+    warm_up()
+    logger.set_log_level("error")  # a primeira execução do AppTest relê a configuração de log
+
+    rows = []
+    header = (f"{'sessões':>7} {'reruns':>7} {'erros':>5} {'vazão/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'núcleos':>7} {'CPU/rerun':>9} {'MB/sessão':>9} {'RSS MB':>7}")
+    print(header)
+    for n_sessions in sorted(args.sessions):
+        with shared_runtime():
+            row = run_level(n_sessions, args.duration, args.think, args.seed)
+        rows.append(row)
+        print(f"{row['sessions']:>7} {row['reruns']:>7} {row['errors']:>5} {row['throughput']:>8.1f} "
+              f"{row['p50_ms']:>8.0f} {row['p95_ms']:>8.0f} {row['p99_ms']:>8.0f} {row['cpu_cores']:>7.2f} "
+              f"{row['cpu_ms_per_rerun']:>7.0f}ms {row['mem_mb_per_session']:>9.1f} {row['rss_mb']:>7.0f}")
+        if args.by_action:
+            print("        p50 por ação: " + ", ".join(f"{a} {v:.0f} ms" for a, v in row["por_acao"].items()))
+
+    n_saturated, reason = saturation(rows, args.slo)
+    if n_saturated is None:
+        print(f"\nSaturação: {reason} (até {rows[-1]['sessions']} sessões).")
+    else:
+        print(f"\nSaturação em ~{n_saturated} sessões: {reason}.")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "duration": args.duration,
+                       "think": args.think, "slo_ms": args.slo, "cpus": os.cpu_count(), "results": rows,
+                       "saturation": {"sessions": n_saturated, "reason": reason}},
+                      f, indent=2, ensure_ascii=False)
+        print(f"Resultados gravados em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
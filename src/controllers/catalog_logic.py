@@ -0,0 +1,98 @@
+import numpy as np
+from src.controllers.optimization_logic import calculate_optimal_geometry, cost_at_dimension
+
+# Larguras comerciais de chapa (m): a altura do costado é um número inteiro de
+# fiadas de uma mesma largura.
+STANDARD_PLATE_WIDTHS = (1.0, 1.25, 1.5, 1.8, 2.0, 2.44, 2.5, 3.0)
+
+# Faixa do catálogo padrão de diâmetros (cilindro) ou lados (prisma), em metros
+CATALOG_RANGE = (0.5, 60.0)
+
+# Dimensões avaliadas por vez ao caminhar no índice a partir do ótimo contínuo
+SEARCH_BLOCK = 64
+
+
+def build_catalog_index(values):
+    """Índice do catálogo: valores positivos, sem repetição, em ordem crescente."""
+    values = np.asarray(values, dtype=float).ravel()
+    return np.unique(values[np.isfinite(values) & (values > 0)])
+
+
+def standard_catalog(step_mm, lo=CATALOG_RANGE[0], hi=CATALOG_RANGE[1]):
+    """Catálogo regular de diâmetros/lados com passo step_mm. Retorna: índice ordenado"""
+    n_steps = int(round((hi - lo) * 1000 / step_mm))
+    return build_catalog_index(np.round(lo + np.arange(n_steps + 1) * (step_mm / 1000), 6))
+
+
+def _catalog_costs(x, vol, c_base, c_lat, k_area, perimeter_coef, widths):
+    """
+    Custo real de cada dimensão de catálogo x com cada largura de chapa: a altura
+    sobe até fechar a última fiada, então o volume construído é >= o pedido.
+    Retorna: (custo[len(x), len(widths)], fiadas)
+    """
+    h_req = vol / (k_area * x**2)
+    # Tolerância relativa evita uma fiada a mais quando h_req cai exatamente num múltiplo
+    courses = np.ceil(h_req[:, None] / widths[None, :] * (1 - 1e-12))
+    height = courses * widths[None, :]
+    cost = (2 * k_area * x**2 * c_base)[:, None] + (perimeter_coef * x)[:, None] * height * c_lat
+    return cost, courses
+
+
+def select_from_catalog(geo_type, num_sides, vol, c_base, c_lat, catalog, plate_widths=STANDARD_PLATE_WIDTHS,
+                        block=SEARCH_BLOCK):
+    """
+    Combinação de catálogo (diâmetro ou lado x largura de chapa) mais barata que
+    atende o volume. O custo com altura contínua é convexo na dimensão e é um
+    limite inferior do custo real, então a busca parte do ótimo de Lagrange no
+    índice ordenado e avança para os dois lados em blocos, parando cada lado
+    quando o limite inferior já passa do melhor custo encontrado.
+    catalog: índice de build_catalog_index (diâmetros no cilindro, lados no prisma)
+    Retorna: (valor_catalogo, dimensao, altura, custo, largura_chapa, fiadas, dimensoes_avaliadas)
+    """
+    widths = np.asarray(plate_widths, dtype=float)
+    if catalog.size == 0 or widths.size == 0:
+        raise ValueError("Catálogo vazio: informe ao menos uma dimensão e uma largura de chapa")
+
+    opt_dim, _, _, k_area, _ = calculate_optimal_geometry(geo_type, num_sides, vol, c_base, c_lat)
+    is_cyl = geo_type == "Cilindro (Padrão)"
+    scale = 0.5 if is_cyl else 1.0  # diâmetro -> raio
+    perimeter_coef = 2 * np.pi if is_cyl else num_sides
+
+    def lower_bound(i):
+        return cost_at_dimension(catalog[i] * scale, vol, c_base, c_lat, geo_type, num_sides, k_area)
+
+    best = (np.inf, None, None)
+    evaluated = 0
+
+    def visit(start, stop):
+        nonlocal best, evaluated
+        x = catalog[start:stop] * scale
+        cost, courses = _catalog_costs(x, vol, c_base, c_lat, k_area, perimeter_coef, widths)
+        row, col = np.unravel_index(np.argmin(cost), cost.shape)
+        if cost[row, col] < best[0]:
+            best = (cost[row, col], start + row, (col, courses[row, col]))
+        evaluated += stop - start
+
+    # Janela [lo, hi) já visitada, aberta em volta da posição do ótimo contínuo
+    lo = hi = int(np.searchsorted(catalog, opt_dim / scale))
+    grow_left, grow_right = lo > 0, hi < catalog.size
+    while grow_left or grow_right:
+        if grow_right:
+            if lower_bound(hi) < best[0]:
+                visit(hi, min(hi + block, catalog.size))
+                hi = min(hi + block, catalog.size)
+                grow_right = hi < catalog.size
+            else:
+                grow_right = False
+        if grow_left:
+            if lower_bound(lo - 1) < best[0]:
+                visit(max(lo - block, 0), lo)
+                lo = max(lo - block, 0)
+                grow_left = lo > 0
+            else:
+                grow_left = False
+
+    cost, i, (col, courses) = best
+    dim = catalog[i] * scale
+    height = courses * widths[col]
+    return catalog[i], dim, height, cost, widths[col], int(courses), evaluated
@@ -0,0 +1,173 @@
+import numpy as np
+from src.controllers.optimization_logic import calculate_optimal_geometry_batch
+
+# Parque de tanques: muitos projetos ótimos dispostos em fileiras e desenhados
+# como UMA malha (um único go.Mesh3d). Cada tanque é um prisma de `segmentos`
+# lados (o cilindro é aproximado por um prisma), com vértices compartilhados
+# entre o costado e as tampas.
+#
+# Nível de detalhe (LOD): o número de segmentos de cada cilindro vem do erro da
+# corda na tela. A flecha de um polígono de s lados inscrito no raio r é
+# r·(1 - cos(π/s)) ≈ r·π²/(2s²); vista a uma distância d com distância focal de
+# FOCAL_PX pixels, ela ocupa r·π²·FOCAL_PX/(2s²·d) pixels. Tanques pequenos ou
+# distantes da câmera precisam de poucos segmentos para o erro ficar abaixo de
+# tol_px. O resultado é arredondado para cima num dos LOD_LEVELS, então a malha
+# é montada em poucos grupos de mesmo tamanho.
+
+LOD_LEVELS = (8, 12, 16, 24, 32, 48, 64)
+FOCAL_PX = 800                 # distância focal aproximada de um gráfico de ~700 px
+LOD_TOL_PX = 0.5               # erro de corda tolerado (modo normal)
+LOD_TOL_PX_LIGHT = 2.0         # modo leve
+CAMERA_EYE = (1.25, 1.25, 1.25)  # câmera padrão do Plotly (coordenadas normalizadas da cena)
+GAP_FACTOR = 0.25              # espaço entre tanques, em frações do maior diâmetro da fileira
+
+
+def farm_designs(n_tanks, vol_range, geo_type, num_sides, c_base, c_lat, mixed=False, seed=0):
+    """
+    Sorteia um parque de n_tanks projetos (volumes log-uniformes em vol_range) e
+    resolve todos de uma vez com calculate_optimal_geometry_batch. Com mixed=True
+    cada tanque sorteia a própria forma (cilindro ou prisma de 3 a 12 lados).
+    Retorna: dict de arrays (is_cyl, num_sides, vol, dim, h, cost)
+    """
+    rng = np.random.default_rng(seed)
+    vol = np.exp(rng.uniform(np.log(vol_range[0]), np.log(vol_range[1]), n_tanks))
+    if mixed:
+        is_cyl = rng.random(n_tanks) < 0.5
+        sides = np.where(is_cyl, 0, rng.integers(3, 13, n_tanks))
+    else:
+        is_cyl = np.full(n_tanks, geo_type == "Cilindro (Padrão)")
+        sides = np.where(is_cyl, 0, num_sides)
+    dim, h, cost, _ = calculate_optimal_geometry_batch(is_cyl, sides, vol, c_base, c_lat)
+    return {"is_cyl": is_cyl, "num_sides": sides, "vol": vol, "dim": dim, "h": h, "cost": cost}
+
+
+def circumradius(is_cyl, num_sides, dim):
+    """Raio do círculo que contém a base: o próprio raio no cilindro, lado/(2·sen(π/n)) no prisma."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prism = dim / (2 * np.sin(np.pi / np.maximum(num_sides, 1)))
+    return np.where(is_cyl, dim, prism)
+
+
+def farm_layout(radius, gap_factor=GAP_FACTOR):
+    """
+    Dispõe os tanques em fileiras de ceil(√N), na ordem recebida. Dentro da
+    fileira os centros são acumulados pelos diâmetros; cada fileira avança pelo
+    maior diâmetro dela. O parque fica centrado na origem.
+    Retorna: (cx, cy)
+    """
+    radius = np.asarray(radius, dtype=float)
+    n = radius.size
+    if n == 0:
+        return np.zeros(0), np.zeros(0)
+    cols = int(np.ceil(np.sqrt(n)))
+    rows = -(-n // cols)
+    diam = np.zeros(rows * cols)
+    diam[:n] = 2 * radius
+    diam = diam.reshape(rows, cols)
+    row_depth = diam.max(axis=1)
+    gap = gap_factor * row_depth
+
+    pitch = diam + gap[:, None]
+    x = np.cumsum(pitch, axis=1) - pitch / 2
+    x -= (x[:, -1:] + pitch[:, -1:] / 2) / 2  # centra cada fileira
+    y_pitch = row_depth + gap
+    y = np.cumsum(y_pitch) - y_pitch / 2
+    y -= y[-1] / 2 + y_pitch[-1] / 4
+    cy = np.broadcast_to(y[:, None], (rows, cols))
+    return x.ravel()[:n], cy.ravel()[:n]
+
+
+def camera_position(cx, cy, height, eye=CAMERA_EYE):
+    """
+    Posição aproximada da câmera em metros: com aspectmode='data' o Plotly
+    normaliza a cena pelo maior lado, e o olho fica a eye·(maior lado) do centro.
+    """
+    lo = np.array([cx.min(), cy.min(), 0.0])
+    hi = np.array([cx.max(), cy.max(), height.max()])
+    return (lo + hi) / 2 + np.asarray(eye) * (hi - lo).max()
+
+
+def lod_segments(is_cyl, num_sides, radius, cx, cy, height, tol_px=LOD_TOL_PX, max_segments=LOD_LEVELS[-1]):
+    """
+    Segmentos de cada tanque: prismas usam os próprios n lados; cilindros, o
+    menor nível de LOD_LEVELS com erro de corda abaixo de tol_px na tela.
+    Retorna: array de inteiros
+    """
+    eye = camera_position(cx, cy, height)
+    dist = np.sqrt((cx - eye[0])**2 + (cy - eye[1])**2 + (height / 2 - eye[2])**2)
+    needed = np.pi * np.sqrt(radius * FOCAL_PX / (2 * tol_px * np.maximum(dist, 1e-9)))
+    levels = np.array([lv for lv in LOD_LEVELS if lv <= max_segments])
+    level = levels[np.minimum(np.searchsorted(levels, needed), levels.size - 1)]
+    return np.where(is_cyl, level, num_sides).astype(np.intp)
+
+
+def _prism_template(s):
+    """
+    Triângulos de um prisma de s lados com vértices [anel da base (s), anel do
+    topo (s), centro da base, centro do topo]. Retorna: array (4s, 3) de índices locais
+    """
+    k = np.arange(s)
+    k1 = (k + 1) % s
+    base_c, top_c = 2 * s, 2 * s + 1
+    side_a = np.stack([k, k1, s + k], axis=1)
+    side_b = np.stack([k1, s + k1, s + k], axis=1)
+    bottom = np.stack([np.full(s, base_c), k1, k], axis=1)
+    top = np.stack([np.full(s, top_c), s + k, s + k1], axis=1)
+    return np.concatenate([side_a, side_b, bottom, top])
+
+
+def farm_mesh(cx, cy, radius, height, segments):
+    """
+    Malha única do parque, montada por grupos de mesmo número de segmentos:
+    cada grupo é um broadcast (tanques x vértices do gabarito), sem laço por tanque.
+    Índices de triângulo no menor tipo inteiro sem sinal que comporta os vértices.
+    Retorna: dict com x, y, z, i, j, k e tank (tanque de cada vértice)
+    """
+    segments = np.asarray(segments)
+    groups = np.unique(segments)
+    n_vertices = int(np.sum(2 * segments + 2))
+    index_dtype = np.min_scalar_type(max(n_vertices - 1, 0))
+    if index_dtype.itemsize < 2:
+        index_dtype = np.dtype(np.uint16)
+
+    xs, ys, zs, faces, owners = [], [], [], [], []
+    offset = 0
+    for s in groups:
+        s = int(s)
+        members = np.flatnonzero(segments == s)
+        m, per_tank = members.size, 2 * s + 2
+        theta = 2 * np.pi * np.arange(s) / s
+        ring_x = np.concatenate([np.cos(theta), np.cos(theta), [0.0, 0.0]])
+        ring_y = np.concatenate([np.sin(theta), np.sin(theta), [0.0, 0.0]])
+        is_top = np.concatenate([np.zeros(s), np.ones(s), [0.0, 1.0]])
+
+        r, h = radius[members, None], height[members, None]
+        xs.append((cx[members, None] + r * ring_x).ravel())
+        ys.append((cy[members, None] + r * ring_y).ravel())
+        zs.append((h * is_top).ravel())
+        starts = offset + per_tank * np.arange(m)
+        faces.append((_prism_template(s)[None, :, :] + starts[:, None, None]).reshape(-1, 3))
+        owners.append(np.repeat(members, per_tank))
+        offset += m * per_tank
+
+    faces = np.concatenate(faces).astype(index_dtype) if faces else np.zeros((0, 3), dtype=index_dtype)
+    return {
+        "x": np.concatenate(xs) if xs else np.zeros(0),
+        "y": np.concatenate(ys) if ys else np.zeros(0),
+        "z": np.concatenate(zs) if zs else np.zeros(0),
+        "i": faces[:, 0], "j": faces[:, 1], "k": faces[:, 2],
+        "tank": np.concatenate(owners) if owners else np.zeros(0, dtype=np.intp),
+    }
+
+
+def build_farm(designs, light=False):
+    """
+    Layout + LOD + malha de um parque de farm_designs.
+    Retorna: (malha, cx, cy, raio, segmentos)
+    """
+    radius = circumradius(designs["is_cyl"], designs["num_sides"], designs["dim"])
+    cx, cy = farm_layout(radius)
+    tol = LOD_TOL_PX_LIGHT if light else LOD_TOL_PX
+    max_segments = 32 if light else LOD_LEVELS[-1]
+    segments = lod_segments(designs["is_cyl"], designs["num_sides"], radius, cx, cy, designs["h"], tol, max_segments)
+    return farm_mesh(cx, cy, radius, designs["h"], segments), cx, cy, radius, segments
@@ -0,0 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from src.controllers.optimization_logic import calculate_optimal_geometry_batch
+from src.controllers.physics_logic import mass_properties_from_geometry
+
+MC_METRICS = ("min_cost", "opt_dim", "opt_h", "total_mass")
+MC_PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 4096
+
+def sample_chunk(chunk_index, chunk_size, seed, geo_type, num_sides, vol, c_base, c_lat, rho_base, rho_top, rel_std):
+    """
+    Sorteia e resolve um bloco de cenários. A semente de cada bloco deriva de
+    (seed, chunk_index), então o resultado não depende da ordem nem do número de processos.
+    Custos e volume seguem lognormais com a média informada e desvio relativo rel_std[nome].
+    Retorna: {métrica: array}
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+
+    def draw(mean, cv):
+        if cv <= 0:
+            return np.full(chunk_size, float(mean))
+        sigma = np.sqrt(np.log1p(cv**2))
+        return rng.lognormal(np.log(mean) - sigma**2 / 2, sigma, chunk_size)
+
+    vol_s = draw(vol, rel_std.get("vol", 0.0))
+    c_base_s = draw(c_base, rel_std.get("c_base", 0.0))
+    c_lat_s = draw(c_lat, rel_std.get("c_lat", 0.0))
+
+    opt_dim, opt_h, min_cost, k_area = calculate_optimal_geometry_batch(geo_type, num_sides, vol_s, c_base_s, c_lat_s)
+    total_mass, _, _, _ = mass_properties_from_geometry(opt_dim, opt_h, k_area, rho_base, rho_top)
+    return {"min_cost": min_cost, "opt_dim": opt_dim, "opt_h": opt_h, "total_mass": total_mass}
+
+def new_summary(edges):
+    """Acumulador vazio: momentos (Welford/Chan), extremos e histograma de bordas fixas."""
+    return {name: {"count": 0, "mean": 0.0, "m2": 0.0, "min": np.inf, "max": -np.inf,
+                   "edges": edges[name], "hist": np.zeros(len(edges[name]) + 1, dtype=np.int64)}
+            for name in edges}
+
+def summarize_chunk(samples, edges):
+    """Resume um bloco de amostras; o bloco em si pode ser descartado em seguida."""
+    summary = new_summary(edges)
+    for name, values in samples.items():
+        if name not in edges:
+            continue
+        s = summary[name]
+        s["count"] = len(values)
+        s["mean"] = float(np.mean(values))
+        s["m2"] = float(np.sum((values - s["mean"])**2))
+        s["min"], s["max"] = float(np.min(values)), float(np.max(values))
+        # Bins extras nas pontas guardam o que cair fora da faixa
+        s["hist"] = np.bincount(np.searchsorted(s["edges"], values), minlength=len(s["edges"]) + 1)
+    return summary
+
+def merge_summaries(acc, part):
+    """Combina dois resumos (fórmula de Chan para média e variância)."""
+    for name, p in part.items():
+        a = acc[name]
+        n = a["count"] + p["count"]
+        if n == 0:
+            continue
+        delta = p["mean"] - a["mean"]
+        a["m2"] += p["m2"] + delta**2 * a["count"] * p["count"] / n
+        a["mean"] += delta * p["count"] / n
+        a["count"] = n
+        a["min"], a["max"] = min(a["min"], p["min"]), max(a["max"], p["max"])
+        a["hist"] += p["hist"]
+    return acc
+
+def summary_percentiles(s, percentiles=MC_PERCENTILES):
+    """Percentis interpolados linearmente dentro dos bins do histograma."""
+    edges = np.concatenate([[s["min"]], s["edges"], [s["max"]]])
+    cum = np.concatenate([[0], np.cumsum(s["hist"])]) / s["count"]
+    return {p: float(np.interp(p / 100, cum, edges)) for p in percentiles}
+
+def _chunk_summary(chunk_index, edges, n_samples, chunk_size, **kwargs):
+    # O último bloco é menor quando n_samples não é múltiplo de chunk_size
+    size = min(chunk_size, n_samples - chunk_index * chunk_size)
+    return summarize_chunk(sample_chunk(chunk_index, size, **kwargs), edges)
+
+def run_monte_carlo(geo_type, num_sides, vol, c_base, c_lat, rho_base=8000.0, rho_top=7500.0,
+                    rel_std=None, n_samples=1_000_000, chunk_size=100_000, seed=0, workers=1):
+    """
+    Propaga a incerteza de custos e volume até o projeto ótimo por Monte Carlo.
+    As amostras são geradas e resumidas bloco a bloco: a matriz completa nunca
+    fica em memória. workers > 1 distribui os blocos num pool de processos.
+    Retorna: {métrica: {"mean", "std", "min", "max", "percentiles", "edges", "hist"}}
+    """
+    rel_std = rel_std or {"c_base": 0.1, "c_lat": 0.1, "vol": 0.0}
+    n_chunks = -(-n_samples // chunk_size)
+    params = dict(seed=seed, geo_type=geo_type, num_sides=num_sides, vol=vol,
+                  c_base=c_base, c_lat=c_lat, rho_base=rho_base, rho_top=rho_top, rel_std=rel_std)
+
+    # 1. Bloco piloto (bloco 0) define as bordas dos histogramas, com folga de 50% da faixa
+    pilot = sample_chunk(0, min(chunk_size, n_samples), **params)
+    edges = {}
+    for name in MC_METRICS:
+        lo, hi = np.min(pilot[name]), np.max(pilot[name])
+        pad = 0.5 * (hi - lo) or 0.5 * abs(hi) or 1.0
+        edges[name] = np.linspace(lo - pad, hi + pad, HISTOGRAM_BINS + 1)
+    acc = summarize_chunk(pilot, edges)
+    del pilot
+
+    # 2. Demais blocos (em ordem, para o resultado ser determinístico)
+    task = partial(_chunk_summary, edges=edges, n_samples=n_samples, chunk_size=chunk_size, **params)
+    if workers > 1 and n_chunks > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(task, range(1, n_chunks)):
+                merge_summaries(acc, part)
+    else:
+        for chunk_index in range(1, n_chunks):
+            merge_summaries(acc, task(chunk_index))
+
+    return {name: {"mean": s["mean"], "std": float(np.sqrt(s["m2"] / max(s["count"] - 1, 1))),
+                   "min": s["min"], "max": s["max"], "percentiles": summary_percentiles(s),
+                   "edges": s["edges"], "hist": s["hist"]}
+            for name, s in acc.items()}
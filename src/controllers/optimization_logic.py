@@ -1,5 +1,10 @@
+from functools import lru_cache
+
 import numpy as np
 
+# Maior número de lados com solução tabelada (acima disso, cai na fórmula)
+UNIT_TABLE_MAX_SIDES = 1024
+
 def calculate_optimal_geometry(geo_type, num_sides, vol, c_base, c_lat):
     """
     Calcula as dimensões ótimas usando Multiplicadores de Lagrange.
@@ -34,12 +39,213 @@ def calculate_optimal_geometry(geo_type, num_sides, vol, c_base, c_lat):
 def generate_cost_curve_data(opt_dim, vol, c_base, c_lat, geo_type, num_sides, k_area):
     """Gera dados X e Y para o gráfico de curva de custo."""
     dim_range = np.linspace(opt_dim * 0.5, opt_dim * 1.5, 100)
-    
+    c_curve = cost_at_dimension(dim_range, vol, c_base, c_lat, geo_type, num_sides, k_area)
+    return dim_range, c_curve
+
+def cost_at_dimension(dim, vol, c_base, c_lat, geo_type, num_sides, k_area):
+    """Custo total para uma dimensão qualquer (a altura sai da restrição de volume)."""
     if geo_type == "Cilindro (Padrão)":
-        c_curve = (2 * np.pi * dim_range**2 * c_base) + (2 * vol * c_lat / dim_range)
+        return (2 * np.pi * dim**2 * c_base) + (2 * vol * c_lat / dim)
+    term_area = 2 * k_area * (dim**2) * c_base
+    term_side = (num_sides * dim) * (vol / (k_area * dim**2)) * c_lat
+    return term_area + term_side
+
+@lru_cache(maxsize=None)
+def unit_solution_table(max_sides=UNIT_TABLE_MAX_SIDES):
+    """
+    Solução adimensional do ótimo para cada número de lados. Com a escala
+    s = (V·c_lat / c_base)^(1/3), todo ótimo é uma cópia escalada da unitária:
+        dimensão = u·s,  altura = u_h·s·(c_base / c_lat),  custo = u_c·s²·c_base
+    onde u = (P / 4k²)^(1/3), u_h = 1 / (k·u²), u_c = 2k·u² + P / (k·u) e P é o
+    coeficiente do perímetro (n no prisma, 2π no cilindro).
+    Coluna n = prisma de n lados; coluna 0 = cilindro (limite n -> inf, mesma
+    convenção de num_sides = 0); colunas 1 e 2 ficam NaN. Montada uma vez por
+    processo (~32 KB), somente leitura.
+    Retorna: array (4, max_sides + 1) com as linhas (u, u_h, u_c, k_area)
+    """
+    n = np.arange(max_sides + 1, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_area = n / (4 * np.tan(np.pi / n))
+    perimeter_coef = n.copy()
+    k_area[0], perimeter_coef[0] = np.pi, 2 * np.pi
+    k_area[1:3] = np.nan
+
+    u = np.cbrt(perimeter_coef / (4 * k_area**2))
+    table = np.stack([u, 1 / (k_area * u**2), 2 * k_area * u**2 + perimeter_coef / (k_area * u), k_area])
+    table.setflags(write=False)
+    return table
+
+
+def calculate_optimal_geometry_batch(geo_type, num_sides, vol, c_base, c_lat, method="table"):
+    """
+    Versão vetorizada de calculate_optimal_geometry para frotas de tanques.
+    Aceita arrays (ou escalares) broadcastáveis; geo_type pode ser um array de
+    rótulos ("Cilindro (Padrão)" / "Prisma Regular (Polígono)") ou de booleanos
+    (True = cilindro). Todas as linhas são resolvidas numa única passada, sem
+    desvios por linha em Python.
+    method="table" busca a solução unitária em unit_solution_table e só escala
+    (linhas com n fora da tabela usam a fórmula); method="formula" refaz as
+    expressões de Lagrange em toda linha.
+    Retorna: (dimensao_otima, altura_otima, custo_minimo, k_area) como arrays
+    """
+    geo_type = np.asarray(geo_type)
+    is_cyl = geo_type if geo_type.dtype == bool else (geo_type == "Cilindro (Padrão)")
+    is_cyl, n, vol, c_base, c_lat = np.broadcast_arrays(
+        is_cyl,
+        np.asarray(num_sides, dtype=float),
+        np.asarray(vol, dtype=float),
+        np.asarray(c_base, dtype=float),
+        np.asarray(c_lat, dtype=float),
+    )
+    if method == "formula":
+        return _optimal_geometry_formula(is_cyl, n, vol, c_base, c_lat)
+    if method != "table":
+        raise ValueError(f"Método desconhecido: {method}")
+
+    # Coluna da tabela por linha: 0 para cilindros (e para n fora da tabela, refeitos abaixo)
+    column = n.astype(np.intp)
+    valid_prism = (column >= 3) & (column <= UNIT_TABLE_MAX_SIDES) & (column == n)
+    in_table = is_cyl | valid_prism
+    column *= valid_prism & ~is_cyl
+    u, u_h, u_c, k_area = np.take(unit_solution_table(), column, axis=1)
+
+    s = np.cbrt(vol * c_lat / c_base)
+    opt_dim = u * s
+    opt_h = u_h * s * (c_base / c_lat)
+    min_cost = u_c * s * s * c_base
+
+    if not in_table.all():
+        rest = ~in_table
+        opt_dim, opt_h, min_cost, k_area = (np.array(x) for x in (opt_dim, opt_h, min_cost, k_area))
+        formula = _optimal_geometry_formula(is_cyl[rest], n[rest], vol[rest], c_base[rest], c_lat[rest])
+        for out, values in zip((opt_dim, opt_h, min_cost, k_area), formula):
+            out[rest] = values
+
+    return opt_dim, opt_h, min_cost, k_area
+
+
+def _optimal_geometry_formula(is_cyl, n, vol, c_base, c_lat):
+    """Expressões de Lagrange linha a linha (arrays já broadcastados)."""
+    # Linhas de cilindro costumam vir com num_sides = 0; usamos um n qualquer
+    # válido nelas só para não gerar divisões por zero no ramo do prisma
+    n_safe = np.where(is_cyl, 4.0, n)
+
+    # Lagrange para Prisma (mesmas expressões do caminho escalar)
+    k_prism = n_safe / (4 * np.tan(np.pi / n_safe))
+    dim_prism = ((n_safe * vol * c_lat) / (4 * (k_prism**2) * c_base))**(1/3)
+
+    # Lagrange para Cilindro
+    dim_cyl = ((vol * c_lat) / (2 * np.pi * c_base))**(1/3)
+
+    k_area = np.where(is_cyl, np.pi, k_prism)
+    opt_dim = np.where(is_cyl, dim_cyl, dim_prism)
+    perimeter_coef = np.where(is_cyl, 2 * np.pi, n_safe)
+
+    # Altura e Custo são derivados da dimensão ótima
+    opt_h = vol / (k_area * opt_dim**2)
+    area_base = k_area * opt_dim**2
+    area_side = (perimeter_coef * opt_dim) * opt_h
+
+    min_cost = (2 * area_base * c_base) + (area_side * c_lat)
+
+    return opt_dim, opt_h, min_cost, k_area
+
+
+def calculate_optimal_geometry_records(designs):
+    """
+    Atalho para arrays estruturados (ou DataFrames) com os campos
+    geo_type, num_sides, vol, c_base e c_lat.
+    Retorna: o mesmo que calculate_optimal_geometry_batch
+    """
+    return calculate_optimal_geometry_batch(
+        designs["geo_type"], designs["num_sides"], designs["vol"], designs["c_base"], designs["c_lat"]
+    )
+
+
+# --- Otimizador numérico: custos de tampa e fundo separados, solda e limites ---
+
+# Restrição ativa no ótimo de calculate_constrained_geometry_batch
+OPT_FREE = 0            # ótimo interior (só a restrição de volume)
+OPT_HEIGHT_LIMIT = 1    # encostado na altura máxima
+OPT_WIDTH_LIMIT = 2     # encostado na largura máxima da planta
+OPT_INFEASIBLE = -1     # nenhum tanque cabe nos dois limites com esse volume
+
+
+def calculate_constrained_geometry_batch(geo_type, num_sides, vol, c_lid, c_floor, c_lat, c_weld=0.0,
+                                         max_height=np.inf, max_width=np.inf, warm_start=True,
+                                         tol=1e-12, max_iter=50):
+    """
+    Geometria de custo mínimo quando não há forma fechada: tampa e fundo com
+    custos próprios (R$/m²), solda por metro de costura (R$/m) e limites de
+    altura e de largura (diâmetro do círculo circunscrito, como na varredura).
+
+    A restrição de volume elimina a altura, h = V / (k·x²), e o custo vira
+        C(x) = k·x²·(c_tampa + c_fundo) + P·V·c_lat/(k·x) + c_solda·(2·P·x + m·h)
+    com P o coeficiente do perímetro e m as costuras verticais (n no prisma,
+    1 no cilindro calandrado). C é estritamente convexa em x > 0 e os limites
+    viram uma caixa [x_min, x_max], então Newton projetado na caixa converge
+    para o ponto KKT. Vetorizado: todas as linhas iteram juntas.
+
+    warm_start=True parte da forma fechada de Lagrange (exata sem solda e sem
+    limites, convergindo em uma iteração).
+    Retorna: (dimensao_otima, altura_otima, custo_minimo, k_area, restricao_ativa) como arrays
+    """
+    geo_type = np.asarray(geo_type)
+    is_cyl = geo_type if geo_type.dtype == bool else (geo_type == "Cilindro (Padrão)")
+    is_cyl, n, vol, c_lid, c_floor, c_lat, c_weld, max_height, max_width = np.broadcast_arrays(
+        is_cyl, *(np.asarray(x, dtype=float) for x in (num_sides, vol, c_lid, c_floor, c_lat, c_weld,
+                                                      max_height, max_width))
+    )
+    n_safe = np.where(is_cyl, 4.0, n)
+
+    k_area = np.where(is_cyl, np.pi, n_safe / (4 * np.tan(np.pi / n_safe)))
+    perimeter_coef = np.where(is_cyl, 2 * np.pi, n_safe)
+    width_coef = np.where(is_cyl, 2.0, 1 / np.sin(np.pi / n_safe))
+    vertical_seams = np.where(is_cyl, 1.0, n_safe)
+
+    # C(x) = a·x² + b/x + c·x + d/x²
+    a = k_area * (c_lid + c_floor)
+    b = perimeter_coef * vol * c_lat / k_area
+    c = 2 * perimeter_coef * c_weld
+    d = vertical_seams * c_weld * vol / k_area
+
+    # Altura máxima -> dimensão mínima; largura máxima -> dimensão máxima
+    with np.errstate(divide='ignore'):
+        x_min = np.sqrt(vol / (k_area * max_height))
+    x_max = max_width / width_coef
+    infeasible = x_min > x_max
+
+    if warm_start:
+        # Forma fechada com c_base = média de tampa e fundo: 2·a·x³ = b
+        x = (b / (2 * a))**(1/3)
     else:
-        term_area = 2 * k_area * (dim_range**2) * c_base
-        term_side = (num_sides * dim_range) * (vol / (k_area * dim_range**2)) * c_lat
-        c_curve = term_area + term_side
-        
-    return dim_range, c_curve
\ No newline at end of file
+        x = (vol / k_area)**(1/3)
+    x_max_safe = np.maximum(x_max, x_min)
+    x = np.clip(x, x_min, x_max_safe).ravel()
+
+    # Só as linhas que ainda não convergiram seguem iterando
+    flat = [v.ravel() for v in (a, b, c, d, x_min, x_max_safe)]
+    todo = np.arange(x.size)
+    for _ in range(max_iter):
+        xa, (aa, ba, ca, da, lo, hi) = x[todo], (v[todo] for v in flat)
+        grad = 2 * aa * xa - ba / xa**2 + ca - 2 * da / xa**3
+        hess = 2 * aa + 2 * ba / xa**3 + 6 * da / xa**4
+        # Passo de Newton amortecido (no máximo 4x para cada lado) e projetado na caixa
+        x_new = np.clip(xa - grad / hess, np.maximum(xa / 4, lo), np.minimum(4 * xa, hi))
+        x[todo] = x_new
+        todo = todo[np.abs(x_new - xa) > tol * xa]
+        if todo.size == 0:
+            break
+    x = x.reshape(a.shape)
+
+    grad = 2 * a * x - b / x**2 + c - 2 * d / x**3
+    at_min = np.isclose(x, x_min, rtol=1e-9, atol=0) & (grad > 0)
+    at_max = np.isclose(x, x_max, rtol=1e-9, atol=0) & (grad < 0)
+    status = np.where(infeasible, OPT_INFEASIBLE,
+                      np.where(at_min, OPT_HEIGHT_LIMIT, np.where(at_max, OPT_WIDTH_LIMIT, OPT_FREE)))
+
+    opt_dim = np.where(infeasible, np.nan, x)
+    opt_h = vol / (k_area * opt_dim**2)
+    min_cost = a * opt_dim**2 + b / opt_dim + c * opt_dim + d / opt_dim**2
+
+    return opt_dim, opt_h, min_cost, k_area, status
@@ -1,5 +1,6 @@
+from functools import lru_cache
 import numpy as np
-from src.controllers.optimization_logic import calculate_optimal_geometry
+from src.controllers.optimization_logic import calculate_optimal_geometry, calculate_optimal_geometry_batch
 
 def calculate_mass_properties(geo_type, num_sides, vol, c_base, c_lat, rho_base, rho_top):
     """
@@ -20,7 +21,141 @@ def calculate_mass_properties(geo_type, num_sides, vol, c_base, c_lat, rho_base,
 
     return total_mass, z_cm, opt_h, rho_base, density_gradient_B
 
+def calculate_mass_properties_batch(geo_type, num_sides, vol, c_base, c_lat, rho_base, rho_top):
+    """
+    Versão vetorizada de calculate_mass_properties (mesma integral, arrays broadcastáveis).
+    Retorna: (massa_total, z_cm, altura_otima, gradiente_B) como arrays
+    """
+    opt_dim, opt_h, _, k_area = calculate_optimal_geometry_batch(geo_type, num_sides, vol, c_base, c_lat)
+    return mass_properties_from_geometry(opt_dim, opt_h, k_area, rho_base, rho_top)
+
+def mass_properties_from_geometry(opt_dim, opt_h, k_area, rho_base, rho_top):
+    """
+    Mesma integral de calculate_mass_properties_batch a partir de uma geometria
+    já resolvida (evita resolver a otimização duas vezes no mesmo lote).
+    Retorna: (massa_total, z_cm, altura_otima, gradiente_B) como arrays
+    """
+    rho_base = np.asarray(rho_base, dtype=float)
+    rho_top = np.asarray(rho_top, dtype=float)
+
+    area_base = k_area * opt_dim**2
+    density_gradient_B = (rho_base - rho_top) / opt_h
+
+    total_mass = area_base * (rho_base * opt_h - (density_gradient_B * opt_h**2) / 2)
+    moment_xy = area_base * ((rho_base * opt_h**2)/2 - (density_gradient_B * opt_h**3)/3)
+    z_cm = moment_xy / total_mass
+
+    return total_mass, z_cm, opt_h, density_gradient_B
+
 def generate_density_profile(h, rho_base, B):
     z_vals = np.linspace(0, h, 100)
     rho_vals = rho_base - B * z_vals
-    return z_vals, rho_vals
\ No newline at end of file
+    return z_vals, rho_vals
+
+# --- Perfis de densidade arbitrários: integração numérica (Gauss-Legendre) ---
+# Os perfis usam a altura normalizada zeta = z / H (0 = base, 1 = topo), então o
+# mesmo perfil serve para tanques de alturas diferentes e seu pré-processamento
+# (integrais acumuladas por segmento) é calculado uma única vez e reaproveitado.
+
+def make_profile(z_knots, rho_knots, kind="linear"):
+    """
+    Descreve um perfil de densidade em altura normalizada.
+    kind="linear": rho interpolado entre os nós (ex.: testemunho medido).
+    kind="step": camadas; z_knots são as fronteiras e rho_knots a densidade de cada camada.
+    z_knots precisam ser finitos, estritamente crescentes e cobrir [0, 1] (de 0
+    a 1 exatamente): a integração parte do primeiro nó e não extrapola.
+    Retorna: tupla imutável (serve de chave para o cache do pré-processamento)
+    """
+    z_knots = tuple(float(z) for z in z_knots)
+    rho_knots = tuple(float(r) for r in rho_knots)
+    expected = len(z_knots) - 1 if kind == "step" else len(z_knots)
+    if kind not in ("linear", "step") or len(z_knots) < 2 or len(rho_knots) != expected:
+        raise ValueError(f"Perfil inválido: kind={kind!r}, {len(z_knots)} nós e {len(rho_knots)} densidades")
+    if not np.all(np.isfinite(z_knots + rho_knots)):
+        raise ValueError("Perfil inválido: nós e densidades precisam ser finitos")
+    if np.any(np.diff(z_knots) <= 0):
+        raise ValueError(f"Perfil inválido: nós precisam ser estritamente crescentes, recebido {z_knots}")
+    if z_knots[0] != 0.0 or z_knots[-1] != 1.0:
+        raise ValueError(f"Perfil inválido: nós precisam ir de 0 a 1 (altura normalizada), recebido "
+                         f"[{z_knots[0]:g}, {z_knots[-1]:g}]")
+    return (kind, z_knots, rho_knots)
+
+def linear_profile(rho_base, rho_top):
+    """Perfil linear equivalente ao de calculate_mass_properties."""
+    return make_profile((0.0, 1.0), (rho_base, rho_top))
+
+@lru_cache(maxsize=32)
+def gauss_legendre(n_nodes):
+    """Nós e pesos de Gauss-Legendre em [-1, 1] (exatos para polinômios de grau 2n-1)."""
+    return np.polynomial.legendre.leggauss(n_nodes)
+
+def _profile_density(profile):
+    """Converte o perfil em uma função rho(zeta) vetorizada e seus pontos de quebra."""
+    if callable(profile):
+        return profile, (0.0, 1.0)
+    kind, z_knots, rho_knots = profile
+    z_arr, rho_arr = np.array(z_knots), np.array(rho_knots)
+    if kind == "linear":
+        return (lambda zeta: np.interp(zeta, z_arr, rho_arr)), z_knots
+    layer = lambda zeta: rho_arr[np.clip(np.searchsorted(z_arr, zeta, side='right') - 1, 0, len(rho_arr) - 1)]
+    return layer, z_knots
+
+@lru_cache(maxsize=64)
+def _profile_tables(profile, n_nodes):
+    """
+    Pré-processamento do perfil (em cache): fronteiras dos segmentos e as
+    integrais acumuladas de rho e zeta·rho até o início de cada segmento.
+    """
+    rho, breaks = _profile_density(profile)
+    breaks = np.array(breaks, dtype=float)
+    x, w = gauss_legendre(n_nodes)
+    seg_a, seg_b = breaks[:-1], breaks[1:]
+    half = (seg_b - seg_a)[:, None] / 2
+    zeta = seg_a[:, None] + half * (x + 1)
+    rho_nodes = rho(zeta)
+    seg_m0 = np.sum(half * w * rho_nodes, axis=1)
+    seg_m1 = np.sum(half * w * rho_nodes * zeta, axis=1)
+    cum_m0 = np.concatenate([[0.0], np.cumsum(seg_m0)])
+    cum_m1 = np.concatenate([[0.0], np.cumsum(seg_m1)])
+    return rho, breaks, cum_m0, cum_m1
+
+def integrate_profile(profile, h, area_base, fill_level=1.0, n_nodes=8):
+    """
+    Massa e centro de massa de tanques com densidade rho(zeta) arbitrária,
+    preenchidos até fill_level·H. Vetorizado: h, area_base e fill_level podem ser arrays.
+    profile: tupla de make_profile ou função rho(zeta) suave em [0, 1].
+    Retorna: (massa_total, z_cm)
+    """
+    h, area_base, fill_level = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (h, area_base, fill_level))
+    )
+    rho, breaks, cum_m0, cum_m1 = _profile_tables(profile, n_nodes)
+    fill = np.clip(fill_level, 0.0, 1.0)
+
+    # 1. Segmentos completos abaixo do nível: integrais acumuladas (pré-calculadas)
+    seg = np.clip(np.searchsorted(breaks, fill, side='right') - 1, 0, len(breaks) - 2)
+    m0, m1 = cum_m0[seg], cum_m1[seg]
+
+    # 2. Segmento parcial [início do segmento, nível]: Gauss-Legendre por tanque
+    x, w = gauss_legendre(n_nodes)
+    half = ((fill - breaks[seg]) / 2)[..., None]
+    zeta = breaks[seg][..., None] + half * (x + 1)
+    rho_nodes = rho(zeta)
+    m0 = m0 + np.sum(half * w * rho_nodes, axis=-1)
+    m1 = m1 + np.sum(half * w * rho_nodes * zeta, axis=-1)
+
+    # 3. Volta para coordenadas reais: dz = H·dzeta, z = H·zeta
+    total_mass = area_base * h * m0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z_cm = h * m1 / m0
+    return total_mass, z_cm
+
+def calculate_mass_properties_profile(geo_type, num_sides, vol, c_base, c_lat, profile, fill_level=1.0, n_nodes=8):
+    """
+    Generaliza calculate_mass_properties para perfis de densidade arbitrários e
+    enchimento parcial (vetorizado sobre projetos).
+    Retorna: (massa_total, z_cm, altura_otima)
+    """
+    opt_dim, opt_h, _, k_area = calculate_optimal_geometry_batch(geo_type, num_sides, vol, c_base, c_lat)
+    total_mass, z_cm = integrate_profile(profile, opt_h, k_area * opt_dim**2, fill_level, n_nodes)
+    return total_mass, z_cm, opt_h
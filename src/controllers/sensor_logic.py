@@ -0,0 +1,184 @@
+import numpy as np
+from src.controllers.thermal_logic import calculate_time_to_failure
+
+# Estimativa online de k e T_amb por tanque a partir de leituras (t, T).
+#
+# Entre duas leituras, dT/dt = -k·(T - T_amb) vira uma regressão linear:
+#     (T_i - T_{i-1}) / Δt  ≈  θ1·T_meio + θ0,   com θ1 = -k e θ0 = k·T_amb
+# (diferença central, erro O(Δt²) para leituras espaçadas bem abaixo de 1/k).
+# Cada tanque mantém um RLS de 2 parâmetros com fator de esquecimento: O(1) por
+# leitura e 8 números de estado, guardados em arrays contíguos (um por campo).
+
+FORGETTING = 0.995     # peso das leituras antigas (~200 leituras de memória efetiva)
+INITIAL_P = 1e3        # covariância inicial (prior fraco)
+MIN_READINGS = 3       # leituras antes de confiar na estimativa
+K_MIN = 1e-6           # abaixo disso não há resfriamento/aquecimento identificável
+SEQUENTIAL_BELOW = 16  # rodadas com menos tanques que isso vão para o laço escalar
+
+_STATE_FIELDS = ("theta0", "theta1", "p00", "p01", "p11", "last_t", "last_T", "count")
+
+
+class FleetEstimator:
+    """
+    Estado de uma frota inteira em arrays numpy indexados pelo id inteiro do
+    tanque (0..N-1). Cresce automaticamente quando aparece um id maior.
+    """
+
+    def __init__(self, capacity=1024, forgetting=FORGETTING):
+        self.forgetting = forgetting
+        self.state = {name: np.zeros(0) for name in _STATE_FIELDS}
+        self.readings = 0
+        self._grow(capacity)
+
+    @property
+    def size(self):
+        return len(self.state["count"])
+
+    def _grow(self, capacity):
+        old = self.size
+        if capacity <= old:
+            return
+        for name, values in self.state.items():
+            grown = np.zeros(capacity)
+            grown[:old] = values
+            self.state[name] = grown
+        s = self.state
+        s["p00"][old:] = s["p11"][old:] = INITIAL_P
+        s["last_t"][old:] = np.nan
+
+    def update(self, tank_id, t, temp):
+        """
+        Aplica um lote de leituras (arrays do mesmo tamanho, em qualquer ordem).
+        As leituras de um mesmo tanque são aplicadas em ordem de tempo. O lote é
+        processado em rodadas vetorizadas (uma leitura por tanque por rodada)
+        enquanto a rodada tem ao menos SEQUENTIAL_BELOW tanques; o resto (poucos
+        tanques com muitas leituras, p.ex. o replay de um log) segue tanque a
+        tanque no laço escalar, O(1) por leitura.
+        Retorna: ids dos tanques atualizados
+        """
+        tank_id = np.asarray(tank_id, dtype=np.intp)
+        t = np.asarray(t, dtype=float)
+        temp = np.asarray(temp, dtype=float)
+        if tank_id.size == 0:
+            return tank_id
+        if tank_id.min() < 0:
+            raise ValueError("Ids de tanque devem ser inteiros >= 0")
+        if tank_id.max() >= self.size:
+            self._grow(max(2 * self.size, int(tank_id.max()) + 1))
+
+        order = np.lexsort((t, tank_id))
+        tank_id, t, temp = tank_id[order], t[order], temp[order]
+        # Posição de cada leitura dentro do seu tanque: 0, 1, 2, ...
+        starts = np.flatnonzero(np.r_[True, tank_id[1:] != tank_id[:-1]])
+        rank = np.arange(tank_id.size) - np.repeat(starts, np.diff(np.r_[starts, tank_id.size]))
+
+        # Rodadas contíguas: ordena uma vez por (rodada, tanque) e fatia pelos limites
+        by_round = np.lexsort((tank_id, rank))
+        bounds = np.searchsorted(rank[by_round], np.arange(int(rank.max()) + 2))
+        n_vectorized = 0
+        for r in range(bounds.size - 1):
+            lo, hi = bounds[r], bounds[r + 1]
+            if hi - lo < SEQUENTIAL_BELOW:
+                break
+            sel = by_round[lo:hi]
+            self._update_round(tank_id[sel], t[sel], temp[sel])
+            n_vectorized = r + 1
+
+        # As rodadas só encolhem: o que sobrou é de poucos tanques, em ordem de tempo
+        rest = np.flatnonzero(rank >= n_vectorized)
+        if rest.size:
+            cuts = np.flatnonzero(np.diff(tank_id[rest])) + 1
+            for part in np.split(rest, cuts):
+                self._update_sequential(int(tank_id[part[0]]), t[part], temp[part])
+        self.readings += tank_id.size
+        return tank_id[starts]
+
+    def _update_round(self, idx, t, temp):
+        s, lam = self.state, self.forgetting
+        last_t, last_T = s["last_t"][idx], s["last_T"][idx]
+        dt = t - last_t
+        ok = dt > 0  # NaN (primeira leitura) e leituras fora de ordem ficam de fora
+
+        if ok.any():
+            i, dt_ok = idx[ok], dt[ok]
+            x = (temp[ok] + last_T[ok]) / 2      # regressor (T no meio do intervalo)
+            y = (temp[ok] - last_T[ok]) / dt_ok  # observação (dT/dt)
+            th0, th1 = s["theta0"][i], s["theta1"][i]
+            p00, p01, p11 = s["p00"][i], s["p01"][i], s["p11"][i]
+
+            # φ = [1, x];  P·φ = [p00 + p01·x, p01 + p11·x]
+            g0 = p00 + p01 * x
+            g1 = p01 + p11 * x
+            denom = lam + g0 + g1 * x
+            k0, k1 = g0 / denom, g1 / denom
+            err = y - (th0 + th1 * x)
+
+            s["theta0"][i] = th0 + k0 * err
+            s["theta1"][i] = th1 + k1 * err
+            # P <- (P - K·φᵀ·P) / λ, mantendo a simetria
+            s["p00"][i] = (p00 - k0 * g0) / lam
+            s["p01"][i] = (p01 - k0 * g1) / lam
+            s["p11"][i] = (p11 - k1 * g1) / lam
+            s["count"][i] += 1
+
+        newer = ~(dt <= 0)  # guarda a leitura mais recente (inclui a primeira de cada tanque)
+        s["last_t"][idx[newer]] = t[newer]
+        s["last_T"][idx[newer]] = temp[newer]
+
+    def _update_sequential(self, i, t, temp):
+        """Mesmas contas de _update_round para as leituras (em ordem) de um único tanque, com floats."""
+        s, lam = self.state, self.forgetting
+        th0, th1, p00, p01, p11, last_t, last_T, count = (float(s[name][i]) for name in _STATE_FIELDS)
+        for t_k, temp_k in zip(t.tolist(), temp.tolist()):
+            dt = t_k - last_t
+            if dt > 0:
+                x = (temp_k + last_T) / 2
+                y = (temp_k - last_T) / dt
+                g0 = p00 + p01 * x
+                g1 = p01 + p11 * x
+                denom = lam + g0 + g1 * x
+                k0, k1 = g0 / denom, g1 / denom
+                err = y - (th0 + th1 * x)
+                th0, th1 = th0 + k0 * err, th1 + k1 * err
+                p00, p01, p11 = (p00 - k0 * g0) / lam, (p01 - k0 * g1) / lam, (p11 - k1 * g1) / lam
+                count += 1
+            if not dt <= 0:  # NaN (primeira leitura) também grava
+                last_t, last_T = t_k, temp_k
+        for name, value in zip(_STATE_FIELDS, (th0, th1, p00, p01, p11, last_t, last_T, count)):
+            s[name][i] = value
+
+    def estimates(self):
+        """
+        Estimativas atuais de todos os tanques já vistos.
+        Retorna: (ids, k, T_amb, T_atual, t_ultima_leitura, leituras_usadas)
+        """
+        s = self.state
+        seen = np.flatnonzero(~np.isnan(s["last_t"]))
+        k = -s["theta1"][seen]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_amb = np.where(np.abs(k) > K_MIN, s["theta0"][seen] / k, np.nan)
+        return seen, k, t_amb, s["last_T"][seen], s["last_t"][seen], s["count"][seen].astype(int)
+
+    def time_to_critical(self, t_critical, horizon=np.inf):
+        """
+        Previsão rolante, com o mesmo modelo de thermal_logic.simulate_cooling,
+        a partir da última leitura de cada tanque.
+        Retorna: (ids, horas_ate_critico) — NaN se não cruza (ou sem leituras suficientes)
+        """
+        ids, k, t_amb, t_now, _, count = self.estimates()
+        ttf = calculate_time_to_failure(t_amb, t_now, t_critical, k, horizon)
+        ttf = np.where((count >= MIN_READINGS) & (k > K_MIN), ttf, np.where(t_now >= t_critical, 0.0, np.nan))
+        return ids, np.atleast_1d(ttf)
+
+    def risk_table(self, t_critical, top=50, horizon=np.inf):
+        """
+        Tanques ordenados pelo tempo até o limite (os já críticos primeiro).
+        Retorna: dict de colunas (arrays) com no máximo `top` linhas
+        """
+        ids, k, t_amb, t_now, t_last, count = self.estimates()
+        _, ttf = self.time_to_critical(t_critical, horizon)
+        order = np.argsort(np.where(np.isnan(ttf), np.inf, ttf), kind='stable')[:top]
+        return {
+            "tanque": ids[order], "T_atual": t_now[order], "k": k[order], "T_amb": t_amb[order],
+            "horas_ate_critico": ttf[order], "ultima_leitura": t_last[order], "leituras": count[order],
+        }
@@ -0,0 +1,240 @@
+import os
+import numpy as np
+
+# Perfil de temperatura ao longo da altura (modelo 1-D), para vários tanques.
+#
+# O líquido é dividido em n_z nós em z = linspace(0, H, n_z), o mesmo eixo de
+# physics_logic.generate_density_profile (0 = base, H = topo). Cada nó troca
+# calor por condução/mistura vertical com os vizinhos (difusividade efetiva
+# alpha, m²/h), com o ambiente pelo costado (a mesma taxa k de Newton, 1/h), e
+# os nós das pontas trocam também pela tampa (h_top, m/h, com o ar) e pelo
+# fundo (h_bottom, m/h, com o solo). Volumes finitos centrados nos nós:
+#
+#     w_j·dT_j/dt = g·(T_{j+1} - T_j) - g·(T_j - T_{j-1}) - w_j·k·(T_j - T_amb) [+ tampa/fundo]
+#     g = alpha/dz,  w_j = dz (interno) ou dz/2 (pontas)
+#
+# Isso é dT/dt = A·T + s(t), com A tridiagonal e constante no tempo. O passo
+# implícito (método theta: 1 = Euler implícito, 0.5 = Crank-Nicolson) resolve
+# (I - theta·dt·A)·T_novo = (I + (1-theta)·dt·A)·T + dt·s, pelo algoritmo de
+# Thomas em O(n_z). A fatoração é feita uma vez; cada passo só faz as duas
+# varreduras, cada uma vetorizada sobre todos os tanques.
+#
+# Sem troca pela tampa/fundo e com T inicial uniforme, o perfil fica uniforme e
+# recai no modelo concentrado de Newton (thermal_logic).
+
+DEFAULT_N_Z = 50
+DEFAULT_ALPHA = 0.05      # m²/h, mistura efetiva (água parada ~5e-4; convecção aumenta)
+DEFAULT_H_TOP = 0.05      # m/h, troca pela tampa com o ar
+DEFAULT_H_BOTTOM = 0.02   # m/h, troca pelo fundo com o solo
+CHECKPOINT_FILES = ("t.npy", "T.npy", "estado.npz")
+
+
+def height_grid(h, n_z=DEFAULT_N_Z):
+    """Nós do perfil: z = linspace(0, H, n_z) por tanque. Retorna: array (n_tanques, n_z)"""
+    return np.atleast_1d(np.asarray(h, dtype=float))[:, None] * np.linspace(0.0, 1.0, n_z)
+
+
+def heat_operator(h, n_z, alpha, k_const, h_top, h_bottom):
+    """
+    Coeficientes do sistema dT/dt = A·T + peso_amb·T_amb(t) + peso_solo·T_solo.
+    Todos os arrays têm shape (n_z, n_tanques), o eixo da altura primeiro para
+    que cada nó seja uma fatia contígua nas varreduras de Thomas.
+    Retorna: (sub, diag, super, peso_amb, peso_solo) — sub[0] e super[-1] valem 0
+    """
+    if n_z < 2:
+        raise ValueError("O perfil precisa de ao menos 2 nós (n_z >= 2)")
+    h, alpha, k_const, h_top, h_bottom = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (h, alpha, k_const, h_top, h_bottom))
+    )
+    dz = h / (n_z - 1)
+    width = np.repeat(dz[None, :], n_z, axis=0)
+    width[0] /= 2
+    width[-1] /= 2
+    g = alpha / dz
+
+    lower = np.zeros_like(width)
+    upper = np.zeros_like(width)
+    lower[1:] = g / width[1:]
+    upper[:-1] = g / width[:-1]
+
+    amb_weight = np.repeat(k_const[None, :], n_z, axis=0)
+    amb_weight[-1] += h_top / width[-1]
+    ground_weight = np.zeros_like(width)
+    ground_weight[0] = h_bottom / width[0]
+
+    diag = -(lower + upper) - amb_weight - ground_weight
+    return lower, diag, upper, amb_weight, ground_weight
+
+
+def factor_tridiagonal(lower, diag, upper):
+    """
+    Varredura direta de Thomas feita uma única vez (a matriz não muda entre passos).
+    Retorna: (c_linha, inv_denominador, sub_escalado) para solve_factored
+    """
+    c_prime = np.empty_like(diag)
+    inv = np.empty_like(diag)
+    inv[0] = 1.0 / diag[0]
+    c_prime[0] = upper[0] * inv[0]
+    for j in range(1, diag.shape[0]):
+        inv[j] = 1.0 / (diag[j] - lower[j] * c_prime[j - 1])
+        c_prime[j] = upper[j] * inv[j]
+    return c_prime, inv, lower * inv
+
+
+def solve_factored(factors, rhs):
+    """
+    Resolve o sistema tridiagonal fatorado para rhs (n_z, n_tanques), no lugar.
+    Duas varreduras em O(n_z), cada linha é uma operação sobre todos os tanques.
+    """
+    c_prime, inv, lower_scaled = factors
+    rhs[0] *= inv[0]
+    for j in range(1, rhs.shape[0]):
+        rhs[j] *= inv[j]
+        rhs[j] -= lower_scaled[j] * rhs[j - 1]
+    for j in range(rhs.shape[0] - 2, -1, -1):
+        rhs[j] -= c_prime[j] * rhs[j + 1]
+    return rhs
+
+
+def _apply(lower, diag, upper, temp):
+    """Produto A·T com A tridiagonal (sem laço)."""
+    out = diag * temp
+    out[1:] += lower[1:] * temp[:-1]
+    out[:-1] += upper[:-1] * temp[1:]
+    return out
+
+
+def stream_heat_profile(t_amb, t_initial, t_critical, k_const, h, t_end, dt=0.05, n_z=DEFAULT_N_Z,
+                        alpha=DEFAULT_ALPHA, h_top=DEFAULT_H_TOP, h_bottom=DEFAULT_H_BOTTOM, t_ground=None,
+                        output_step=None, theta=1.0, chunk_size=256, start=None):
+    """
+    Integra o perfil vertical de vários tanques com passo implícito fixo dt,
+    detectando o instante (interpolado entre passos) e a altura em que alguma
+    camada de cada tanque atinge t_critical.
+
+    t_amb: constante ou função T_amb(t) (ex.: thermal_logic.daily_ambient).
+    t_initial: escalar, por tanque, ou perfil (n_tanques, n_z).
+    t_ground: temperatura do solo (padrão: T_amb no instante 0).
+    output_step: intervalo das amostras (múltiplo de dt; padrão: cada passo).
+                 O horizonte é arredondado para cima até a próxima amostra.
+    start: (t, T[n_z, n_tanques], tempo_ate_falha, z_falha) para continuar uma
+           integração interrompida (ver solve_heat_profile_to_memmap).
+
+    Gera: (t_bloco [m], T_bloco [m, n_tanques, n_z], tempo_ate_falha [n_tanques],
+           z_falha [n_tanques], estado) com NaN para quem ainda não cruzou e
+           estado = (t, T) no instante da última amostra do bloco.
+    """
+    ambient = t_amb if callable(t_amb) else (lambda t, value=np.asarray(t_amb, dtype=float): value)
+    lower, diag, upper, amb_weight, ground_weight = heat_operator(h, n_z, alpha, k_const, h_top, h_bottom)
+    n_tanks = diag.shape[1]
+    t_critical = np.broadcast_to(np.asarray(t_critical, dtype=float), (n_tanks,))
+    z = height_grid(np.broadcast_to(np.asarray(h, dtype=float), (n_tanks,)), n_z).T
+    ground = np.broadcast_to(ambient(0.0) if t_ground is None else np.asarray(t_ground, dtype=float), (n_tanks,))
+    ground_source = ground_weight * ground
+
+    # Matriz do passo implícito: M = I - theta·dt·A (fatorada uma vez)
+    factors = factor_tridiagonal(-theta * dt * lower, 1.0 - theta * dt * diag, -theta * dt * upper)
+    explicit = (1.0 - theta) * dt
+
+    out_every = max(1, int(round(output_step / dt))) if output_step else 1
+    n_steps = out_every * int(np.ceil(round(t_end / dt, 9) / out_every))
+
+    if start is None:
+        t0 = 0.0
+        temp = np.array(np.broadcast_to(np.asarray(t_initial, dtype=float).T, (n_z, n_tanks)))
+        t_max = temp.max(axis=0)
+        time_to_fail = np.where(t_max >= t_critical, 0.0, np.nan)
+        z_fail = np.where(t_max >= t_critical, z[np.argmax(temp, axis=0), np.arange(n_tanks)], np.nan)
+    else:
+        t0, temp, time_to_fail, z_fail = (np.array(x, dtype=float) for x in start)
+        t0 = float(t0)
+        t_max = temp.max(axis=0)
+    first_step = int(round(t0 / dt))
+
+    buf_t, buf_temp = [t0], [temp.T.copy()]
+    for step in range(first_step + 1, n_steps + 1):
+        t = step * dt
+        rhs = temp + explicit * _apply(lower, diag, upper, temp) if explicit else temp.copy()
+        rhs += dt * (amb_weight * ambient(t - explicit) + ground_source)
+        temp = solve_factored(factors, rhs)
+
+        # Alguma camada cruzou o limite neste passo? Interpola o instante pelo máximo do perfil
+        new_max = temp.max(axis=0)
+        crossed = np.isnan(time_to_fail) & (new_max >= t_critical)
+        if crossed.any():
+            frac = (t_critical[crossed] - t_max[crossed]) / (new_max[crossed] - t_max[crossed])
+            time_to_fail[crossed] = t - dt + np.clip(frac, 0.0, 1.0) * dt
+            z_fail[crossed] = z[np.argmax(temp[:, crossed], axis=0), np.flatnonzero(crossed)]
+        t_max = new_max
+
+        if step % out_every == 0:
+            buf_t.append(t)
+            buf_temp.append(temp.T.copy())
+            if len(buf_t) >= chunk_size:
+                yield np.array(buf_t), np.array(buf_temp), time_to_fail.copy(), z_fail.copy(), (t, temp.copy())
+                buf_t, buf_temp = [], []
+
+    if buf_t:
+        yield np.array(buf_t), np.array(buf_temp), time_to_fail.copy(), z_fail.copy(), (n_steps * dt, temp.copy())
+
+
+def solve_heat_profile(t_amb, t_initial, t_critical, k_const, h, t_end, **kwargs):
+    """
+    Junta os blocos de stream_heat_profile (para horizontes que cabem na memória).
+    Retorna: (t_valores, T_valores [m, n_tanques, n_z], z [n_tanques, n_z], tempo_ate_falha, z_falha)
+    """
+    chunks = list(stream_heat_profile(t_amb, t_initial, t_critical, k_const, h, t_end, **kwargs))
+    n_z = chunks[0][1].shape[-1]
+    h = np.broadcast_to(np.asarray(h, dtype=float), (chunks[0][1].shape[1],))
+    return (np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks]),
+            height_grid(h, n_z), chunks[-1][2], chunks[-1][3])
+
+
+def solve_heat_profile_to_memmap(directory, t_amb, t_initial, t_critical, k_const, h, t_end, dt=0.05,
+                                 output_step=1.0, n_z=DEFAULT_N_Z, resume=True, **kwargs):
+    """
+    Versão para corridas longas: a série vai para arrays mapeados em disco
+    (directory/T.npy em float32 [m, n_tanques, n_z] e directory/t.npy), escritos
+    bloco a bloco. Depois de cada bloco o estado exato (float64) é gravado em
+    estado.npz; com resume=True uma corrida interrompida continua de lá (os
+    parâmetros precisam ser os mesmos).
+    Retorna: (t [memmap], T [memmap], tempo_ate_falha, z_falha)
+    """
+    os.makedirs(directory, exist_ok=True)
+    t_path, temp_path, state_path = (os.path.join(directory, name) for name in CHECKPOINT_FILES)
+    n_tanks = np.broadcast_shapes(*(np.shape(np.atleast_1d(x)) for x in (h, k_const, t_critical)))[0]
+    out_every = max(1, int(round(output_step / dt)))
+    n_out = int(np.ceil(round(t_end / dt, 9) / out_every)) + 1
+    shape = (n_out, n_tanks, n_z)
+
+    start = None
+    if resume and os.path.exists(state_path):
+        with np.load(state_path) as saved:
+            if tuple(saved["shape"]) != shape or float(saved["dt"]) != dt or int(saved["out_every"]) != out_every:
+                raise ValueError(f"Checkpoint em {directory} é de outra corrida (shape/dt/output_step diferentes)")
+            if bool(saved["done"]):
+                return (np.load(t_path, mmap_mode='r'), np.load(temp_path, mmap_mode='r'),
+                        saved["time_to_fail"], saved["z_fail"])
+            start = (saved["t"], saved["temp"], saved["time_to_fail"], saved["z_fail"])
+        t_out = np.lib.format.open_memmap(t_path, mode='r+')
+        temp_out = np.lib.format.open_memmap(temp_path, mode='r+')
+    else:
+        t_out = np.lib.format.open_memmap(t_path, mode='w+', dtype=np.float64, shape=(n_out,))
+        temp_out = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float32, shape=shape)
+
+    time_to_fail = z_fail = None
+    for t_chunk, temp_chunk, time_to_fail, z_fail, (t_state, temp_state) in stream_heat_profile(
+            t_amb, t_initial, t_critical, k_const, h, t_end, dt=dt, n_z=n_z, output_step=output_step,
+            start=start, **kwargs):
+        rows = np.rint(t_chunk / (dt * out_every)).astype(np.intp)
+        t_out[rows] = t_chunk
+        temp_out[rows] = temp_chunk
+        t_out.flush()
+        temp_out.flush()
+        # Grava o estado num arquivo temporário e troca de uma vez: nunca fica pela metade
+        tmp_path = state_path + ".tmp.npz"
+        np.savez(tmp_path, t=t_state, temp=temp_state, time_to_fail=time_to_fail, z_fail=z_fail, shape=shape,
+                 dt=dt, out_every=out_every, done=rows[-1] == n_out - 1)
+        os.replace(tmp_path, state_path)
+
+    return np.load(t_path, mmap_mode='r'), np.load(temp_path, mmap_mode='r'), time_to_fail, z_fail
@@ -0,0 +1,94 @@
+import numpy as np
+from src.controllers.optimization_logic import calculate_optimal_geometry_batch
+
+# Eixos aceitos na varredura e seus valores padrão quando ficam de fora do grid.
+# ratio = c_base / c_lat; num_sides = 0 representa o cilindro.
+SWEEP_AXES = {"ratio": 2.0, "vol": 1000.0, "num_sides": 0, "c_lat": 10.0}
+
+# Pontos do grid avaliados por vez: limita a memória dos intermediários do NumPy
+TILE_SIZE = 65_536
+
+
+def _normalize_axes(axes):
+    unknown = set(axes) - set(SWEEP_AXES)
+    if unknown:
+        raise ValueError(f"Eixos desconhecidos na varredura: {', '.join(sorted(unknown))}")
+    return {name: np.atleast_1d(np.asarray(values, dtype=float)) for name, values in axes.items()}
+
+
+def evaluate_points(ratio, vol, num_sides, c_lat):
+    """
+    Avalia projetos ponto a ponto (arrays broadcastáveis).
+    Pontos inviáveis (prisma com menos de 3 lados ou lados não inteiros, volume
+    ou custos não positivos) saem como NaN.
+    Retorna: (custo_minimo, razao_altura_largura, dimensao_otima, altura_otima)
+    """
+    num_sides = np.asarray(num_sides, dtype=float)
+    is_cyl = num_sides == 0
+    c_lat = np.asarray(c_lat, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):  # os inviáveis viram NaN logo abaixo
+        opt_dim, opt_h, min_cost, _ = calculate_optimal_geometry_batch(is_cyl, num_sides, vol, ratio * c_lat, c_lat)
+
+        # Largura = maior dimensão da planta (diâmetro do círculo circunscrito)
+        n_safe = np.where(is_cyl, 4.0, num_sides)
+        width = np.where(is_cyl, 2 * opt_dim, opt_dim / np.sin(np.pi / n_safe))
+        hw_ratio = opt_h / width
+
+    feasible = (is_cyl | ((num_sides >= 3) & (num_sides == np.round(num_sides)))) \
+        & (np.asarray(vol) > 0) & (np.asarray(ratio) > 0) & (c_lat > 0)
+    return tuple(np.where(feasible, x, np.nan) for x in (min_cost, hw_ratio, opt_dim, opt_h))
+
+
+def iter_grid_tiles(axes, tile_size=TILE_SIZE):
+    """
+    Percorre o grid N-dimensional formado pelos eixos em blocos de tile_size pontos.
+    axes: dict ordenado {nome_do_eixo: valores}; eixos ausentes usam SWEEP_AXES.
+    Gera: (fatia_no_indice_achatado, custo, razao_h_w) por bloco
+    """
+    axes = _normalize_axes(axes)
+    shape = tuple(len(v) for v in axes.values())
+    total = int(np.prod(shape))
+
+    for start in range(0, total, tile_size):
+        flat = np.arange(start, min(start + tile_size, total))
+        index = np.unravel_index(flat, shape)
+        point = dict(SWEEP_AXES)
+        point.update({name: values[idx] for (name, values), idx in zip(axes.items(), index)})
+        cost, hw_ratio, _, _ = evaluate_points(point["ratio"], point["vol"], point["num_sides"], point["c_lat"])
+        yield slice(start, start + len(flat)), cost, hw_ratio
+
+
+def evaluate_grid(axes, tile_size=TILE_SIZE):
+    """
+    Avalia o grid completo. Retorna: (custo, razao_h_w) com shape = (len(eixo) para cada eixo)
+    """
+    shape = tuple(len(np.atleast_1d(v)) for v in axes.values())
+    cost = np.empty(int(np.prod(shape)))
+    hw_ratio = np.empty_like(cost)
+    for tile, cost_tile, hw_tile in iter_grid_tiles(axes, tile_size):
+        cost[tile] = cost_tile
+        hw_ratio[tile] = hw_tile
+    return cost.reshape(shape), hw_ratio.reshape(shape)
+
+
+def find_cheapest(axes, tile_size=TILE_SIZE):
+    """
+    Redução em streaming: encontra o ponto de menor custo sem materializar o grid.
+    Pontos inviáveis (custo NaN) são ignorados.
+    Retorna: (custo_minimo, {eixo: valor}), ou (inf, None) se nenhum ponto do grid for viável
+    """
+    norm_axes = _normalize_axes(axes)
+    shape = tuple(len(v) for v in norm_axes.values())
+    best_cost, best_flat = np.inf, None
+    for tile, cost_tile, _ in iter_grid_tiles(norm_axes, tile_size):
+        feasible = ~np.isnan(cost_tile)
+        if not feasible.any():
+            continue
+        i = int(np.argmin(np.where(feasible, cost_tile, np.inf)))
+        if cost_tile[i] < best_cost:
+            best_cost, best_flat = float(cost_tile[i]), tile.start + i
+
+    if best_flat is None:
+        return np.inf, None
+    index = np.unravel_index(best_flat, shape)
+    return best_cost, {name: float(values[idx]) for (name, values), idx in zip(norm_axes.items(), index)}
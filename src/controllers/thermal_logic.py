@@ -1,15 +1,221 @@
 import numpy as np
 
-def simulate_cooling(t_amb, t_initial, t_critical, time_span, k_const):
+def simulate_cooling(t_amb, t_initial, t_critical, time_span, k_const, num_points=100):
     """
     Resolve a EDO de Newton e verifica falhas.
+    O tempo até a falha vem da solução exata (calculate_time_to_failure), e o
+    instante do cruzamento é inserido na curva para o gráfico passar por ele.
     """
-    t_values = np.linspace(0, time_span, 100)
+    t_values = np.linspace(0, time_span, num_points)
+
+    # Verificação de Risco (cruzamento analítico, não limitado à malha do gráfico)
+    time_to_fail = calculate_time_to_failure(t_amb, t_initial, t_critical, k_const, time_span)
+    time_to_fail = None if np.isnan(time_to_fail) else float(time_to_fail)
+    if time_to_fail is not None:
+        t_values = np.insert(t_values, np.searchsorted(t_values, time_to_fail), time_to_fail)
+
     # Solução Analítica
-    temp_values = t_amb + (t_initial - t_amb) * np.exp(-k_const * t_values)
-    
-    # Verificação de Risco
-    risk_indices = np.where(temp_values >= t_critical)[0]
-    time_to_fail = t_values[risk_indices[0]] if len(risk_indices) > 0 else None
-    
-    return t_values, temp_values, time_to_fail
\ No newline at end of file
+    temp_values = cooling_temperature(t_values, t_amb, t_initial, k_const)
+
+    return t_values, temp_values, time_to_fail
+
+def cooling_temperature(t, t_amb, t_initial, k_const):
+    """Solução analítica de Newton: T(t) = T_amb + (T_ini - T_amb)·e^(-kt)."""
+    return t_amb + (t_initial - t_amb) * np.exp(-k_const * t)
+
+def calculate_time_to_failure(t_amb, t_initial, t_critical, k_const, time_span=np.inf):
+    """
+    Instante exato em que T(t) = T_amb + (T_ini - T_amb)·e^(-kt) atinge t_critical.
+    Isolando t: t* = -ln[(T_crit - T_amb) / (T_ini - T_amb)] / k
+    Vetorizado: aceita arrays broadcastáveis (um elemento por tanque).
+    Retorna: tempo até a falha (0 se já começa acima do limite; NaN se não cruza até time_span)
+    """
+    t_amb, t_initial, t_critical, k_const = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (t_amb, t_initial, t_critical, k_const))
+    )
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        ratio = (t_critical - t_amb) / (t_initial - t_amb)
+        t_cross = -np.log(ratio) / k_const
+
+    # Só há cruzamento se T_crit e T_ini estão do mesmo lado de T_amb e a
+    # solução cai no futuro (cobre k > 0 e também k < 0, instável)
+    crosses = (ratio > 0) & np.isfinite(t_cross) & (t_cross >= 0)
+    time_to_fail = np.where(t_initial >= t_critical, 0.0, np.where(crosses, t_cross, np.nan))
+    time_to_fail = np.where(time_to_fail <= time_span, time_to_fail, np.nan)
+
+    return time_to_fail[()] if time_to_fail.ndim == 0 else time_to_fail
+
+# --- Ambiente variável: dT/dt = -k·(T - T_amb(t)) resolvida numericamente ---
+
+# Tabela de Butcher de Dormand-Prince 5(4): passo de 5ª ordem com estimativa de erro de 4ª
+_DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_DP_E = np.array([71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+# Saída densa de 4ª ordem: coeficientes de theta, theta², theta³, theta⁴ por estágio
+_DP_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+# Pontos da saída densa (fração do passo) onde se procura o cruzamento do limite
+EVENT_SAMPLES = 16
+_EVENT_THETA = np.linspace(0.0, 1.0, EVENT_SAMPLES + 1)[1:]
+
+def daily_ambient(t_mean, amplitude, period=24.0, peak_hour=15.0):
+    """
+    Ciclo diário senoidal de temperatura ambiente (pico às peak_hour horas).
+    Parâmetros podem ser arrays (um por tanque). Retorna: função T_amb(t)
+    """
+    t_mean, amplitude = np.asarray(t_mean, dtype=float), np.asarray(amplitude, dtype=float)
+    return lambda t: t_mean + amplitude * np.cos(2 * np.pi * (t - peak_hour) / period)
+
+def tabulated_ambient(times, temps):
+    """
+    Série temporal de T_amb (ex.: previsão do tempo), interpolada linearmente.
+    temps pode ser 1-D (série única) ou (n_tanques, len(times)). Retorna: função T_amb(t)
+    """
+    times, temps = np.asarray(times, dtype=float), np.asarray(temps, dtype=float)
+
+    def t_amb(t):
+        i = np.clip(np.searchsorted(times, t, side='right') - 1, 0, len(times) - 2)
+        w = np.clip((t - times[i]) / (times[i + 1] - times[i]), 0.0, 1.0)
+        return temps[..., i] * (1 - w) + temps[..., i + 1] * w
+
+    return t_amb
+
+def stream_cooling_ode(t_amb_func, t_initial, t_critical, k_const, t_end,
+                       output_step=None, rtol=1e-6, atol=1e-6, max_step=1.0, chunk_size=512, h_min=1e-8):
+    """
+    Integra dT/dt = -k·(T - T_amb(t)) para vários tanques ao mesmo tempo
+    (Dormand-Prince adaptativo, passo comum controlado pelo pior tanque),
+    detectando o instante em que cada tanque atinge t_critical.
+
+    A saída é entregue em blocos, para horizontes de semanas sem guardar a
+    série inteira. Com output_step, as amostras são igualmente espaçadas
+    (saída densa do próprio método); sem ele, são os próprios passos.
+
+    O cruzamento é procurado na saída densa ao longo de todo o passo (não só
+    no fim), então um pico que passa do limite e volta dentro de um passo
+    também conta. Passos com erro não finito são rejeitados; se o passo cair
+    abaixo de h_min (h), levanta ValueError.
+
+    Gera: (t_bloco [m], T_bloco [m, n_tanques], tempo_ate_falha [n_tanques])
+          com tempo_ate_falha = NaN para tanques que ainda não cruzaram.
+    """
+    t_initial, t_critical, k_const = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (t_initial, t_critical, k_const))
+    )
+    deriv = lambda t, temp: -k_const * (temp - t_amb_func(t))
+
+    t, temp = 0.0, t_initial.copy()
+    time_to_fail = np.where(temp >= t_critical, 0.0, np.nan)
+    f0 = deriv(t, temp)
+    h = min(max_step, 0.01 * t_end) if t_end > 0 else 0.0
+
+    buf_t, buf_temp = [t], [temp.copy()]
+    next_out = output_step if output_step else None
+
+    while t < t_end:
+        h = min(h, t_end - t)
+        if h < h_min and t_end - t > h_min:
+            raise ValueError(f"Integração não converge em t = {t:.6g} h: passo abaixo de h_min = {h_min:g} h "
+                             "(T_amb ou parâmetros não finitos?)")
+
+        # 1. Estágios de Runge-Kutta
+        stages = [f0]
+        for c, a_row in zip(_DP_C[1:], _DP_A[1:]):
+            y_stage = temp + h * sum(a * k for a, k in zip(a_row, stages) if a)
+            stages.append(deriv(t + c * h, y_stage))
+        temp_new = temp + h * sum(a * k for a, k in zip(_DP_A[6], stages) if a)
+
+        # 2. Controle de erro (norma do pior tanque)
+        err = h * sum(e * k for e, k in zip(_DP_E, stages) if e)
+        scale = atol + rtol * np.maximum(np.abs(temp), np.abs(temp_new))
+        err_norm = np.max(np.abs(err) / scale)
+        if not np.isfinite(err_norm):  # NaN não passaria no teste "> 1" abaixo
+            h *= 0.2
+            continue
+        if err_norm > 1.0:
+            h *= max(0.2, 0.9 * err_norm ** (-1/5))
+            continue
+
+        # Polinômio da saída densa: T(t + theta·h) = T + h·Σ Q_j·theta^(j+1)
+        dense_q = np.stack(stages, axis=-1) @ _DP_P
+
+        # 3. Detecção de eventos: primeira amostra da saída densa acima do limite,
+        #    refinada por bisseção entre ela e a amostra anterior
+        pending = np.flatnonzero(np.isnan(time_to_fail))
+        if pending.size:
+            path = _dense_eval(_EVENT_THETA[:, None], temp[pending], dense_q[pending], h)
+            above = path >= t_critical[pending]
+            hit = above.any(axis=0)
+            if hit.any():
+                rows = pending[hit]
+                first = np.argmax(above[:, hit], axis=0)
+                hi = _EVENT_THETA[first]
+                lo = np.where(first > 0, _EVENT_THETA[first - 1], 0.0)
+                target = t_critical[rows]
+                for _ in range(50):
+                    mid = 0.5 * (lo + hi)
+                    above_mid = _dense_eval(mid, temp[rows], dense_q[rows], h) >= target
+                    hi, lo = np.where(above_mid, mid, hi), np.where(above_mid, lo, mid)
+                time_to_fail[rows] = t + hi * h
+
+        # 4. Saída (amostras uniformes ou o próprio passo)
+        if output_step:
+            while next_out <= t + h + 1e-12 and next_out <= t_end + 1e-12:
+                buf_t.append(next_out)
+                buf_temp.append(_dense_eval((next_out - t) / h, temp, dense_q, h))
+                next_out += output_step
+        else:
+            buf_t.append(t + h)
+            buf_temp.append(temp_new.copy())
+
+        t, temp, f0 = t + h, temp_new, stages[6]  # FSAL: derivada no fim do passo
+        h = min(max_step, h * min(5.0, 0.9 * max(err_norm, 1e-10) ** (-1/5)))
+
+        if len(buf_t) >= chunk_size:
+            yield np.array(buf_t), np.array(buf_temp), time_to_fail.copy()
+            buf_t, buf_temp = [], []
+
+    if buf_t:
+        yield np.array(buf_t), np.array(buf_temp), time_to_fail.copy()
+
+def solve_cooling_ode(t_amb, t_initial, t_critical, k_const, t_end, output_step=None, **kwargs):
+    """
+    Junta os blocos de stream_cooling_ode. Se t_amb for constante (não chamável),
+    usa a solução analítica, que é o caso especial rápido.
+    Retorna: (t_valores, T_valores [m, n_tanques], tempo_ate_falha [n_tanques])
+    """
+    if not callable(t_amb):
+        t_values = np.arange(0, t_end + 1e-12, output_step) if output_step else np.linspace(0, t_end, 100)
+        t_amb, t_initial, t_critical, k_const = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (t_amb, t_initial, t_critical, k_const))
+        )
+        temp_values = t_amb + (t_initial - t_amb) * np.exp(-k_const * t_values[:, None])
+        return t_values, temp_values, calculate_time_to_failure(t_amb, t_initial, t_critical, k_const, t_end)
+
+    chunks = list(stream_cooling_ode(t_amb, t_initial, t_critical, k_const, t_end, output_step, **kwargs))
+    t_values = np.concatenate([c[0] for c in chunks])
+    temp_values = np.concatenate([c[1] for c in chunks])
+    return t_values, temp_values, chunks[-1][2]
+
+def _dense_eval(theta, y0, dense_q, h):
+    """Avalia a saída densa de Dormand-Prince dentro de um passo (theta em [0, 1])."""
+    theta = np.asarray(theta, dtype=float)
+    powers = np.stack([theta, theta**2, theta**3, theta**4], axis=-1)
+    return y0 + h * np.sum(dense_q * powers, axis=-1)
@@ -0,0 +1,167 @@
+import functools
+
+import streamlit as st
+import numpy as np
+from src.controllers import (
+    optimization_logic, physics_logic, thermal_logic, sweep_logic, montecarlo_logic, catalog_logic, farm_logic,
+    stratification_logic,
+)
+from src.utils import profiling, result_store
+
+# Limites de memória dos caches (entradas por função, com descarte LRU do Streamlit).
+# Os caches vivem no processo do servidor e são compartilhados entre todas as sessões.
+RESULT_CACHE_ENTRIES = 512
+FIGURE_CACHE_ENTRIES = 128
+
+
+def timed(phase):
+    """Decorator: mede cada chamada como a fase `phase` da instrumentação (no-op se desligada)."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiling.span(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def cached_result(func):
+    """Memoiza um resultado numérico (cópia por chamada) entre reruns e sessões."""
+    cached = st.cache_data(max_entries=RESULT_CACHE_ENTRIES, show_spinner=False)(func)
+    return timed(f"controller.{func.__name__}")(cached)
+
+
+def cached_figure(func):
+    """
+    Memoiza um construtor de go.Figure entre reruns e sessões.
+    A figura é compartilhada (não copiada): quem a recebe não deve modificá-la.
+    """
+    cached = st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)(func)
+    return timed(f"figura.{func.__name__}")(cached)
+
+
+def stored(kind, compute, geo_type, num_sides, vol, c_base, c_lat, rho_base=None, rho_top=None):
+    """
+    Segundo nível de cache, persistente e compartilhado entre processos
+    (result_store, ligado por TANK_RESULT_STORE). Sem store, só calcula.
+    """
+    store = result_store.default_store()
+    if store is None:
+        return compute()
+    key = result_store.design_key(kind, geo_type == "Cilindro (Padrão)", num_sides, vol, c_base, c_lat, rho_base, rho_top)
+    with profiling.span(f"store.{kind}"):
+        return store.cached(kind, key, compute)
+
+
+@cached_result
+def optimal_geometry(geo_type, num_sides, vol, c_base, c_lat):
+    """Versão memoizada de optimization_logic.calculate_optimal_geometry."""
+    return stored(
+        "optimal_geometry",
+        lambda: optimization_logic.calculate_optimal_geometry(geo_type, num_sides, vol, c_base, c_lat),
+        geo_type, num_sides, vol, c_base, c_lat
+    )
+
+
+@cached_result
+def cost_curve_data(opt_dim, vol, c_base, c_lat, geo_type, num_sides, k_area):
+    """Versão memoizada de optimization_logic.generate_cost_curve_data."""
+    return optimization_logic.generate_cost_curve_data(opt_dim, vol, c_base, c_lat, geo_type, num_sides, k_area)
+
+
+@timed("controller.catalog_index")
+@st.cache_resource(max_entries=8, show_spinner=False)
+def catalog_index(step_mm):
+    """Índice ordenado do catálogo padrão, compartilhado (somente leitura) entre sessões."""
+    return catalog_logic.standard_catalog(step_mm)
+
+
+@cached_result
+def catalog_selection(geo_type, num_sides, vol, c_base, c_lat, step_mm, plate_widths):
+    """Versão memoizada de catalog_logic.select_from_catalog sobre o catálogo padrão."""
+    return catalog_logic.select_from_catalog(
+        geo_type, num_sides, vol, c_base, c_lat, catalog_index(step_mm), plate_widths
+    )
+
+
+@cached_result
+def mass_properties(geo_type, num_sides, vol, c_base, c_lat, rho_base, rho_top):
+    """Versão memoizada de physics_logic.calculate_mass_properties."""
+    return stored(
+        "mass_properties",
+        lambda: physics_logic.calculate_mass_properties(geo_type, num_sides, vol, c_base, c_lat, rho_base, rho_top),
+        geo_type, num_sides, vol, c_base, c_lat, rho_base, rho_top
+    )
+
+
+@cached_result
+def density_profile(h, rho_base, B):
+    """Versão memoizada de physics_logic.generate_density_profile."""
+    return physics_logic.generate_density_profile(h, rho_base, B)
+
+
+@cached_result
+def cooling(t_amb, t_initial, t_critical, time_span, k_const):
+    """Versão memoizada de thermal_logic.simulate_cooling."""
+    return thermal_logic.simulate_cooling(t_amb, t_initial, t_critical, time_span, k_const)
+
+
+@cached_result
+def cooling_daily_cycle(t_amb, amplitude, t_initial, t_critical, time_span, k_const):
+    """
+    Resfriamento com ambiente senoidal (EDO numérica de thermal_logic).
+    Retorna: (t_valores, T_valores, tempo_ate_falha ou None, T_amb_valores)
+    """
+    ambient = thermal_logic.daily_ambient(t_amb, amplitude)
+    t_values, temp_values, time_to_fail = thermal_logic.solve_cooling_ode(
+        ambient, t_initial, t_critical, k_const, time_span, output_step=time_span / 400
+    )
+    time_to_fail = None if np.isnan(time_to_fail[0]) else float(time_to_fail[0])
+    return t_values, temp_values[:, 0], time_to_fail, ambient(t_values)
+
+
+@cached_result
+def heat_profile(t_amb, amplitude, t_initial, t_critical, time_span, k_const, h, alpha, h_top, n_z):
+    """
+    Perfil de temperatura por altura (stratification_logic), ambiente constante
+    ou com ciclo diário. ~400 passos implícitos (estáveis com qualquer dt) e ~200
+    amostras no horizonte.
+    Retorna: (t_valores, T_valores [m, n_z], z [n_z], tempo_ate_falha ou None, z_falha ou None)
+    """
+    ambient = thermal_logic.daily_ambient(t_amb, amplitude) if amplitude else t_amb
+    dt = min(0.25, time_span / 400)
+    t_values, temp_values, z, time_to_fail, z_fail = stratification_logic.solve_heat_profile(
+        ambient, t_initial, t_critical, k_const, h, time_span, dt=dt,
+        output_step=dt * max(1, round(time_span / 200 / dt)), n_z=n_z, alpha=alpha, h_top=h_top
+    )
+    if np.isnan(time_to_fail[0]):
+        return t_values, temp_values[:, 0], z[0], None, None
+    return t_values, temp_values[:, 0], z[0], float(time_to_fail[0]), float(z_fail[0])
+
+
+@cached_result
+def sweep_tile(ratio_values, vol, sides, c_lat):
+    """
+    Bloco memoizado da varredura (linhas = razões de custo, colunas = lados).
+    A chave são os próprios valores do bloco, então mover um único controle
+    reaproveita todos os blocos cujos valores não mudaram.
+    Retorna: (custo, razao_h_w) com shape (len(ratio_values), len(sides))
+    """
+    cost, hw_ratio = sweep_logic.evaluate_grid({"ratio": ratio_values, "num_sides": sides, "vol": [vol], "c_lat": [c_lat]})
+    shape = (len(ratio_values), len(sides))
+    return cost.reshape(shape), hw_ratio.reshape(shape)
+
+
+@cached_result
+def farm_designs(n_tanks, vol_range, geo_type, num_sides, c_base, c_lat, mixed, seed=0):
+    """Versão memoizada de farm_logic.farm_designs."""
+    return farm_logic.farm_designs(n_tanks, vol_range, geo_type, num_sides, c_base, c_lat, mixed, seed)
+
+
+@cached_result
+def monte_carlo(geo_type, num_sides, vol, c_base, c_lat, cv_base, cv_lat, cv_vol, n_samples, seed=0):
+    """Versão memoizada de montecarlo_logic.run_monte_carlo (resumo estatístico, sem as amostras)."""
+    return montecarlo_logic.run_monte_carlo(
+        geo_type, num_sides, vol, c_base, c_lat,
+        rel_std={"c_base": cv_base, "c_lat": cv_lat, "vol": cv_vol}, n_samples=n_samples, seed=seed
+    )
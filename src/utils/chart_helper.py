@@ -0,0 +1,72 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io
+
+# Modo leve: menos pontos (amostragem adaptativa / decimação), float32 no JSON
+# e traços WebGL. Pensado para usuários remotos, onde o tamanho do payload domina.
+LIGHT_MAX_POINTS = 200
+
+
+def adaptive_samples(func, a, b, tol=1e-3, initial=5, max_points=LIGHT_MAX_POINTS):
+    """
+    Amostra func em [a, b] concentrando pontos onde a curva dobra.
+    Um intervalo é subdividido enquanto o ponto médio se afasta da reta entre
+    as pontas mais que tol·(amplitude de y). Retas ficam com `initial` pontos.
+    Retorna: (x, y)
+    """
+    x = np.linspace(a, b, initial)
+    y = func(x)
+    scale = max(float(np.ptp(y)), 1e-12)
+
+    while len(x) < max_points:
+        mid = (x[:-1] + x[1:]) / 2
+        y_mid = func(mid)
+        deviation = np.abs(y_mid - (y[:-1] + y[1:]) / 2)
+        refine = deviation > tol * scale
+        if not refine.any():
+            break
+        # Refina primeiro os intervalos mais curvos, até o limite de pontos
+        budget = max_points - len(x)
+        if refine.sum() > budget:
+            refine &= deviation >= np.sort(deviation[refine])[-budget]
+        order = np.argsort(np.concatenate([x, mid[refine]]), kind='stable')
+        x = np.concatenate([x, mid[refine]])[order]
+        y = np.concatenate([y, y_mid[refine]])[order]
+
+    return x, y
+
+
+def decimate_minmax(x, y, max_points=LIGHT_MAX_POINTS):
+    """
+    Reduz séries longas a ~max_points preservando picos e vales: cada bloco
+    contribui com seu mínimo e seu máximo, na ordem em que aparecem.
+    Retorna: (x, y)
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    n_buckets = max_points // 2
+    if len(x) <= max_points or n_buckets < 1:
+        return x, y
+
+    # Ordena por (bloco, y): o primeiro de cada bloco é o mínimo e o último, o máximo
+    bucket = np.arange(len(y)) * n_buckets // len(y)
+    order = np.lexsort((y, bucket))
+    first = np.flatnonzero(np.diff(bucket[order], prepend=-1))
+    last = np.append(first[1:] - 1, len(y) - 1)
+    i_min, i_max = order[first], order[last]
+    keep = np.unique(np.concatenate([[0, len(x) - 1], i_min, i_max]))
+    return x[keep], y[keep]
+
+
+def compact(values):
+    """Array em float32: metade dos bytes no JSON binário do Plotly, precisão de sobra para a tela."""
+    return np.asarray(values, dtype=np.float32)
+
+
+def line_trace(light, **kwargs):
+    """go.Scattergl (WebGL) no modo leve, go.Scatter no modo normal."""
+    return go.Scattergl(**kwargs) if light else go.Scatter(**kwargs)
+
+
+def figure_bytes(fig):
+    """Tamanho (bytes) do JSON que st.plotly_chart envia para o navegador."""
+    return len(plotly.io.to_json(fig, validate=False))
@@ -0,0 +1,121 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+# Instrumentação das fases de cada rerun. Desligada por padrão: span() devolve um
+# objeto nulo compartilhado, então o custo no caminho quente é uma chamada de função.
+# Liga para o processo todo com a variável de ambiente TANK_PROFILE=1, ou só para
+# a sessão que abriu ?debug=1 na URL: o app chama set_enabled no início de cada
+# rerun e o valor vale apenas para o contexto daquele rerun (ContextVar), então
+# uma sessão em modo debug não liga a medição das outras.
+ENABLED_BY_ENV = os.environ.get("TANK_PROFILE", "") not in ("", "0")
+MAX_SAMPLES = 2000  # janela deslizante por fase
+
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_payloads = {}
+_lock = threading.Lock()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+# Threads novas (cada rerun do Streamlit) começam com o padrão do ambiente
+_enabled = contextvars.ContextVar("tank_profile_enabled", default=ENABLED_BY_ENV)
+
+
+def set_enabled(flag):
+    """Liga/desliga a instrumentação no contexto atual (o rerun da sessão que chamou)."""
+    _enabled.set(bool(flag))
+
+
+def enabled():
+    return _enabled.get()
+
+
+def span(name):
+    """Context manager que mede a fase `name` (no-op quando a instrumentação está desligada)."""
+    return _Span(name) if _enabled.get() else _NULL_SPAN
+
+
+def record(name, seconds):
+    """Registra uma duração (s) para a fase. Os dados são do processo, somando todas as sessões."""
+    with _lock:
+        _samples[name].append(seconds)
+
+
+def record_payload(name, nbytes, light):
+    """Guarda o tamanho (bytes) do último payload enviado por um gráfico."""
+    with _lock:
+        _payloads[name] = (nbytes, light)
+
+
+def payloads():
+    """Último payload por gráfico: {nome: (bytes, modo_leve)}."""
+    with _lock:
+        return dict(_payloads)
+
+
+def samples():
+    """Cópia das durações (s) registradas, por fase."""
+    with _lock:
+        return {name: np.array(values) for name, values in _samples.items()}
+
+
+def summary():
+    """
+    Estatísticas agregadas por fase, ordenadas pelo tempo total.
+    Retorna: lista de dicts com fase, n, total, media, p50, p95 e max (em ms)
+    """
+    rows = []
+    for name, values in samples().items():
+        ms = values * 1e3
+        rows.append({
+            "fase": name, "n": len(ms), "total": float(ms.sum()), "media": float(ms.mean()),
+            "p50": float(np.percentile(ms, 50)), "p95": float(np.percentile(ms, 95)), "max": float(ms.max()),
+        })
+    return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+
+def export(path):
+    """Grava o resumo e as amostras brutas em JSON para análise offline. Retorna: caminho absoluto"""
+    payload = {
+        "exported": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": summary(),
+        "samples_ms": {name: (values * 1e3).round(4).tolist() for name, values in samples().items()},
+        "payload_bytes": {name: nbytes for name, (nbytes, _) in payloads().items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return os.path.abspath(path)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _payloads.clear()
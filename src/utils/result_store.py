@@ -0,0 +1,247 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# Cache persistente de resultados (SQLite em modo WAL), compartilhado entre os
+# processos do Streamlit e os jobs em lote. Liga com TANK_RESULT_STORE=caminho.db.
+#
+# Cada tipo de resultado tem uma versão de fórmula: ao mudar uma fórmula, suba a
+# versão aqui e as entradas antigas deixam de valer (e são apagadas ao abrir).
+FORMULA_VERSIONS = {
+    "optimal_geometry": 3,   # optimization_logic.calculate_optimal_geometry (v3: lados em float na chave)
+    "mass_properties": 3,    # physics_logic.calculate_mass_properties (v3: lados em float na chave)
+}
+DEFAULT_MAX_ENTRIES = 200_000
+EVICT_EVERY = 256            # inserções entre verificações do limite de tamanho
+KEY_DIGITS = 12              # algarismos significativos na normalização da chave
+TOUCH_INTERVAL_S = 60.0      # last_access só é regravado se estiver mais velho que isso
+
+# Chave = bytes de uma linha deste registro (tipo, forma, lados e os números
+# normalizados), montada de forma vetorizada para lotes inteiros de projetos.
+# num_sides fica em float, sem truncar: 6.7 lados não pode cair na entrada de 6.
+_KEY_DTYPE = np.dtype([
+    ("kind", "u1"), ("cyl", "u1"), ("n", "<f8"),
+    ("vol", "<f8"), ("c_base", "<f8"), ("c_lat", "<f8"), ("rho_base", "<f8"), ("rho_top", "<f8"),
+])
+_KIND_IDS = {kind: i for i, kind in enumerate(FORMULA_VERSIONS)}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+"""
+
+
+def _normalize(x):
+    """Arredonda a KEY_DIGITS algarismos significativos (vetorizado)."""
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = np.floor(np.log10(np.abs(x)))
+    scale = 10.0 ** (KEY_DIGITS - 1 - np.where(np.isfinite(exponent), exponent, 0))
+    return np.round(x * scale) / scale
+
+
+def design_keys(kind, is_cyl, num_sides, vol, c_base, c_lat, rho_base=None, rho_top=None):
+    """
+    Chaves normalizadas de um lote de projetos (arrays broadcastáveis): cilindros
+    ignoram num_sides e os números são arredondados a KEY_DIGITS algarismos,
+    então 1000 e 1000.0000000001 coincidem. num_sides entra exato (6 e 6.0
+    coincidem, 6 e 6.7 não). Sem laço por linha em Python.
+    Retorna: lista de chaves (bytes)
+    """
+    is_cyl, num_sides, vol, c_base, c_lat, rho_base, rho_top = np.broadcast_arrays(
+        np.asarray(is_cyl, dtype=bool), np.asarray(num_sides, dtype=float), vol, c_base, c_lat,
+        np.nan if rho_base is None else rho_base, np.nan if rho_top is None else rho_top,
+    )
+    rows = np.zeros(is_cyl.shape, dtype=_KEY_DTYPE).ravel()
+    rows["kind"] = _KIND_IDS[kind]
+    rows["cyl"] = is_cyl.ravel()
+    rows["n"] = np.where(is_cyl, 0.0, num_sides + 0.0).ravel()  # + 0.0 junta -0.0 e 0.0
+    for name, values in (("vol", vol), ("c_base", c_base), ("c_lat", c_lat), ("rho_base", rho_base), ("rho_top", rho_top)):
+        rows[name] = _normalize(values).ravel()
+    return rows.view(np.dtype((np.void, _KEY_DTYPE.itemsize))).tolist()
+
+
+def design_key(kind, is_cyl, num_sides, vol, c_base, c_lat, rho_base=None, rho_top=None):
+    """Chave de um único projeto (a mesma que design_keys gera para a linha)."""
+    return design_keys(kind, is_cyl, num_sides, vol, c_base, c_lat, rho_base, rho_top)[0]
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _encode(value):
+    return _ENCODER.encode([v if isinstance(v, str) else float(v) for v in value])
+
+
+class ResultStore:
+    """
+    Cache chave -> resultado em SQLite. Leitores concorrentes (WAL), uma conexão
+    por thread, descarte LRU limitado a max_entries e contadores de acertos/faltas
+    do processo.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+        self._puts_since_evict = 0
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            for kind, version in FORMULA_VERSIONS.items():
+                conn.execute("DELETE FROM results WHERE kind = ? AND version != ?", (kind, version))
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def get_many(self, kind, keys, chunk=500):
+        """
+        Retorna: {chave: resultado (lista)} só com as chaves encontradas; marca acesso (LRU).
+        Chaves repetidas são consultadas uma vez, mas contam um acerto/falta cada.
+        O acesso só é regravado nas entradas tocadas há mais de TOUCH_INTERVAL_S, então
+        leituras repetidas não disputam a trava de escrita do WAL com os outros processos.
+        """
+        conn = self._connect()
+        unique = list(dict.fromkeys(keys))
+        found = {}
+        stale = []
+        now = time.time()
+        for start in range(0, len(unique), chunk):
+            part = unique[start:start + chunk]
+            rows = conn.execute(
+                f"SELECT key, value, last_access FROM results WHERE version = ? AND key IN ({','.join('?' * len(part))})",
+                (FORMULA_VERSIONS[kind], *part),
+            ).fetchall()
+            for key, value, last_access in rows:
+                found[key] = json.loads(value)
+                if now - last_access > TOUCH_INTERVAL_S:
+                    stale.append(key)
+
+        if stale:
+            with conn:
+                conn.executemany("UPDATE results SET last_access = ? WHERE key = ?", ((now, k) for k in stale))
+        hits = sum(key in found for key in keys)
+        self._count("hits", hits)
+        self._count("misses", len(keys) - hits)
+        return found
+
+    def put_many(self, kind, items):
+        """Grava {chave: resultado} com a versão atual da fórmula do tipo."""
+        if not items:
+            return
+        conn = self._connect()
+        now = time.time()
+        version = FORMULA_VERSIONS[kind]
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (key, kind, version, value, last_access) VALUES (?, ?, ?, ?, ?)",
+                ((key, kind, version, _encode(value), now) for key, value in items.items()),
+            )
+        self._count("puts", len(items))
+
+        with self._lock:
+            self._puts_since_evict += len(items)
+            due = self._puts_since_evict >= EVICT_EVERY
+            if due:
+                self._puts_since_evict = 0
+        if due:
+            self.evict()
+
+    def get(self, kind, key):
+        return self.get_many(kind, [key]).get(key)
+
+    def put(self, kind, key, value):
+        self.put_many(kind, {key: value})
+
+    def cached(self, kind, key, compute):
+        """Resultado do cache ou compute() (gravado em seguida)."""
+        value = self.get(kind, key)
+        if value is None:
+            value = compute()
+            self.put(kind, key, value)
+        return tuple(value)
+
+    def evict(self):
+        """Apaga as entradas menos usadas recentemente acima de max_entries. Retorna: quantas"""
+        conn = self._connect()
+        with conn:
+            excess = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+            if excess <= 0:
+                return 0
+            conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access LIMIT ?)",
+                (excess,),
+            )
+        self._count("evictions", excess)
+        return excess
+
+    def invalidate(self, kind=None):
+        """Apaga tudo (ou só um tipo), p.ex. ao depurar uma fórmula sem subir a versão."""
+        conn = self._connect()
+        with conn:
+            if kind is None:
+                conn.execute("DELETE FROM results")
+            else:
+                conn.execute("DELETE FROM results WHERE kind = ?", (kind,))
+
+    def take_counters(self):
+        """Devolve e zera os contadores deste processo (para somar os de vários workers)."""
+        with self._lock:
+            counters = dict(self._counters)
+            self._counters = dict.fromkeys(counters, 0)
+        return counters
+
+    def add_counters(self, counters):
+        """Soma contadores vindos de outro processo (ver take_counters)."""
+        with self._lock:
+            for name, value in counters.items():
+                self._counters[name] += value
+
+    def stats(self):
+        """Contadores deste processo + tamanho atual do cache (compartilhado)."""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        counters["entries"] = self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return counters
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """Store do processo configurado por TANK_RESULT_STORE (None se desligado)."""
+    global _default_store
+    path = os.environ.get("TANK_RESULT_STORE", "")
+    if not path:
+        return None
+    with _default_lock:
+        if _default_store is None or _default_store.path != os.path.abspath(path):
+            max_entries = int(os.environ.get("TANK_RESULT_STORE_MAX", DEFAULT_MAX_ENTRIES))
+            _default_store = ResultStore(path, max_entries)
+        return _default_store
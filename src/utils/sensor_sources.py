@@ -0,0 +1,223 @@
+import io
+import os
+import socket
+import socketserver
+import threading
+
+import numpy as np
+
+from src.controllers.sensor_logic import FleetEstimator
+
+# Fontes de leituras de sensores. Formato de linha (texto, uma leitura por linha):
+#     id_tanque,t_horas,temperatura_c
+# Linhas em branco, comentários (#) e linhas malformadas são ignoradas.
+
+MAX_READ_BYTES = 4 << 20        # por chamada de read_new (o resto fica para a próxima)
+MAX_PENDING_BYTES = 16 << 20    # buffer do socket; acima disso descarta o mais antigo
+
+
+def parse_lines(text):
+    """
+    Converte linhas completas em arrays. Caminho rápido: np.loadtxt (parser em C)
+    sobre o bloco inteiro; se houver lixo, cai para a conversão linha a linha.
+    Retorna: (ids, t, T)
+    """
+    if not text.strip():
+        return np.zeros(0, dtype=np.intp), np.zeros(0), np.zeros(0)
+    try:
+        values = np.loadtxt(io.StringIO(text), delimiter=",", comments="#", ndmin=2)
+    except ValueError:
+        values = None
+    if values is None or values.shape[1] != 3:
+        rows = []
+        for line in text.splitlines():
+            parts = line.split(",")
+            if len(parts) != 3 or line.lstrip().startswith("#"):
+                continue
+            try:
+                rows.append((int(parts[0]), float(parts[1]), float(parts[2])))
+            except ValueError:
+                continue
+        values = np.array(rows, dtype=float).reshape(-1, 3)
+    return values[:, 0].astype(np.intp), values[:, 1], values[:, 2]
+
+
+def _split_complete(buffer):
+    """Separa as linhas completas do pedaço final ainda sem quebra de linha."""
+    cut = buffer.rfind("\n") + 1
+    return buffer[:cut], buffer[cut:]
+
+
+class FileTail:
+    """Acompanha um arquivo que cresce (como `tail -f`), lendo só o que foi acrescentado."""
+
+    def __init__(self, path, from_start=True):
+        self.path = path
+        self.offset = 0 if from_start or not os.path.exists(path) else os.path.getsize(path)
+        self._partial = ""
+
+    def read_new(self):
+        if not os.path.exists(self.path):
+            return parse_lines("")
+        if os.path.getsize(self.path) < self.offset:  # arquivo truncado/rotacionado
+            self.offset, self._partial = 0, ""
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            f.seek(self.offset)
+            chunk = f.read(MAX_READ_BYTES)
+            self.offset = f.tell()
+        complete, self._partial = _split_complete(self._partial + chunk)
+        return parse_lines(complete)
+
+    def close(self):
+        pass
+
+
+class SocketSource:
+    """
+    Servidor TCP local: cada conexão envia linhas de leitura. Uma thread por
+    conexão acumula o texto; read_new() esvazia o buffer.
+    """
+
+    def __init__(self, host="127.0.0.1", port=9009):
+        self._lock = threading.Lock()
+        self._chunks = []
+        self._pending = 0
+        self._connections = set()
+        self.dropped_bytes = 0
+        source = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                with source._lock:
+                    source._connections.add(self.request)
+                partial = ""
+                try:
+                    while True:
+                        data = self.request.recv(65536)
+                        if not data:
+                            break
+                        complete, partial = _split_complete(partial + data.decode("utf-8", errors="replace"))
+                        if complete:
+                            source._push(complete)
+                except OSError:  # conexão encerrada por close()
+                    pass
+                finally:
+                    with source._lock:
+                        source._connections.discard(self.request)
+
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler, bind_and_activate=False)
+        self.server.daemon_threads = True
+        self.server.allow_reuse_address = True
+        self.server.server_bind()
+        self.server.server_activate()
+        self.address = self.server.server_address
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _push(self, text):
+        with self._lock:
+            self._chunks.append(text)
+            self._pending += len(text)
+            while self._pending > MAX_PENDING_BYTES and len(self._chunks) > 1:
+                dropped = self._chunks.pop(0)
+                self._pending -= len(dropped)
+                self.dropped_bytes += len(dropped)
+
+    def read_new(self):
+        with self._lock:
+            chunks, self._chunks, self._pending = self._chunks, [], 0
+        return parse_lines("".join(chunks))
+
+    def close(self):
+        """Para o servidor, libera a porta e derruba as conexões abertas (encerrando suas threads)."""
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class FleetFeed:
+    """Fonte + estimador da frota. poll() é seguro para várias sessões ao mesmo tempo."""
+
+    def __init__(self, source, estimator=None):
+        self.source = source
+        self.estimator = estimator or FleetEstimator()
+        self._lock = threading.RLock()
+
+    def poll(self):
+        """Consome o que chegou desde a última chamada. Retorna: leituras aplicadas"""
+        with self._lock:
+            ids, t, temp = self.source.read_new()
+            self.estimator.update(ids, t, temp)
+            return len(ids)
+
+    def snapshot(self, t_critical, top=50):
+        """
+        poll() seguido do resumo de risco, sem outra sessão atualizando no meio.
+        Retorna: (tabela de risk_table, resumo {monitorados, criticos, criticos_6h, leituras})
+        """
+        with self._lock:
+            self.poll()
+            _, ttf = self.estimator.time_to_critical(t_critical)
+            summary = {
+                "monitorados": ttf.size,
+                "criticos": int(np.sum(ttf == 0)),
+                "criticos_6h": int(np.sum((ttf > 0) & (ttf <= 6))),
+                "leituras": self.estimator.readings,
+            }
+            return self.estimator.risk_table(t_critical, top), summary
+
+    def close(self):
+        self.source.close()
+
+
+def open_feed(kind, address):
+    """kind = "arquivo" (address = caminho) ou "socket" (address = "host:porta")."""
+    if kind == "arquivo":
+        return FleetFeed(FileTail(address))
+    if kind == "socket":
+        host, _, port = address.rpartition(":")
+        return FleetFeed(SocketSource(host or "127.0.0.1", int(port)))
+    raise ValueError(f"Fonte desconhecida: {kind}")
+
+
+def configured_source():
+    """
+    Fonte definida no servidor por TANK_SENSOR_SOURCE: "arquivo:caminho" ou
+    "socket:host:porta". Retorna: (kind, address) ou None se desligada
+    """
+    config = os.environ.get("TANK_SENSOR_SOURCE", "")
+    if not config:
+        return None
+    kind, _, address = config.partition(":")
+    return kind, address
+
+
+_default_feed = None
+_default_source = None
+_default_lock = threading.Lock()
+
+
+def default_feed():
+    """
+    Fonte + estimador do processo, compartilhados entre as sessões (None se
+    TANK_SENSOR_SOURCE não estiver definida). Se a configuração mudar, a fonte
+    anterior é fechada antes de abrir a nova (libera a porta e as threads).
+    """
+    global _default_feed, _default_source
+    source = configured_source()
+    with _default_lock:
+        if source != _default_source:
+            if _default_feed is not None:
+                _default_feed.close()
+            _default_feed, _default_source = None, None
+            if source is not None:
+                _default_feed = open_feed(*source)
+            _default_source = source
+        return _default_feed
@@ -1,13 +1,49 @@
+import functools
+import weakref
+
 import streamlit as st
 
+# Tamanho do JSON por gráfico, medido uma vez por figura: {fase: (weakref da figura, bytes)}.
+# As figuras vêm de cached_figure e se repetem entre reruns, então a medição só
+# refaz o to_json quando a figura da fase muda.
+_payload_sizes = {}
+
+@functools.lru_cache(maxsize=None)
+def read_asset(file_path):
+    """Lê um arquivo estático uma única vez por processo (os reruns reusam o texto)."""
+    with open(file_path, encoding="utf-8") as f:
+        return f.read()
+
 def load_css(file_path):
     """Carrega o arquivo CSS global."""
     try:
-        with open(file_path) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        st.markdown(f'<style>{read_asset(file_path)}</style>', unsafe_allow_html=True)
     except FileNotFoundError:
         st.error(f"Arquivo de estilo não encontrado: {file_path}")
 
+def light_mode():
+    """Modo de gráficos leves escolhido na sidebar (chave "light_charts")."""
+    return st.session_state.get("light_charts", False)
+
+def show_figure(fig, phase):
+    """st.plotly_chart medido como fase da instrumentação (serialização + envio do JSON)."""
+    from src.utils import profiling
+
+    with profiling.span(f"plotly_chart.{phase}"):
+        st.plotly_chart(fig, use_container_width=True)
+    if profiling.enabled():
+        profiling.record_payload(phase, figure_payload_bytes(fig, phase), light_mode())
+
+def figure_payload_bytes(fig, phase):
+    """Bytes do JSON da figura, reaproveitando a medição anterior se a figura da fase não mudou."""
+    ref, nbytes = _payload_sizes.get(phase, (None, 0))
+    if ref is None or ref() is not fig:
+        from src.utils import chart_helper
+
+        nbytes = chart_helper.figure_bytes(fig)
+        _payload_sizes[phase] = (weakref.ref(fig), nbytes)
+    return nbytes
+
 def render_header():
     """Renderiza o cabeçalho padrão das páginas."""
     st.markdown("""
@@ -27,4 +63,51 @@ def render_header():
         
         **A Solução via Cálculo:** Existe um "ponto ideal" entre esses dois extremos. Usamos **Derivadas Parciais** e **Multiplicadores de Lagrange** para encontrar exatamente onde a taxa de variação do custo se anula em relação à geometria.
         """)
-    
\ No newline at end of file
+    
+def render_timing_panel(export_path="profiling_timings.json"):
+    """Painel de depuração na sidebar: latência por fase dos reruns (todas as sessões do processo)."""
+    from src.utils import profiling
+
+    with st.sidebar.expander("Tempos por Fase (debug)", expanded=False):
+        rows = profiling.summary()
+        if not rows:
+            st.caption("Nenhuma medição ainda.")
+            return
+
+        st.dataframe(rows, hide_index=True, use_container_width=True,
+                     column_config={c: st.column_config.NumberColumn(format="%.2f") for c in ("total", "media", "p50", "p95", "max")})
+
+        import plotly.graph_objects as go
+
+        fig = go.Figure()
+        for name, values in profiling.samples().items():
+            fig.add_trace(go.Histogram(x=values * 1e3, name=name, opacity=0.6, nbinsx=30))
+        fig.update_layout(barmode='overlay', height=260, xaxis_title="ms", showlegend=False,
+                          margin=dict(t=10, b=0, l=0, r=0), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        st.plotly_chart(fig, use_container_width=True)
+
+        payloads = profiling.payloads()
+        if payloads:
+            st.markdown("**Payload por gráfico (último rerun)**")
+            st.dataframe(
+                [{"gráfico": name, "modo": "leve" if light else "normal", "KB": nbytes / 1024} for name, (nbytes, light) in payloads.items()],
+                hide_index=True, use_container_width=True,
+                column_config={"KB": st.column_config.NumberColumn(format="%.1f")}
+            )
+            st.caption(f"Total: {sum(n for n, _ in payloads.values()) / 1024:.1f} KB")
+
+        from src.utils import result_store
+
+        store = result_store.default_store()
+        if store is not None:
+            stats = store.stats()
+            st.caption(
+                f"Cache persistente: {stats['hits']:,} acertos, {stats['misses']:,} faltas "
+                f"({stats['hit_rate']:.0%}), {stats['entries']:,} entradas, {stats['evictions']:,} descartes"
+            )
+
+        col_export, col_reset = st.columns(2)
+        if col_export.button("Exportar", key="profiling_export"):
+            st.caption(f"Gravado em {profiling.export(export_path)}")
+        if col_reset.button("Zerar", key="profiling_reset"):
+            profiling.reset()
@@ -0,0 +1,83 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from src.controllers import farm_logic
+from src.utils import cache_helper, chart_helper, profiling, ui_helper
+
+def render(geo_type, num_sides, vol, c_base, c_lat):
+    st.markdown("<h3 class='sub-header'><i class='bi bi-buildings icon-blue'></i> Parque de Tanques</h3>", unsafe_allow_html=True)
+    st.markdown("Um lote de projetos ótimos, com os custos da barra lateral, desenhado como **uma única malha 3D**.")
+
+    # 1. Inputs Específicos desta View
+    col_n, col_vol, col_mix = st.columns([1, 2, 1])
+    with col_n:
+        n_tanks = st.select_slider("Número de Tanques", [10, 50, 100, 250, 500, 1000, 2500, 5000], value=250)
+    with col_vol:
+        # Padrão em torno do volume da sidebar (que não tem teto), preso à faixa do slider
+        default_lo = min(max(vol / 10, 10.0), 20000.0)
+        default_hi = max(min(vol * 5, 20000.0), default_lo)
+        vol_lo, vol_hi = st.slider("Faixa de Volumes (m³)", 10.0, 20000.0, (default_lo, default_hi))
+    with col_mix:
+        mixed = st.checkbox("Formas Variadas", value=False, help="Cada tanque sorteia cilindro ou prisma de 3 a 12 lados.")
+        seed = int(st.number_input("Semente", 0, 10_000, 0))
+
+    # 2. Projetos (um lote vetorizado) e malha
+    designs = cache_helper.farm_designs(n_tanks, (vol_lo, vol_hi), geo_type, num_sides, c_base, c_lat, mixed, seed)
+    light = ui_helper.light_mode()
+    fig = build_farm_figure(n_tanks, vol_lo, vol_hi, geo_type, num_sides, c_base, c_lat, mixed, seed, light)
+    mesh = fig.data[0]
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Tanques", f"{n_tanks:,}")
+    c2.metric("Volume Total", f"{designs['vol'].sum():,.0f} m³")
+    c3.metric("Custo Total", f"R$ {designs['cost'].sum():,.2f}")
+    c4.metric("Triângulos", f"{len(mesh.i):,}")
+
+    # 3. Malha
+    ui_helper.show_figure(fig, "parque.malha")
+    geometry_bytes = sum(np.asarray(getattr(mesh, axis)).nbytes for axis in ("x", "y", "z", "i", "j", "k", "intensity"))
+    st.caption(f"{len(fig.data)} traços para {n_tanks:,} tanques · {len(mesh.x):,} vértices · "
+               f"~{geometry_bytes * 4 / 3 / 1024:,.0f} KB de geometria no JSON. "
+               "Cilindros pequenos ou distantes da câmera recebem menos segmentos (nível de detalhe).")
+
+@cache_helper.cached_figure
+def build_farm_figure(n_tanks, vol_lo, vol_hi, geo_type, num_sides, c_base, c_lat, mixed, seed, light=False):
+    """
+    Monta o parque: um go.Mesh3d com todos os tanques (cor = custo) e um único
+    Scatter3d de marcadores no topo de cada tanque só para o hover.
+    No modo leve: LOD mais agressivo e coordenadas em float32.
+    """
+    designs = cache_helper.farm_designs(n_tanks, (vol_lo, vol_hi), geo_type, num_sides, c_base, c_lat, mixed, seed)
+    with profiling.span("parque.malha"):
+        mesh, cx, cy, _, _ = farm_logic.build_farm(designs, light)
+
+    x, y, z = mesh["x"], mesh["y"], mesh["z"]
+    intensity = designs["cost"][mesh["tank"]]
+    top = designs["h"]
+    hover_data = np.column_stack([np.arange(n_tanks), designs["vol"], designs["dim"], designs["h"], designs["cost"]])
+    if light:
+        x, y, z, intensity = (chart_helper.compact(a) for a in (x, y, z, intensity))
+        cx, cy, top, hover_data = (chart_helper.compact(a) for a in (cx, cy, top, hover_data))
+
+    fig = go.Figure(data=[
+        go.Mesh3d(
+            x=x, y=y, z=z, i=mesh["i"], j=mesh["j"], k=mesh["k"],
+            intensity=intensity, intensitymode='vertex', colorscale='Blues',
+            colorbar=dict(title="Custo (R$)", thickness=12), flatshading=True, hoverinfo='skip', name='Tanques'
+        ),
+        go.Scatter3d(
+            x=cx, y=cy, z=top, mode='markers', marker=dict(size=2, color='black', opacity=0.4),
+            customdata=hover_data, showlegend=False, name='',
+            hovertemplate="Tanque %{customdata[0]:.0f}<br>Volume: %{customdata[1]:,.0f} m³<br>"
+                          "Dimensão: %{customdata[2]:.2f} m · Altura: %{customdata[3]:.2f} m<br>"
+                          "Custo: R$ %{customdata[4]:,.2f}"
+        ),
+    ])
+    eye = dict(zip("xyz", farm_logic.CAMERA_EYE))
+    fig.update_layout(
+        scene=dict(xaxis_title='X (m)', yaxis_title='Y (m)', zaxis_title='Altura (m)', aspectmode='data', camera=dict(eye=eye)),
+        margin=dict(l=0, r=0, b=0, t=0), height=600,
+        uirevision='parque',
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
@@ -1,13 +1,14 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from src.controllers import optimization_logic
+from src.controllers import catalog_logic, optimization_logic
+from src.utils import cache_helper, chart_helper, ui_helper
 
 def render(geo_type, num_sides, vol, c_base, c_lat):
     st.markdown("<h3 class='sub-header'><i class='bi bi-rulers icon-blue'></i> Geometria de Custo Mínimo</h3>", unsafe_allow_html=True)
     
-    # 1. Chama o Controller
-    opt_dim, opt_h, min_cost, k_area, dim_name = optimization_logic.calculate_optimal_geometry(
+    # 1. Chama o Controller (memoizado entre reruns e sessões)
+    opt_dim, opt_h, min_cost, k_area, dim_name = cache_helper.optimal_geometry(
         geo_type, num_sides, vol, c_base, c_lat
     )
 
@@ -20,48 +21,167 @@ def render(geo_type, num_sides, vol, c_base, c_lat):
     st.markdown("<br>", unsafe_allow_html=True)
 
     # 3. Gráficos
+    light = ui_helper.light_mode()
     col_viz1, col_viz2 = st.columns([1, 1])
 
     with col_viz1:
         st.markdown(f"#### <i class='bi bi-box icon-gray'></i> Modelo 3D", unsafe_allow_html=True)
-        # Lógica de plotagem 3D (simplificada para brevidade, use a completa aqui)
-        z = np.linspace(0, opt_h, 2)
-        if geo_type.startswith("Cil"):
-            theta = np.linspace(0, 2*np.pi, 60)
-            radius_viz = opt_dim
-        else:
-            theta = np.linspace(0, 2*np.pi, num_sides + 1)
-            radius_viz = opt_dim / (2 * np.sin(np.pi / num_sides))
-        
-        theta_grid, z_grid = np.meshgrid(theta, z)
-        x_grid = radius_viz * np.cos(theta_grid)
-        y_grid = radius_viz * np.sin(theta_grid)
-        
-        fig_3d = go.Figure(data=[go.Surface(z=z_grid, x=x_grid, y=y_grid, colorscale='Blues', showscale=False, opacity=0.8)])
-        fig_3d.add_trace(go.Scatter3d(x=x_grid[0], y=y_grid[0], z=z_grid[0], mode='lines', line=dict(color='black', width=2), name='Base'))
-        fig_3d.add_trace(go.Scatter3d(x=x_grid[1], y=y_grid[1], z=z_grid[1], mode='lines', line=dict(color='black', width=2), name='Topo'))
-        fig_3d.update_layout(
-            scene=dict(xaxis_title='X (m)', yaxis_title='Y (m)', zaxis_title='Altura (m)', aspectmode='data'),
-            margin=dict(l=0, r=0, b=0, t=0), height=400,
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_3d, use_container_width=True)
+        fig_3d = build_3d_figure(geo_type, num_sides, opt_dim, opt_h, light)
+        ui_helper.show_figure(fig_3d, "otimização.3d")
 
     with col_viz2:
         st.markdown("#### <i class='bi bi-graph-up icon-gray'></i> Curva de Otimização", unsafe_allow_html=True)
         st.markdown("Observe como o Custo Total (curva azul) atinge o ponto mais baixo exatamente na dimensão calculada.", unsafe_allow_html=True)
-        # Chama Controller para dados do gráfico
-        dim_range, c_curve = optimization_logic.generate_cost_curve_data(opt_dim, vol, c_base, c_lat, geo_type, num_sides, k_area)
-        
-        fig_2d = go.Figure()
-        fig_2d.add_trace(go.Scatter(x=dim_range, y=c_curve, mode='lines', name='Custo', line=dict(color='#0d6efd')))
-        fig_2d.add_trace(go.Scatter(x=[opt_dim], y=[min_cost], mode='markers', name='Mínimo', marker=dict(color='red', size=10)))
-        fig_2d.update_layout(height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_2d, use_container_width=True)
+        fig_2d = build_cost_curve_figure(geo_type, num_sides, vol, c_base, c_lat, opt_dim, min_cost, k_area, light)
+        ui_helper.show_figure(fig_2d, "otimização.curva")
+
+    # 4. Ajuste ao Catálogo
+    render_catalog(geo_type, num_sides, vol, c_base, c_lat, opt_dim, opt_h, min_cost, dim_name)
 
-    # 4. Área Educacional
+    # 5. Incerteza de Custos
+    render_uncertainty(geo_type, num_sides, vol, c_base, c_lat, min_cost)
+
+    # 6. Área Educacional
     render_education(geo_type, num_sides, k_area, vol, c_lat, c_base)
 
+def render_catalog(geo_type, num_sides, vol, c_base, c_lat, opt_dim, opt_h, min_cost, dim_name):
+    st.markdown("---")
+    st.markdown("#### <i class='bi bi-journal-check icon-gray'></i> Ajuste ao Catálogo de Chapas", unsafe_allow_html=True)
+    if not st.checkbox("Usar diâmetros/lados padronizados e larguras comerciais de chapa", value=False):
+        return
+
+    is_cyl = geo_type == "Cilindro (Padrão)"
+    col_in1, col_in2 = st.columns([1, 2])
+    step_mm = col_in1.select_slider("Passo do Catálogo (mm)", options=[100.0, 10.0, 1.0, 0.1], value=10.0)
+    plate_widths = col_in2.multiselect(
+        "Larguras de Chapa (m)", catalog_logic.STANDARD_PLATE_WIDTHS, default=list(catalog_logic.STANDARD_PLATE_WIDTHS)
+    )
+    if not plate_widths:
+        st.warning("Selecione ao menos uma largura de chapa.")
+        return
+
+    value, dim, height, cost, width, courses, evaluated = cache_helper.catalog_selection(
+        geo_type, num_sides, vol, c_base, c_lat, step_mm, tuple(sorted(plate_widths))
+    )
+    gap = cost - min_cost
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Diâmetro de Catálogo" if is_cyl else "Lado de Catálogo", f"{value:.3f} m",
+              f"{(dim - opt_dim) * (2 if is_cyl else 1):+.3f} m", delta_color="off")
+    c2.metric("Altura do Costado", f"{height:.2f} m", f"{courses} fiadas de {width:.2f} m", delta_color="off")
+    c3.metric("Custo de Catálogo", f"R$ {cost:,.2f}", f"+R$ {gap:,.2f} ({gap / min_cost:.2%})", delta_color="inverse")
+    catalog_size = cache_helper.catalog_index(step_mm).size
+    st.caption(
+        f"Ótimo contínuo: {dim_name} = {opt_dim:.3f} m, h = {opt_h:.2f} m. "
+        f"Busca indexada avaliou {evaluated:,} de {catalog_size:,} dimensões do catálogo "
+        f"({len(plate_widths)} larguras de chapa)."
+    )
+
+def render_uncertainty(geo_type, num_sides, vol, c_base, c_lat, min_cost):
+    st.markdown("---")
+    st.markdown("#### <i class='bi bi-dice-5 icon-gray'></i> Incerteza de Custos (Monte Carlo)", unsafe_allow_html=True)
+    if not st.checkbox("Simular variação de preços do aço e do volume", value=False):
+        return
+
+    col_in1, col_in2, col_in3, col_in4 = st.columns(4)
+    cv_base = col_in1.number_input("Desvio Custo Base (%)", 0.0, 100.0, 15.0, step=1.0) / 100
+    cv_lat = col_in2.number_input("Desvio Custo Lateral (%)", 0.0, 100.0, 15.0, step=1.0) / 100
+    cv_vol = col_in3.number_input("Desvio Volume (%)", 0.0, 100.0, 5.0, step=1.0) / 100
+    n_samples = col_in4.select_slider("Amostras", options=[10_000, 100_000, 1_000_000], value=100_000)
+
+    result = cache_helper.monte_carlo(geo_type, num_sides, vol, c_base, c_lat, cv_base, cv_lat, cv_vol, n_samples)
+
+    col_table, col_hist = st.columns([1, 1])
+    with col_table:
+        labels = {"min_cost": "Custo Mínimo (R$)", "opt_dim": "Dimensão Ótima (m)", "opt_h": "Altura Ótima (m)", "total_mass": "Massa (kg)"}
+        rows = {labels[name]: {f"P{p}": v for p, v in stats["percentiles"].items()} for name, stats in result.items()}
+        st.dataframe(rows, use_container_width=True)
+        st.caption(f"Faixa P5–P95 do custo: R$ {result['min_cost']['percentiles'][5]:,.2f} a R$ {result['min_cost']['percentiles'][95]:,.2f}")
+
+    with col_hist:
+        fig_mc = build_cost_histogram_figure(geo_type, num_sides, vol, c_base, c_lat, cv_base, cv_lat, cv_vol, n_samples, min_cost, ui_helper.light_mode())
+        ui_helper.show_figure(fig_mc, "otimização.monte_carlo")
+
+@cache_helper.cached_figure
+def build_cost_histogram_figure(geo_type, num_sides, vol, c_base, c_lat, cv_base, cv_lat, cv_vol, n_samples, min_cost, light=False):
+    """Distribuição do custo mínimo com as faixas P5–P95 e P25–P75 destacadas."""
+    stats = cache_helper.monte_carlo(geo_type, num_sides, vol, c_base, c_lat, cv_base, cv_lat, cv_vol, n_samples)["min_cost"]
+    # Agrupa os bins finos do acumulador (só os internos) para o gráfico ficar leve
+    group = 32
+    hist = stats["hist"][1:-1].reshape(-1, group).sum(axis=1)
+    edges = stats["edges"][::group]
+    pct = stats["percentiles"]
+
+    fig = go.Figure()
+    fig.add_vrect(x0=pct[5], x1=pct[95], fillcolor='#0d6efd', opacity=0.08, line_width=0)
+    fig.add_vrect(x0=pct[25], x1=pct[75], fillcolor='#0d6efd', opacity=0.15, line_width=0)
+    centers = (edges[:-1] + edges[1:]) / 2
+    if light:
+        centers, hist = chart_helper.compact(centers), hist.astype(np.int32)
+    fig.add_trace(chart_helper.line_trace(light, x=centers, y=hist, mode='lines', name='Frequência', line=dict(color='#0d6efd')))
+    fig.add_vline(x=min_cost, line=dict(color='red', dash='dash'))
+    fig.update_layout(
+        xaxis_title="Custo Mínimo (R$)", yaxis_title="Amostras", height=300, showlegend=False,
+        margin=dict(t=10, b=0, l=0, r=0), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@cache_helper.cached_figure
+def build_3d_figure(geo_type, num_sides, opt_dim, opt_h, light=False):
+    """
+    Monta o modelo 3D do tanque (superfície lateral + contornos da base e do topo).
+    No modo leve: menos segmentos no cilindro, float32 e os dois contornos num único traço.
+    """
+    z = np.linspace(0, opt_h, 2)
+    if geo_type.startswith("Cil"):
+        theta = np.linspace(0, 2*np.pi, 33 if light else 60)
+        radius_viz = opt_dim
+    else:
+        theta = np.linspace(0, 2*np.pi, num_sides + 1)
+        radius_viz = opt_dim / (2 * np.sin(np.pi / num_sides))
+
+    theta_grid, z_grid = np.meshgrid(theta, z)
+    x_grid = radius_viz * np.cos(theta_grid)
+    y_grid = radius_viz * np.sin(theta_grid)
+
+    if light:
+        x_grid, y_grid, z_grid = (chart_helper.compact(a) for a in (x_grid, y_grid, z_grid))
+
+    fig_3d = go.Figure(data=[go.Surface(z=z_grid, x=x_grid, y=y_grid, colorscale='Blues', showscale=False, opacity=0.8)])
+    if light:
+        # Base e topo no mesmo traço, separados por NaN (um traço a menos no payload)
+        gap = np.array([np.nan], dtype=np.float32)
+        rings = [np.concatenate([a[0], gap, a[1]]) for a in (x_grid, y_grid, z_grid)]
+        fig_3d.add_trace(go.Scatter3d(x=rings[0], y=rings[1], z=rings[2], mode='lines', line=dict(color='black', width=2), name='Contornos'))
+    else:
+        fig_3d.add_trace(go.Scatter3d(x=x_grid[0], y=y_grid[0], z=z_grid[0], mode='lines', line=dict(color='black', width=2), name='Base'))
+        fig_3d.add_trace(go.Scatter3d(x=x_grid[1], y=y_grid[1], z=z_grid[1], mode='lines', line=dict(color='black', width=2), name='Topo'))
+    fig_3d.update_layout(
+        scene=dict(xaxis_title='X (m)', yaxis_title='Y (m)', zaxis_title='Altura (m)', aspectmode='data'),
+        margin=dict(l=0, r=0, b=0, t=0), height=400,
+        uirevision='tanque',  # mantém a câmera do usuário quando só os parâmetros mudam
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_3d
+
+@cache_helper.cached_figure
+def build_cost_curve_figure(geo_type, num_sides, vol, c_base, c_lat, opt_dim, min_cost, k_area, light=False):
+    """Monta a curva de custo em função da dimensão, marcando o ponto ótimo."""
+    if light:
+        # Resolução adaptativa: pontos só onde a curva dobra
+        cost = lambda d: optimization_logic.cost_at_dimension(d, vol, c_base, c_lat, geo_type, num_sides, k_area)
+        dim_range, c_curve = chart_helper.adaptive_samples(cost, opt_dim * 0.5, opt_dim * 1.5)
+        dim_range, c_curve = chart_helper.compact(dim_range), chart_helper.compact(c_curve)
+    else:
+        # Chama Controller para dados do gráfico
+        dim_range, c_curve = cache_helper.cost_curve_data(opt_dim, vol, c_base, c_lat, geo_type, num_sides, k_area)
+
+    fig_2d = go.Figure()
+    fig_2d.add_trace(chart_helper.line_trace(light, x=dim_range, y=c_curve, mode='lines', name='Custo', line=dict(color='#0d6efd')))
+    fig_2d.add_trace(chart_helper.line_trace(light, x=[opt_dim], y=[min_cost], mode='markers', name='Mínimo', marker=dict(color='red', size=10)))
+    fig_2d.update_layout(height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+    return fig_2d
+
 def render_education(geo_type, num_sides, k_area, vol, c_lat, c_base):
     st.markdown("---")
     st.markdown("#### <i class='bi bi-journal-text icon-gray'></i> A Otimização", unsafe_allow_html=True)
@@ -1,6 +1,6 @@
 import streamlit as st
 import plotly.graph_objects as go
-from src.controllers import physics_logic
+from src.utils import cache_helper, chart_helper, ui_helper
 
 def render(geo_type, num_sides, vol, c_base, c_lat):
     st.markdown("<h3 class='sub-header'><i class='bi bi-hdd-stack icon-blue'></i> Propriedades Físicas e Massa</h3>", unsafe_allow_html=True)
@@ -15,7 +15,7 @@ def render(geo_type, num_sides, vol, c_base, c_lat):
 
     # 2. Chama o Controller (Lógica)
     # Note que passamos os inputs globais (vol, c_base...) e os locais (rho_base...)
-    total_mass, z_cm, opt_h, rho_b, B = physics_logic.calculate_mass_properties(
+    total_mass, z_cm, opt_h, rho_b, B = cache_helper.mass_properties(
         geo_type, num_sides, vol, c_base, c_lat, rho_base, rho_top
     )
 
@@ -31,22 +31,33 @@ def render(geo_type, num_sides, vol, c_base, c_lat):
 
     # 4. Gráfico de Densidade
     with col_graph:
-        # Pede os dados XY para o controller
-        z_vals, rho_vals = physics_logic.generate_density_profile(opt_h, rho_b, B)
-        
-        fig_rho = go.Figure()
-        fig_rho.add_trace(go.Scatter(x=rho_vals, y=z_vals, mode='lines', fill='tozeroy', name='Densidade', line=dict(color='#198754')))
-        fig_rho.update_layout(
-            title="Variação da Densidade com a Altura",
-            xaxis_title="Densidade (kg/m³)", yaxis_title="Altura (m)",
-            height=300, margin=dict(t=30, b=0, l=0, r=0),
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_rho, use_container_width=True)
+        fig_rho = build_density_figure(opt_h, rho_b, B, ui_helper.light_mode())
+        ui_helper.show_figure(fig_rho, "massa.densidade")
 
     # 5. Área Educacional
     render_education(total_mass, z_cm, opt_h, rho_b, B)
 
+@cache_helper.cached_figure
+def build_density_figure(opt_h, rho_b, B, light=False):
+    """Monta o gráfico do perfil de densidade ao longo da altura."""
+    if light:
+        # Perfil linear: a amostragem adaptativa para nos poucos pontos necessários
+        z_vals, rho_vals = chart_helper.adaptive_samples(lambda z: rho_b - B * z, 0, opt_h)
+        z_vals, rho_vals = chart_helper.compact(z_vals), chart_helper.compact(rho_vals)
+    else:
+        # Pede os dados XY para o controller
+        z_vals, rho_vals = cache_helper.density_profile(opt_h, rho_b, B)
+
+    fig_rho = go.Figure()
+    fig_rho.add_trace(chart_helper.line_trace(light, x=rho_vals, y=z_vals, mode='lines', fill='tozeroy', name='Densidade', line=dict(color='#198754')))
+    fig_rho.update_layout(
+        title="Variação da Densidade com a Altura",
+        xaxis_title="Densidade (kg/m³)", yaxis_title="Altura (m)",
+        height=300, margin=dict(t=30, b=0, l=0, r=0),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_rho
+
 def render_education(mass, z_cm, h, rho, B):
     st.markdown("---")
     st.markdown("#### <i class='bi bi-journal-text icon-gray'></i>A Física por Trás da Integral", unsafe_allow_html=True)
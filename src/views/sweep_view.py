@@ -0,0 +1,82 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from src.utils import cache_helper, chart_helper, ui_helper
+
+# A razão de custo vive num grid fixo (passo RATIO_STEP) dividido em blocos de
+# TILE_ROWS linhas. Como os blocos são alinhados a esse grid global, estender ou
+# encolher a faixa reaproveita os blocos já calculados.
+RATIO_STEP = 0.05
+TILE_ROWS = 20
+
+def render(vol, c_base, c_lat):
+    st.markdown("<h3 class='sub-header'><i class='bi bi-grid-3x3 icon-blue'></i> Varredura de Parâmetros</h3>", unsafe_allow_html=True)
+    st.markdown("Custo mínimo e proporção do tanque ótimo para cada combinação de **razão de custos** e **número de lados**, no volume alvo.")
+
+    # 1. Inputs Específicos desta View
+    col_param1, col_param2 = st.columns(2)
+    with col_param1:
+        ratio_lo, ratio_hi = st.slider("Razão C_base / C_lat", 0.1, 5.0, (0.5, 3.0), step=RATIO_STEP)
+    with col_param2:
+        sides_lo, sides_hi = st.slider("Faixa de Lados (n)", 3, 12, (3, 12))
+        include_cyl = st.checkbox("Incluir Cilindro", value=True)
+
+    sides = tuple(range(sides_lo, sides_hi + 1)) + ((0,) if include_cyl else ())
+    i_lo, i_hi = int(round(ratio_lo / RATIO_STEP)), int(round(ratio_hi / RATIO_STEP))
+
+    # 2. Grid (montado a partir dos blocos memoizados)
+    ratios, cost, hw_ratio = sweep_grid(i_lo, i_hi, sides, vol, c_lat)
+
+    # 3. Métricas: onde está o projeto mais barato
+    best_row, best_col = np.unravel_index(np.argmin(cost), cost.shape)
+    current_ratio = c_base / c_lat
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Geometria mais Barata", _side_label(sides[best_col]))
+    c2.metric("Na Razão de Custos", f"{ratios[best_row]:.2f}")
+    c3.metric("Custo Mínimo da Varredura", f"R$ {cost[best_row, best_col]:,.2f}")
+    st.caption(f"Razão atual da barra lateral: {current_ratio:.2f}. Grid de {cost.size:,} projetos.")
+
+    # 4. Heatmaps
+    col_cost, col_hw = st.columns(2)
+    with col_cost:
+        st.markdown("#### <i class='bi bi-cash-coin icon-gray'></i> Custo Mínimo (R$)", unsafe_allow_html=True)
+        ui_helper.show_figure(build_heatmap_figure("cost", i_lo, i_hi, sides, vol, c_lat, ui_helper.light_mode()), "varredura.custo")
+    with col_hw:
+        st.markdown("#### <i class='bi bi-arrows-vertical icon-gray'></i> Altura / Largura", unsafe_allow_html=True)
+        ui_helper.show_figure(build_heatmap_figure("hw", i_lo, i_hi, sides, vol, c_lat, ui_helper.light_mode()), "varredura.altura_largura")
+
+def sweep_grid(i_lo, i_hi, sides, vol, c_lat):
+    """Junta os blocos alinhados que cobrem as linhas i_lo..i_hi do grid de razões."""
+    ratios, costs, hws = [], [], []
+    for block in range(i_lo // TILE_ROWS, i_hi // TILE_ROWS + 1):
+        # Índice 0 seria razão zero (base gratuita): começa no primeiro passo
+        idx = np.arange(max(block * TILE_ROWS, 1), (block + 1) * TILE_ROWS)
+        block_ratios = tuple(np.round(idx * RATIO_STEP, 6))
+        cost, hw_ratio = cache_helper.sweep_tile(block_ratios, vol, sides, c_lat)
+        keep = (idx >= i_lo) & (idx <= i_hi)
+        ratios.append(np.asarray(block_ratios)[keep])
+        costs.append(cost[keep])
+        hws.append(hw_ratio[keep])
+    return np.concatenate(ratios), np.concatenate(costs), np.concatenate(hws)
+
+@cache_helper.cached_figure
+def build_heatmap_figure(metric, i_lo, i_hi, sides, vol, c_lat, light=False):
+    """Monta o heatmap de custo ("cost") ou de altura/largura ("hw")."""
+    ratios, cost, hw_ratio = sweep_grid(i_lo, i_hi, sides, vol, c_lat)
+    z, colorscale = (cost, 'Blues') if metric == "cost" else (hw_ratio, 'Oranges')
+    if light:
+        z, ratios = chart_helper.compact(z), chart_helper.compact(ratios)
+
+    fig = go.Figure(data=go.Heatmap(
+        z=z, x=[_side_label(n) for n in sides], y=ratios,
+        colorscale=colorscale, colorbar=dict(thickness=12)
+    ))
+    fig.update_layout(
+        xaxis_title="Geometria", yaxis_title="C_base / C_lat", height=420,
+        margin=dict(t=10, b=0, l=0, r=0),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def _side_label(n):
+    return "Cilindro" if n == 0 else f"n = {n}"
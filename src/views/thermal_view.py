@@ -2,8 +2,9 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 from src.controllers import thermal_logic
+from src.utils import cache_helper, chart_helper, sensor_sources, ui_helper
 
-def render():
+def render(geo_type, num_sides, vol, c_base, c_lat):
     st.markdown("<h3 class='sub-header'><i class='bi bi-thermometer-high icon-blue'></i> Termodinâmica e EDO</h3>", unsafe_allow_html=True)
     st.markdown("Previsão de temperatura baseada na **Lei de Resfriamento de Newton**.")
 
@@ -12,34 +13,30 @@ def render():
     with col_param1:
         t_amb = st.number_input("Temp. Ambiente (°C)", value=35.0, step=1.0)
         t_critical = st.number_input("Temp. Crítica (°C)", value=25.0, step=1.0)
-    with col_param2:
-        t_initial = st.number_input("Temp. Inicial (°C)", value=5.0, step=1.0)
-        time_span = st.slider("Simulação (horas)", 1, 48, 24)
     with col_param3:
         k_const = st.number_input("Condutividade (k)", value=0.15, step=0.01)
+        daily_cycle = st.checkbox("Ciclo Diário do Ambiente", value=False)
+        amplitude = st.number_input("Amplitude Diária (°C)", value=8.0, step=1.0) if daily_cycle else 0.0
+    with col_param2:
+        t_initial = st.number_input("Temp. Inicial (°C)", value=5.0, step=1.0)
+        if daily_cycle:
+            # Com ambiente variável a EDO é integrada numericamente: horizontes de semanas
+            time_span = 24 * st.slider("Simulação (dias)", 1, 21, 7)
+        else:
+            time_span = st.slider("Simulação (horas)", 1, 48, 24)
 
     st.markdown("---")
 
     # 2. Chama o Controller
-    t_values, temp_values, time_to_fail = thermal_logic.simulate_cooling(
-        t_amb, t_initial, t_critical, time_span, k_const
-    )
+    t_values, temp_values, time_to_fail, _ = simulate(t_amb, amplitude, t_initial, t_critical, time_span, k_const)
 
     # 3. Visualização
     col_viz, col_alert = st.columns([2, 1])
 
     with col_viz:
         st.markdown("#### <i class='bi bi-graph-up-arrow icon-gray'></i> Curva de Aquecimento", unsafe_allow_html=True)
-        fig_temp = go.Figure()
-        fig_temp.add_trace(go.Scatter(x=t_values, y=temp_values, mode='lines', name='Temperatura', line=dict(color='#fd7e14', width=3)))
-        fig_temp.add_trace(go.Scatter(x=[0, time_span], y=[t_critical, t_critical], mode='lines', name='Limite Crítico', line=dict(color='red', dash='dash')))
-        fig_temp.update_layout(
-            xaxis_title="Tempo (h)", yaxis_title="Temp (°C)", height=350,
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            hovermode="x unified", margin=dict(t=10, b=0, l=0, r=0),
-            legend=dict(orientation="h", y=1.1)
-        )
-        st.plotly_chart(fig_temp, use_container_width=True)
+        fig_temp = build_temperature_figure(t_amb, amplitude, t_initial, t_critical, time_span, k_const, ui_helper.light_mode())
+        ui_helper.show_figure(fig_temp, "térmica.temperatura")
 
     with col_alert:
         st.markdown("#### <i class='bi bi-shield-check icon-gray'></i> Status", unsafe_allow_html=True)
@@ -51,11 +48,165 @@ def render():
             st.metric("Margem", "Estável", delta="OK")
         
         st.markdown("---")
-        st.code(f"k = {k_const}\nT_amb = {t_amb}°C", language="text")
+        ambient_text = f"{t_amb} ± {amplitude}°C" if amplitude else f"{t_amb}°C"
+        st.code(f"k = {k_const}\nT_amb = {ambient_text}", language="text")
+
+    # 4. Perfil por altura (modelo 1-D com estratificação)
+    render_profile(geo_type, num_sides, vol, c_base, c_lat, t_amb, amplitude, t_initial, t_critical, time_span, k_const, time_to_fail)
 
-    # 4. Educação
+    # 5. Frota monitorada por sensores
+    render_fleet(t_critical)
+
+    # 6. Educação
     render_education(t_amb, t_initial, k_const)
 
+def render_profile(geo_type, num_sides, vol, c_base, c_lat, t_amb, amplitude, t_initial, t_critical, time_span, k_const, lumped_fail):
+    st.markdown("---")
+    st.markdown("#### <i class='bi bi-layers icon-gray'></i> Perfil por Altura (Estratificação)", unsafe_allow_html=True)
+    if not st.checkbox("Resolver a temperatura camada por camada", value=False):
+        return
+
+    _, opt_h, _, _, _ = cache_helper.optimal_geometry(geo_type, num_sides, vol, c_base, c_lat)
+    col_alpha, col_top, col_nz = st.columns(3)
+    alpha = col_alpha.number_input("Mistura Vertical α (m²/h)", 0.0001, 10.0, 0.05, step=0.01, format="%.4f")
+    h_top = col_top.number_input("Troca pela Tampa (m/h)", 0.0, 5.0, 0.05, step=0.01)
+    n_z = col_nz.select_slider("Camadas", [10, 25, 50, 100, 200], value=50)
+
+    t_values, temp_values, z, time_to_fail, z_fail = cache_helper.heat_profile(
+        t_amb, amplitude, t_initial, t_critical, time_span, k_const, opt_h, alpha, h_top, n_z
+    )
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Altura do Tanque", f"{opt_h:.2f} m")
+    if time_to_fail is None:
+        c2.metric("Primeira Camada Crítica", "Nenhuma", delta="OK")
+    else:
+        delta = f"{time_to_fail - lumped_fail:+.1f} h vs. modelo concentrado" if lumped_fail is not None else None
+        c2.metric("Primeira Camada Crítica", f"{time_to_fail:.1f} horas", delta=delta, delta_color="normal")
+        c3.metric("Na Altura", f"{z_fail:.2f} m")
+
+    fig = build_profile_figure(t_amb, amplitude, t_initial, t_critical, time_span, k_const, opt_h, alpha, h_top, n_z,
+                               ui_helper.light_mode())
+    ui_helper.show_figure(fig, "térmica.perfil")
+    st.caption(f"Diferenças finitas implícitas em {n_z} nós de z = 0 (base) a z = {opt_h:.2f} m (topo), o mesmo eixo do "
+               "perfil de densidade. A tampa troca calor com o ar; o costado usa o mesmo k do modelo concentrado.")
+
+@cache_helper.cached_figure
+def build_profile_figure(t_amb, amplitude, t_initial, t_critical, time_span, k_const, h, alpha, h_top, n_z, light=False):
+    """Mapa de calor tempo x altura, com a isoterma do limite crítico. No modo leve: float32."""
+    t_values, temp_values, z, _, _ = cache_helper.heat_profile(
+        t_amb, amplitude, t_initial, t_critical, time_span, k_const, h, alpha, h_top, n_z
+    )
+    temp_grid = temp_values.T
+    if light:
+        t_values, z, temp_grid = (chart_helper.compact(a) for a in (t_values, z, temp_grid))
+
+    fig = go.Figure(go.Heatmap(x=t_values, y=z, z=temp_grid, colorscale='RdYlBu_r', colorbar=dict(title="°C", thickness=12)))
+    fig.add_trace(go.Contour(
+        x=t_values, y=z, z=temp_grid, contours=dict(start=t_critical, end=t_critical, coloring='none', showlabels=True),
+        line=dict(color='black', width=2, dash='dash'), showscale=False, name='Limite Crítico', hoverinfo='skip'
+    ))
+    fig.update_layout(
+        xaxis_title="Tempo (h)", yaxis_title="Altura z (m)", height=350,
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', margin=dict(t=10, b=0, l=0, r=0)
+    )
+    return fig
+
+def render_fleet(t_critical):
+    st.markdown("---")
+    st.markdown("#### <i class='bi bi-broadcast icon-gray'></i> Frota ao Vivo (Sensores)", unsafe_allow_html=True)
+    if not st.checkbox("Acompanhar as leituras dos sensores da frota", value=False):
+        return
+
+    # A fonte é configuração do servidor (TANK_SENSOR_SOURCE), não entrada do usuário
+    try:
+        feed = sensor_sources.default_feed()
+    except (OSError, ValueError) as exc:
+        st.error(f"Não foi possível abrir a fonte de sensores: {exc}")
+        return
+    if feed is None:
+        st.info("Nenhuma fonte de sensores configurada no servidor. Defina TANK_SENSOR_SOURCE "
+                "(ex.: arquivo:leituras.csv ou socket:127.0.0.1:9009) antes de subir o app.")
+        return
+
+    col_source, col_top = st.columns([3, 1])
+    kind, address = sensor_sources.configured_source()
+    col_source.caption(f"Fonte: {kind} · {address}")
+    top = int(col_top.number_input("Tanques na Tabela", 5, 500, 20, step=5))
+    render_fleet_risk(feed, t_critical, top)
+
+@st.fragment(run_every=2.0)
+def render_fleet_risk(feed, t_critical, top):
+    """Tabela de risco da frota, atualizada a cada 2 s sem rodar a página inteira."""
+    table, summary = feed.snapshot(t_critical, top)
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Tanques Monitorados", f"{summary['monitorados']:,}")
+    c2.metric("Já Críticos", f"{summary['criticos']:,}")
+    c3.metric("Críticos em até 6 h", f"{summary['criticos_6h']:,}")
+    c4.metric("Leituras Processadas", f"{summary['leituras']:,}")
+
+    if not summary["monitorados"]:
+        st.info("Aguardando leituras (formato: id_tanque,t_horas,temperatura_c). Ex.: python sensor_sim.py --file leituras.csv")
+        return
+    st.dataframe(
+        table, hide_index=True, use_container_width=True,
+        column_config={
+            "tanque": st.column_config.NumberColumn("Tanque", format="%d"),
+            "T_atual": st.column_config.NumberColumn("T Atual (°C)", format="%.2f"),
+            "k": st.column_config.NumberColumn("k Estimado", format="%.4f"),
+            "T_amb": st.column_config.NumberColumn("T_amb Estimada (°C)", format="%.2f"),
+            "horas_ate_critico": st.column_config.NumberColumn("Horas até Crítico", format="%.2f"),
+            "ultima_leitura": st.column_config.NumberColumn("Última Leitura (h)", format="%.2f"),
+            "leituras": st.column_config.NumberColumn("Leituras", format="%d"),
+        }
+    )
+    st.caption(f"k e T_amb estimados online (mínimos quadrados recursivos) a cada leitura; tempo até {t_critical}°C "
+               "pelo mesmo modelo da curva acima. Vazio = não cruza o limite.")
+
+def simulate(t_amb, amplitude, t_initial, t_critical, time_span, k_const):
+    """
+    Escolhe o caminho do controller: solução analítica para ambiente constante,
+    EDO numérica quando há ciclo diário (amplitude > 0).
+    Retorna: (t_valores, T_valores, tempo_ate_falha, T_amb_valores ou None)
+    """
+    if amplitude:
+        return cache_helper.cooling_daily_cycle(t_amb, amplitude, t_initial, t_critical, time_span, k_const)
+    t_values, temp_values, time_to_fail = cache_helper.cooling(t_amb, t_initial, t_critical, time_span, k_const)
+    return t_values, temp_values, time_to_fail, None
+
+@cache_helper.cached_figure
+def build_temperature_figure(t_amb, amplitude, t_initial, t_critical, time_span, k_const, light=False):
+    """
+    Monta a curva de temperatura com a linha do limite crítico.
+    No modo leve a curva analítica é amostrada de forma adaptativa e as séries
+    longas da EDO são decimadas (mínimo/máximo por bloco, preservando picos).
+    """
+    t_values, temp_values, _, ambient_values = simulate(t_amb, amplitude, t_initial, t_critical, time_span, k_const)
+    t_ambient = t_values
+
+    if light:
+        if ambient_values is None:
+            curve = lambda t: thermal_logic.cooling_temperature(t, t_amb, t_initial, k_const)
+            t_values, temp_values = chart_helper.adaptive_samples(curve, 0, time_span)
+        else:
+            t_ambient, ambient_values = chart_helper.decimate_minmax(t_values, ambient_values)
+            t_values, temp_values = chart_helper.decimate_minmax(t_values, temp_values)
+            t_ambient, ambient_values = chart_helper.compact(t_ambient), chart_helper.compact(ambient_values)
+        t_values, temp_values = chart_helper.compact(t_values), chart_helper.compact(temp_values)
+
+    fig_temp = go.Figure()
+    if ambient_values is not None:
+        fig_temp.add_trace(chart_helper.line_trace(light, x=t_ambient, y=ambient_values, mode='lines', name='Ambiente', line=dict(color='#adb5bd', width=1)))
+    fig_temp.add_trace(chart_helper.line_trace(light, x=t_values, y=temp_values, mode='lines', name='Temperatura', line=dict(color='#fd7e14', width=3)))
+    fig_temp.add_trace(chart_helper.line_trace(light, x=[0, time_span], y=[t_critical, t_critical], mode='lines', name='Limite Crítico', line=dict(color='red', dash='dash')))
+    fig_temp.update_layout(
+        xaxis_title="Tempo (h)", yaxis_title="Temp (°C)", height=350,
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        hovermode="x unified", margin=dict(t=10, b=0, l=0, r=0),
+        legend=dict(orientation="h", y=1.1)
+    )
+    return fig_temp
+
 def render_education(t_amb, t_ini, k):
     st.markdown("---")
     st.markdown("#### <i class='bi bi-journal-text icon-gray'></i> Termodinâmica e EDOs", unsafe_allow_html=True)
@@ -90,6 +241,9 @@ def render_education(t_amb, t_ini, k):
             st.latex(r"T(t) = T_{amb} + (T_{inicial} - T_{amb}) \cdot e^{-kt}")
             st.success("Esta é a fórmula que prevê o futuro da temperatura")
 
+            st.write("4. Fazendo $T(t) = T_{crit}$ e isolando $t$, obtemos o instante exato da falha:")
+            st.latex(r"t_{falha} = -\frac{1}{k} \ln\left(\frac{T_{crit} - T_{amb}}{T_{inicial} - T_{amb}}\right)")
+
 #         with tab_code:
 #             st.markdown("##### Tradução para Código")
 #             st.write("Em vez de um loop `for` (método de Euler), usamos a **solução exata** vetorizada do NumPy, que é mais precisa e rápida.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os testes importam os módulos do projeto (src, cli, server, ...) a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
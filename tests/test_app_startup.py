@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Roda o app num processo limpo e lista as views que acabaram importadas
+_PROBE = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=60)
+if {tab!r}:
+    at.query_params["aba"] = {tab!r}
+at.run()
+print(json.dumps({{"erros": [str(e.value) for e in at.exception],
+                   "views": sorted(m for m in sys.modules if m.startswith("src.views."))}}))
+"""
+
+
+def _loaded_views(tab):
+    done = subprocess.run([sys.executable, "-c", _PROBE.format(tab=tab)], cwd=ROOT,
+                          capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0, done.stderr
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("tab, view", [
+    ("", "optimization_view"),
+    ("Massa & Volume", "physics_view"),
+    ("Simulação Térmica", "thermal_view"),
+])
+def test_only_the_selected_view_is_imported(tab, view):
+    probe = _loaded_views(tab)
+    assert probe["erros"] == []
+    assert probe["views"] == [f"src.views.{view}"]
@@ -0,0 +1,32 @@
+import json
+from unittest import mock
+
+from benchmarks import __main__ as suite
+from benchmarks._timing import best_of
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": [{"name": "a", "seconds": 1.0}, {"name": "b", "seconds": 1.0},
+                            {"name": "ruido", "seconds": 1e-6}]}
+    results = [{"name": "a", "seconds": 1.5}, {"name": "b", "seconds": 1.1}, {"name": "ruido", "seconds": 3e-6},
+               {"name": "novo", "seconds": 2.0}]
+    lines, regressions = suite.compare(results, baseline, tolerance=0.25)
+    assert regressions == ["a"]  # b está dentro da tolerância; "ruido" está abaixo do piso de ruído
+    assert any("novo" in line and line.endswith("novo") for line in lines)
+
+
+def test_missing_baseline_fails_before_measuring(tmp_path, capsys):
+    assert suite.main(["--only", "startup", "--baseline", str(tmp_path / "nada.json")]) == 2
+    assert "sem linha de base" in capsys.readouterr().err
+
+
+def test_baseline_from_the_other_mode_is_rejected(tmp_path):
+    path = tmp_path / "base.json"
+    path.write_text(json.dumps({"quick": True, "results": []}))
+    assert suite.main(["--only", "startup", "--baseline", str(path)]) == 2
+
+
+def test_best_of_keeps_the_fastest_round():
+    clock = iter([0.0, 3.0, 10.0, 11.0, 20.0, 22.0])  # rodadas de 3, 1 e 2 s
+    with mock.patch("benchmarks._timing.time.perf_counter", lambda: next(clock)):
+        assert best_of(lambda: None, repeat=3) == 1.0
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import streamlit as st
+
+from src.controllers import optimization_logic, physics_logic, thermal_logic
+from src.utils import cache_helper
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    from streamlit import logger
+
+    logger.set_log_level("error")  # fora do servidor o Streamlit avisa "No runtime found" a cada chamada
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def test_cached_result_runs_once_and_returns_copies():
+    calls = []
+
+    @cache_helper.cached_result
+    def solve(x):
+        calls.append(x)
+        return np.array([x, 2 * x])
+
+    first = solve(3.0)
+    first[:] = -1  # quem recebe pode modificar sem estragar o cache
+    np.testing.assert_array_equal(solve(3.0), [3.0, 6.0])
+    solve(4.0)
+    assert calls == [3.0, 4.0]
+
+
+def test_cached_figure_is_shared():
+    import plotly.graph_objects as go
+
+    calls = []
+
+    @cache_helper.cached_figure
+    def build(n):
+        calls.append(n)
+        return go.Figure(go.Scatter(y=list(range(n))))
+
+    assert build(5) is build(5)
+    assert calls == [5]
+
+
+@pytest.mark.parametrize("geo_type, num_sides", [("Cilindro (Padrão)", 0), ("Prisma Regular (Polígono)", 6)])
+def test_memoized_controllers_match_direct_calls(geo_type, num_sides):
+    args = (geo_type, num_sides, 750.0, 25.0, 10.0)
+    for _ in range(2):  # a segunda chamada vem do cache
+        assert cache_helper.optimal_geometry(*args) == optimization_logic.calculate_optimal_geometry(*args)
+        assert cache_helper.mass_properties(*args, 8000.0, 7500.0) == \
+            physics_logic.calculate_mass_properties(*args, 8000.0, 7500.0)
+        for cached, direct in zip(cache_helper.cooling(30.0, 5.0, 25.0, 48.0, 0.1),
+                                  thermal_logic.simulate_cooling(30.0, 5.0, 25.0, 48.0, 0.1)):
+            np.testing.assert_array_equal(cached, direct)
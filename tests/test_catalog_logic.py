@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.controllers import catalog_logic
+
+CYLINDER = "Cilindro (Padrão)"
+PRISM = "Prisma Regular (Polígono)"
+
+
+def _brute_force(geo_type, num_sides, vol, c_base, c_lat, catalog, widths):
+    """Avalia o catálogo inteiro contra todas as larguras."""
+    is_cyl = geo_type == CYLINDER
+    k_area = np.pi if is_cyl else num_sides / (4 * np.tan(np.pi / num_sides))
+    x = catalog * (0.5 if is_cyl else 1.0)
+    cost, _ = catalog_logic._catalog_costs(x, vol, c_base, c_lat, k_area, 2 * np.pi if is_cyl else num_sides,
+                                           np.asarray(widths, dtype=float))
+    return cost.min()
+
+
+@pytest.mark.parametrize("geo_type, num_sides", [(CYLINDER, 0), (PRISM, 3), (PRISM, 6)])
+@pytest.mark.parametrize("vol, c_base, c_lat", [(1000, 20, 10), (50, 100, 1), (20_000, 1, 80), (5, 10, 10)])
+def test_indexed_search_matches_brute_force(geo_type, num_sides, vol, c_base, c_lat):
+    catalog = catalog_logic.standard_catalog(50)
+    widths = catalog_logic.STANDARD_PLATE_WIDTHS
+    value, dim, height, cost, width, courses, evaluated = catalog_logic.select_from_catalog(
+        geo_type, num_sides, vol, c_base, c_lat, catalog, widths, block=8
+    )
+    assert cost == pytest.approx(_brute_force(geo_type, num_sides, vol, c_base, c_lat, catalog, widths), rel=1e-12)
+    assert evaluated < catalog.size
+    # A escolha atende o volume com um número inteiro de fiadas
+    assert height == pytest.approx(courses * width)
+    k_area = np.pi if geo_type == CYLINDER else num_sides / (4 * np.tan(np.pi / num_sides))
+    assert k_area * dim**2 * height >= vol * (1 - 1e-12)
+    assert value in catalog
+
+
+def test_catalog_index_and_empty_catalog():
+    index = catalog_logic.build_catalog_index([3.0, -1.0, np.nan, 1.5, 3.0, 0.0])
+    assert index.tolist() == [1.5, 3.0]
+    catalog = catalog_logic.standard_catalog(100, lo=1.0, hi=2.0)
+    np.testing.assert_allclose(catalog, np.linspace(1.0, 2.0, 11))
+    with pytest.raises(ValueError):
+        catalog_logic.select_from_catalog(CYLINDER, 0, 1000, 20, 10, index, plate_widths=())
@@ -0,0 +1,53 @@
+from unittest import mock
+
+import numpy as np
+import plotly.graph_objects as go
+
+from src.utils import chart_helper, ui_helper
+
+
+def test_adaptive_samples_stay_on_the_curve_and_refine_bends():
+    func = lambda x: np.exp(-x) * np.sin(4 * x)
+    x, y = chart_helper.adaptive_samples(func, 0.0, 5.0, tol=1e-3)
+    assert x[0] == 0.0 and x[-1] == 5.0 and np.all(np.diff(x) > 0)
+    np.testing.assert_array_equal(y, func(x))
+    assert len(x) <= chart_helper.LIGHT_MAX_POINTS
+    # Interpolação linear entre as amostras fica perto da curva densa
+    dense = np.linspace(0, 5, 20_001)
+    assert np.max(np.abs(np.interp(dense, x, y) - func(dense))) < 0.01 * np.ptp(func(dense))
+
+    line_x, _ = chart_helper.adaptive_samples(lambda x: 2 * x + 1, 0.0, 1.0)
+    assert len(line_x) == 5  # reta não é refinada
+
+
+def test_decimate_minmax_keeps_extremes():
+    rng = np.random.default_rng(0)
+    x = np.arange(100_000, dtype=float)
+    y = np.cumsum(rng.normal(size=x.size))
+    y[12_345], y[67_890] = 1e3, -1e3
+    dx, dy = chart_helper.decimate_minmax(x, y, max_points=200)
+    assert len(dx) <= 202 and np.all(np.diff(dx) > 0)
+    assert dy.max() == 1e3 and dy.min() == -1e3
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    np.testing.assert_array_equal(dy, y[dx.astype(int)])
+
+    short_x, short_y = chart_helper.decimate_minmax(x[:50], y[:50])
+    assert len(short_x) == 50
+
+
+def test_light_mode_traces_and_payload():
+    y = np.linspace(0, 1, 5_000)
+    normal = go.Figure(chart_helper.line_trace(False, x=y, y=y))
+    light = go.Figure(chart_helper.line_trace(True, x=chart_helper.compact(y), y=chart_helper.compact(y)))
+    assert isinstance(light.data[0], go.Scattergl) and isinstance(normal.data[0], go.Scatter)
+    assert chart_helper.figure_bytes(light) < chart_helper.figure_bytes(normal)
+
+
+def test_payload_size_is_measured_once_per_figure():
+    fig, other = go.Figure(go.Scatter(y=[1, 2, 3])), go.Figure(go.Scatter(y=[4, 5]))
+    with mock.patch.object(chart_helper, "figure_bytes", wraps=chart_helper.figure_bytes) as measure:
+        first = ui_helper.figure_payload_bytes(fig, "teste.grafico")
+        assert ui_helper.figure_payload_bytes(fig, "teste.grafico") == first
+        assert measure.call_count == 1
+        ui_helper.figure_payload_bytes(other, "teste.grafico")
+        assert measure.call_count == 2
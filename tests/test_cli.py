@@ -0,0 +1,63 @@
+import io
+
+import numpy as np
+import pytest
+
+import cli
+from src.controllers.physics_logic import calculate_mass_properties
+from src.controllers.optimization_logic import calculate_optimal_geometry
+
+
+def _chunk(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "vol": rng.uniform(10, 5000, n),
+        "c_base": rng.uniform(5, 50, n),
+        "c_lat": rng.uniform(5, 50, n),
+        "num_sides": rng.choice([0, 3, 4, 8], n).astype(float),
+    }
+
+
+def test_process_chunk_matches_scalar():
+    chunk = _chunk()
+    result = cli.process_chunk(chunk, rho_base=8000.0, rho_top=7500.0)
+    for i in range(len(chunk["vol"])):
+        n = chunk["num_sides"][i]
+        geo_type = "Cilindro (Padrão)" if n == 0 else "Prisma Regular (Polígono)"
+        args = (geo_type, n, chunk["vol"][i], chunk["c_base"][i], chunk["c_lat"][i])
+        opt_dim, opt_h, min_cost, k_area, _ = calculate_optimal_geometry(*args)
+        total_mass, z_cm, _, _, _ = calculate_mass_properties(*args, 8000.0, 7500.0)
+        np.testing.assert_allclose(
+            [result[c][i] for c in cli.OUTPUT_COLUMNS], [opt_dim, opt_h, min_cost, k_area, total_mass, z_cm], rtol=1e-12
+        )
+
+
+def test_process_chunk_rejects_bad_prism_rows():
+    chunk = {"vol": np.array([100.0, 200.0]), "c_base": np.array([10.0, 10.0]), "c_lat": np.array([20.0, 20.0])}
+    # Prisma sem coluna num_sides (padrão 0) não pode virar inf/NaN em silêncio
+    with pytest.raises(ValueError, match="num_sides"):
+        cli.process_chunk(dict(chunk, geo_type=np.array(["Prisma Regular (Polígono)"] * 2)))
+    for bad in (2.0, 4.5, np.nan):
+        with pytest.raises(ValueError, match="num_sides"):
+            cli.process_chunk(dict(chunk, num_sides=np.array([0.0, bad])))
+
+
+def test_process_chunk_requires_columns():
+    with pytest.raises(ValueError, match="c_lat"):
+        cli.process_chunk({"vol": np.ones(2), "c_base": np.ones(2)})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_streams_csv_in_chunks(tmp_path, workers):
+    pd = pytest.importorskip("pandas")
+    chunk = _chunk(1000, seed=1)
+    source = tmp_path / "projetos.csv"
+    pd.DataFrame(chunk).to_csv(source, index=False)
+    output = tmp_path / "resultados.csv"
+
+    rows, _ = cli.run(str(source), str(output), chunk_size=128, workers=workers, log=io.StringIO())
+    written = pd.read_csv(output)
+    assert rows == len(written) == 1000
+    expected = cli.process_chunk(chunk)
+    for name in cli.OUTPUT_COLUMNS:
+        np.testing.assert_allclose(written[name].to_numpy(), expected[name], rtol=1e-12)
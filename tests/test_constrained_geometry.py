@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.controllers import optimization_logic as opt
+
+CYLINDER = "Cilindro (Padrão)"
+PRISM = "Prisma Regular (Polígono)"
+
+
+def _designs(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    num_sides = rng.choice([0, 3, 4, 6, 8, 12], n)
+    return (np.where(num_sides == 0, CYLINDER, PRISM), num_sides, rng.uniform(1, 50_000, n),
+            rng.uniform(1, 100, n), rng.uniform(1, 100, n))
+
+
+def _cost(x, is_cyl, n, vol, c_lid, c_floor, c_lat, c_weld):
+    """Custo direto (áreas e costuras), sem a forma reduzida do otimizador."""
+    k_area = np.where(is_cyl, np.pi, n / (4 * np.tan(np.pi / np.where(is_cyl, 4, n))))
+    perimeter = np.where(is_cyl, 2 * np.pi, n) * x
+    h = vol / (k_area * x**2)
+    return k_area * x**2 * (c_lid + c_floor) + perimeter * h * c_lat + c_weld * (2 * perimeter + np.where(is_cyl, 1, n) * h)
+
+
+@pytest.mark.parametrize("warm_start", [True, False])
+def test_without_weld_and_limits_matches_lagrange(warm_start):
+    geo_type, num_sides, vol, c_base, c_lat = _designs()
+    opt_dim, opt_h, min_cost, k_area, status = opt.calculate_constrained_geometry_batch(
+        geo_type, num_sides, vol, c_base, c_base, c_lat, warm_start=warm_start
+    )
+    expected = opt.calculate_optimal_geometry_batch(geo_type, num_sides, vol, c_base, c_lat, method="formula")
+    for got, want in zip((opt_dim, opt_h, min_cost, k_area), expected):
+        np.testing.assert_allclose(got, want, rtol=1e-9)
+    assert (status == opt.OPT_FREE).all()
+
+
+def test_weld_optimum_beats_neighbours():
+    geo_type, num_sides, vol, c_lid, c_lat = _designs(50, seed=1)
+    c_floor, c_weld = 2 * c_lid, 500.0
+    opt_dim, opt_h, min_cost, _, status = opt.calculate_constrained_geometry_batch(
+        geo_type, num_sides, vol, c_lid, c_floor, c_lat, c_weld
+    )
+    is_cyl = geo_type == CYLINDER
+    args = (is_cyl, num_sides, vol, c_lid, c_floor, c_lat, c_weld)
+    np.testing.assert_allclose(min_cost, _cost(opt_dim, *args), rtol=1e-12)
+    for factor in (0.999, 1.001):
+        assert (_cost(opt_dim * factor, *args) > min_cost).all()
+    assert (status == opt.OPT_FREE).all()
+
+
+def test_active_limits_and_infeasible_rows():
+    free = opt.calculate_optimal_geometry(CYLINDER, 0, 1000.0, 20.0, 10.0)
+    opt_dim, opt_h, min_cost, _, status = opt.calculate_constrained_geometry_batch(
+        CYLINDER, 0, 1000.0, 20.0, 20.0, 10.0,
+        max_height=[np.inf, 0.5 * free[1], np.inf, 1.0],
+        max_width=[np.inf, np.inf, free[0], 1.0],
+    )
+    assert status.tolist() == [opt.OPT_FREE, opt.OPT_HEIGHT_LIMIT, opt.OPT_WIDTH_LIMIT, opt.OPT_INFEASIBLE]
+    assert opt_h[1] == pytest.approx(0.5 * free[1])
+    assert 2 * opt_dim[2] == pytest.approx(free[0])
+    # Restrição ativa só pode encarecer; a linha inviável não tem solução
+    assert min_cost[0] == pytest.approx(free[2])
+    assert (min_cost[1:3] > free[2]).all()
+    assert np.isnan(opt_dim[3]) and np.isnan(min_cost[3])
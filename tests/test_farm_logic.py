@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from src.controllers import farm_logic
+
+
+@pytest.fixture(scope="module")
+def farm():
+    designs = farm_logic.farm_designs(300, (10, 20_000), "Cilindro (Padrão)", 0, 20.0, 10.0, mixed=True, seed=3)
+    return designs, farm_logic.build_farm(designs)
+
+
+def test_layout_has_no_overlaps(farm):
+    designs, (_, cx, cy, radius, _) = farm
+    dist = np.hypot(cx[:, None] - cx[None, :], cy[:, None] - cy[None, :])
+    clearance = dist - (radius[:, None] + radius[None, :])
+    np.fill_diagonal(clearance, np.inf)
+    assert clearance.min() > 0
+    assert abs(cx.mean()) < 0.1 * np.ptp(cx) and abs(cy.mean()) < 0.1 * np.ptp(cy)  # parque centrado
+
+
+def test_mesh_volume_matches_designs(farm):
+    """Volume fechado de cada tanque (teorema da divergência): exato no prisma."""
+    designs, (mesh, _, _, radius, segments) = farm
+    faces = np.stack([mesh["i"], mesh["j"], mesh["k"]], axis=1).astype(np.intp)
+    assert faces.max() < mesh["x"].size and mesh["i"].dtype == np.uint16
+    owner = mesh["tank"][faces]
+    assert (owner == owner[:, :1]).all()  # nenhum triângulo liga dois tanques
+
+    p = np.stack([mesh["x"], mesh["y"], mesh["z"]], axis=1)[faces]
+    signed = np.einsum("ij,ij->i", p[:, 0], np.cross(p[:, 1], p[:, 2])) / 6
+    volume = np.bincount(owner[:, 0], weights=signed, minlength=radius.size)
+    # Polígono de s lados inscrito no círculo de raio r: área = s·r²·sen(2π/s)/2
+    expected = segments * radius**2 * np.sin(2 * np.pi / segments) / 2 * designs["h"]
+    np.testing.assert_allclose(volume, expected, rtol=1e-9)
+    prism = ~designs["is_cyl"]
+    np.testing.assert_allclose(volume[prism], designs["vol"][prism], rtol=1e-9)
+    assert segments[prism].tolist() == designs["num_sides"][prism].tolist()
+
+
+def test_lod_refines_near_and_large_tanks(farm):
+    designs, (_, cx, cy, radius, segments) = farm
+    cyl = designs["is_cyl"]
+    assert set(segments[cyl]) <= set(farm_logic.LOD_LEVELS)
+    light = farm_logic.lod_segments(designs["is_cyl"], designs["num_sides"], radius, cx, cy, designs["h"],
+                                    farm_logic.LOD_TOL_PX_LIGHT, 32)
+    assert (light <= segments).all() and light[cyl].max() <= 32
+
+    # Mesmo tanque, cada vez maior: o número de segmentos nunca diminui
+    one = lambda r: farm_logic.lod_segments(np.array([True]), np.array([0]), np.array([r]), np.zeros(1),
+                                            np.zeros(1), np.array([10.0]))[0]
+    levels = [one(r) for r in (0.5, 2, 8, 32, 128)]
+    assert levels == sorted(levels) and levels[0] < levels[-1]
+
+
+def test_empty_farm():
+    designs = farm_logic.farm_designs(0, (10, 100), "Cilindro (Padrão)", 0, 20.0, 10.0)
+    cx, cy = farm_logic.farm_layout(np.zeros(0))
+    assert cx.size == cy.size == 0
+    mesh = farm_logic.farm_mesh(cx, cy, np.zeros(0), designs["h"], np.zeros(0, dtype=np.intp))
+    assert mesh["x"].size == mesh["i"].size == 0
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.controllers import montecarlo_logic
+from src.controllers.optimization_logic import calculate_optimal_geometry
+from src.controllers.physics_logic import calculate_mass_properties
+
+PARAMS = dict(geo_type="Prisma Regular (Polígono)", num_sides=6, vol=800.0, c_base=30.0, c_lat=12.0,
+              rho_base=8000.0, rho_top=7500.0)
+REL_STD = {"c_base": 0.2, "c_lat": 0.1, "vol": 0.05}
+
+
+def test_zero_uncertainty_reproduces_the_deterministic_design():
+    samples = montecarlo_logic.sample_chunk(0, 4, 0, rel_std={}, **PARAMS)
+    opt_dim, opt_h, min_cost, _, _ = calculate_optimal_geometry("Prisma Regular (Polígono)", 6, 800.0, 30.0, 12.0)
+    total_mass = calculate_mass_properties("Prisma Regular (Polígono)", 6, 800.0, 30.0, 12.0, 8000.0, 7500.0)[0]
+    for name, value in (("opt_dim", opt_dim), ("opt_h", opt_h), ("min_cost", min_cost), ("total_mass", total_mass)):
+        np.testing.assert_allclose(samples[name], value, rtol=1e-12)
+
+
+def test_streaming_summary_matches_full_sample():
+    n_samples, chunk_size = 25_000, 4_000
+    result = montecarlo_logic.run_monte_carlo(**PARAMS, rel_std=REL_STD, n_samples=n_samples, chunk_size=chunk_size, seed=3)
+    chunks = [montecarlo_logic.sample_chunk(i, min(chunk_size, n_samples - i * chunk_size), 3, rel_std=REL_STD, **PARAMS)
+              for i in range(-(-n_samples // chunk_size))]
+    for name in montecarlo_logic.MC_METRICS:
+        values = np.concatenate([c[name] for c in chunks])
+        assert values.size == n_samples
+        s = result[name]
+        assert np.isclose(s["mean"], values.mean(), rtol=1e-12)
+        assert np.isclose(s["std"], values.std(ddof=1), rtol=1e-9)
+        assert (s["min"], s["max"]) == (values.min(), values.max())
+        assert s["hist"].sum() == n_samples
+        bin_width = s["edges"][1] - s["edges"][0]
+        for p, estimate in s["percentiles"].items():
+            assert abs(estimate - np.percentile(values, p)) <= bin_width
+
+
+def test_result_does_not_depend_on_workers():
+    kwargs = dict(PARAMS, rel_std=REL_STD, n_samples=6_000, chunk_size=1_000, seed=7)
+    serial = montecarlo_logic.run_monte_carlo(**kwargs, workers=1)
+    parallel = montecarlo_logic.run_monte_carlo(**kwargs, workers=2)
+    for name in montecarlo_logic.MC_METRICS:
+        assert serial[name]["mean"] == parallel[name]["mean"]
+        np.testing.assert_array_equal(serial[name]["hist"], parallel[name]["hist"])
+
+
+def test_lognormal_draws_keep_the_requested_mean_and_spread():
+    samples = montecarlo_logic.sample_chunk(0, 200_000, 1, rel_std={"vol": 0.3}, **PARAMS)
+    # O volume sorteado volta da geometria: V = k_area·L²·H
+    k_area = 6 / (4 * np.tan(np.pi / 6))
+    vol = k_area * samples["opt_dim"]**2 * samples["opt_h"]
+    assert vol.mean() == pytest.approx(800.0, rel=0.01)
+    assert vol.std() / vol.mean() == pytest.approx(0.3, rel=0.02)
+    assert vol.min() > 0
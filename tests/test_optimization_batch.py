@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.controllers.optimization_logic import calculate_optimal_geometry, calculate_optimal_geometry_batch
+
+CYLINDER = "Cilindro (Padrão)"
+PRISM = "Prisma Regular (Polígono)"
+
+
+def _fleet(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    num_sides = rng.choice([0, 3, 4, 5, 6, 8, 12, 40], n)
+    return {
+        "geo_type": np.where(num_sides == 0, CYLINDER, PRISM),
+        "num_sides": num_sides,
+        "vol": rng.uniform(1, 50_000, n),
+        "c_base": rng.uniform(1, 100, n),
+        "c_lat": rng.uniform(1, 100, n),
+    }
+
+
+def _scalar(d):
+    rows = [calculate_optimal_geometry(*row)[:4] for row in zip(d["geo_type"], d["num_sides"], d["vol"], d["c_base"], d["c_lat"])]
+    return np.array(rows).T
+
+
+@pytest.mark.parametrize("method", ["formula", "table"])
+def test_batch_matches_scalar(method):
+    d = _fleet()
+    batch = calculate_optimal_geometry_batch(d["geo_type"], d["num_sides"], d["vol"], d["c_base"], d["c_lat"], method=method)
+    np.testing.assert_allclose(np.array(batch), _scalar(d), rtol=1e-12)
+
+
+def test_boolean_geo_type_and_broadcasting():
+    """geo_type booleano (True = cilindro) e escalares broadcastados contra arrays."""
+    vol = np.array([10.0, 100.0, 1000.0])
+    by_label = calculate_optimal_geometry_batch(PRISM, 6, vol, 20.0, 10.0)
+    by_flag = calculate_optimal_geometry_batch(np.array(False), 6, vol, 20.0, 10.0)
+    np.testing.assert_allclose(np.array(by_label), np.array(by_flag))
+    assert by_label[0].shape == (3,)
+
+    cylinders = calculate_optimal_geometry_batch(True, 0, vol, 20.0, 10.0)
+    for i, v in enumerate(vol):
+        np.testing.assert_allclose([c[i] for c in cylinders], calculate_optimal_geometry(CYLINDER, 0, v, 20.0, 10.0)[:4])
+
+
+def test_optimum_minimizes_cost():
+    """O ótimo de Lagrange é o mínimo da curva de custo com o volume fixo."""
+    from src.controllers.optimization_logic import cost_at_dimension
+
+    for geo_type, n in ((CYLINDER, 0), (PRISM, 3), (PRISM, 8)):
+        opt_dim, _, min_cost, k_area, _ = calculate_optimal_geometry(geo_type, n, 500.0, 30.0, 12.0)
+        around = cost_at_dimension(opt_dim * np.array([0.9, 0.99, 1.01, 1.1]), 500.0, 30.0, 12.0, geo_type, n, k_area)
+        assert np.all(around > min_cost)
+        assert np.isclose(cost_at_dimension(opt_dim, 500.0, 30.0, 12.0, geo_type, n, k_area), min_cost)
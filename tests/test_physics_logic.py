@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from src.controllers import physics_logic
+
+CYLINDER = "Cilindro (Padrão)"
+PRISM = "Prisma Regular (Polígono)"
+
+
+def _designs(n=100, seed=0):
+    rng = np.random.default_rng(seed)
+    num_sides = rng.choice([0, 3, 5, 8], n)
+    return (np.where(num_sides == 0, CYLINDER, PRISM), num_sides, rng.uniform(10, 5000, n),
+            rng.uniform(5, 50, n), rng.uniform(5, 50, n))
+
+
+def test_batch_matches_scalar():
+    designs = _designs()
+    batch = physics_logic.calculate_mass_properties_batch(*designs, 8000.0, 7500.0)
+    for i, row in enumerate(zip(*designs)):
+        total_mass, z_cm, opt_h, _, B = physics_logic.calculate_mass_properties(*row, 8000.0, 7500.0)
+        np.testing.assert_allclose([b[i] for b in batch], [total_mass, z_cm, opt_h, B], rtol=1e-12)
+
+
+def test_linear_profile_matches_closed_form():
+    designs = _designs()
+    total_mass, z_cm, _, _ = physics_logic.calculate_mass_properties_batch(*designs, 8000.0, 7500.0)
+    profile_mass, profile_z, _ = physics_logic.calculate_mass_properties_profile(
+        *designs, physics_logic.linear_profile(8000.0, 7500.0)
+    )
+    np.testing.assert_allclose(profile_mass, total_mass, rtol=1e-12)
+    np.testing.assert_allclose(profile_z, z_cm, rtol=1e-12)
+
+
+def test_step_profile_and_partial_fill_are_exact():
+    # Duas camadas: 1000 kg/m³ até meia altura, 800 acima; tanque de 10 m com 2 m² de base
+    profile = physics_logic.make_profile((0.0, 0.5, 1.0), (1000.0, 800.0), kind="step")
+    mass, z_cm = physics_logic.integrate_profile(profile, 10.0, 2.0, fill_level=[1.0, 0.75, 0.25, 0.0])
+    expected_mass = np.array([2 * (5 * 1000 + 5 * 800), 2 * (5 * 1000 + 2.5 * 800), 2 * 2.5 * 1000, 0.0])
+    expected_z = np.array([(5000 * 2.5 + 4000 * 7.5) / 9000, (5000 * 2.5 + 2000 * 6.25) / 7000, 1.25])
+    np.testing.assert_allclose(mass, expected_mass, rtol=1e-12)
+    np.testing.assert_allclose(z_cm[:3], expected_z, rtol=1e-12)
+    assert np.isnan(z_cm[3])  # tanque vazio não tem centro de massa
+
+
+def test_smooth_profile_converges_to_analytic_integral():
+    """rho(zeta) = 1000·e^(-zeta): massa = A·H·1000·(1 - e^-1)."""
+    rho = lambda zeta: 1000.0 * np.exp(-zeta)
+    mass, z_cm = physics_logic.integrate_profile(rho, 4.0, 3.0, n_nodes=8)
+    assert np.isclose(mass, 3.0 * 4.0 * 1000.0 * (1 - np.exp(-1)), rtol=1e-13)
+    assert np.isclose(z_cm, 4.0 * (1 - 2 * np.exp(-1)) / (1 - np.exp(-1)), rtol=1e-13)
+
+
+def test_invalid_profile():
+    with pytest.raises(ValueError):
+        physics_logic.make_profile((0.0, 1.0), (1.0, 2.0), kind="step")
+    with pytest.raises(ValueError):
+        physics_logic.make_profile((0.0, 1.0), (1.0, 2.0), kind="spline")
+
+
+@pytest.mark.parametrize("z_knots, rho_knots, kind, message", [
+    ((0.2, 0.8), (1000.0, 1000.0), "linear", "de 0 a 1"),        # não cobre [0, 1]: perderia massa
+    ((0.0, 0.6), (1000.0, 1000.0), "linear", "de 0 a 1"),
+    ((0.0, 0.7, 0.3, 1.0), (1.0, 2.0, 3.0, 4.0), "linear", "crescentes"),
+    ((0.0, 0.5, 0.5, 1.0), (1.0, 2.0, 3.0), "step", "crescentes"),
+    ((0.0, np.nan, 1.0), (1.0, 2.0, 3.0), "linear", "finitos"),
+    ((0.0, 1.0), (1.0, np.inf), "linear", "finitos"),
+    ((0.0,), (), "step", "nós"),
+])
+def test_rejected_knots(z_knots, rho_knots, kind, message):
+    with pytest.raises(ValueError, match=message):
+        physics_logic.make_profile(z_knots, rho_knots, kind=kind)
+
+
+def test_full_profile_integrates_from_the_base():
+    """Densidade constante em nós 0..1: massa = rho·A·H e nunca negativa abaixo do primeiro segmento."""
+    profile = physics_logic.make_profile((0.0, 0.2, 0.8, 1.0), (1000.0,) * 4)
+    mass, _ = physics_logic.integrate_profile(profile, 10.0, 1.0, fill_level=[1.0, 0.1, 0.0])
+    np.testing.assert_allclose(mass, [10_000.0, 1_000.0, 0.0], atol=1e-9)
@@ -0,0 +1,70 @@
+import json
+import threading
+
+import pytest
+
+from src.utils import profiling
+
+
+@pytest.fixture(autouse=True)
+def clean_profiling():
+    profiling.reset()
+    yield
+    profiling.set_enabled(profiling.ENABLED_BY_ENV)
+    profiling.reset()
+
+
+def test_disabled_span_is_shared_noop():
+    profiling.set_enabled(False)
+    with profiling.span("fase"):
+        pass
+    assert profiling.span("a") is profiling.span("b")
+    assert profiling.summary() == []
+
+
+def test_enabled_span_records_duration():
+    profiling.set_enabled(True)
+    for _ in range(3):
+        with profiling.span("fase"):
+            pass
+    (row,) = profiling.summary()
+    assert row["fase"] == "fase" and row["n"] == 3 and row["max"] >= row["p50"] >= 0
+
+
+def test_enabling_is_local_to_the_caller_context():
+    """Uma sessão com ?debug=1 (outra thread de rerun) não liga a medição das demais."""
+    profiling.set_enabled(False)
+    seen = {}
+
+    def debug_session():
+        profiling.set_enabled(True)
+        with profiling.span("debug"):
+            pass
+        seen["debug"] = profiling.enabled()
+
+    thread = threading.Thread(target=debug_session)
+    thread.start()
+    thread.join()
+
+    with profiling.span("outra"):
+        pass
+    assert seen["debug"] is True and profiling.enabled() is False
+    assert [row["fase"] for row in profiling.summary()] == ["debug"]
+
+
+def test_new_threads_start_from_the_environment_default():
+    profiling.set_enabled(not profiling.ENABLED_BY_ENV)
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(profiling.enabled()))
+    thread.start()
+    thread.join()
+    assert seen == [profiling.ENABLED_BY_ENV]
+
+
+def test_sample_window_and_export(tmp_path):
+    for i in range(profiling.MAX_SAMPLES + 10):
+        profiling.record("fase", i * 1e-3)
+    profiling.record_payload("grafico", 2048, False)
+    data = json.loads(open(profiling.export(tmp_path / "t.json"), encoding="utf-8").read())
+    assert len(data["samples_ms"]["fase"]) == profiling.MAX_SAMPLES
+    assert data["payload_bytes"] == {"grafico": 2048}
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+import cli
+from src.controllers.optimization_logic import calculate_optimal_geometry
+from src.controllers.physics_logic import calculate_mass_properties
+from src.utils import result_store
+from src.utils.result_store import ResultStore, design_key, design_keys
+
+CYLINDER = "Cilindro (Padrão)"
+PRISM = "Prisma Regular (Polígono)"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "cache" / "results.db"), max_entries=3)
+
+
+def test_round_trip_and_counters(store):
+    key = design_key("optimal_geometry", True, 0, 1000, 20, 10)
+    assert store.get("optimal_geometry", key) is None
+    store.put("optimal_geometry", key, (1.5, np.float64(2.5), "Raio (r)"))
+    assert store.get("optimal_geometry", key) == [1.5, 2.5, "Raio (r)"]
+    # O tipo faz parte da chave: o mesmo projeto em outro tipo é outra entrada
+    mass_key = design_key("mass_properties", True, 0, 1000, 20, 10)
+    assert store.get_many("mass_properties", [mass_key, mass_key]) == {}
+
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["puts"], stats["entries"]) == (1, 3, 1, 1)
+    other = ResultStore(store.path)
+    other.add_counters(store.take_counters())
+    assert store.take_counters() == {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+    assert other.stats()["hit_rate"] == pytest.approx(0.25)
+
+
+def test_key_normalization():
+    base = design_key("optimal_geometry", False, 6, 1000, 20, 10)
+    assert design_key("optimal_geometry", False, 6.0, 1000.0000000001, 20, 10) == base
+    assert design_key("optimal_geometry", False, 6, 1000.001, 20, 10) != base
+    assert design_key("optimal_geometry", False, 5, 1000, 20, 10) != base
+    # Lados não inteiros não são truncados para a entrada do inteiro abaixo
+    assert design_key("optimal_geometry", False, 6.7, 1000, 20, 10) != base
+    assert len(set(design_keys("optimal_geometry", False, [6, 6.7, 6.2, 7], 1000, 20, 10))) == 4
+    assert design_key("mass_properties", False, 6, 1000, 20, 10) != base
+    # Cilindros ignoram num_sides
+    assert design_key("optimal_geometry", True, 0, 1000, 20, 10) == design_key("optimal_geometry", True, 7, 1000, 20, 10)
+
+
+def test_batch_keys_match_scalar_keys():
+    rng = np.random.default_rng(0)
+    is_cyl = rng.random(50) < 0.5
+    n, vol, c_base, c_lat = rng.choice([3, 4, 8], 50), rng.uniform(1, 1e4, 50), rng.uniform(1, 99, 50), 10.0
+    keys = design_keys("mass_properties", is_cyl, n, vol, c_base, c_lat, 8000.0, 7500.0)
+    assert keys == [design_key("mass_properties", *row, c_lat, 8000.0, 7500.0) for row in zip(is_cyl, n, vol, c_base)]
+
+
+def test_lru_eviction(store, monkeypatch):
+    monkeypatch.setattr(result_store, "EVICT_EVERY", 1)
+    keys = [design_key("optimal_geometry", True, 0, vol, 20, 10) for vol in range(1, 6)]
+    now = [1000.0]
+    monkeypatch.setattr(result_store.time, "time", lambda: now[0])
+    for i, key in enumerate(keys[:3]):
+        now[0] += 1
+        store.put("optimal_geometry", key, (i,))
+
+    # A primeira é lida de novo (fica recente); as duas seguintes saem primeiro
+    now[0] += result_store.TOUCH_INTERVAL_S + 1
+    store.get("optimal_geometry", keys[0])
+    for i, key in enumerate(keys[3:], start=3):
+        now[0] += 1
+        store.put("optimal_geometry", key, (i,))
+    assert set(store.get_many("optimal_geometry", keys)) == {keys[0], keys[3], keys[4]}
+    assert store.stats()["evictions"] == 2
+
+
+def test_reads_only_rewrite_stale_access_times(store, monkeypatch):
+    key = design_key("optimal_geometry", True, 0, 1000, 20, 10)
+    now = [1000.0]
+    monkeypatch.setattr(result_store.time, "time", lambda: now[0])
+    store.put("optimal_geometry", key, (1.0,))
+    last_access = lambda: store._connect().execute("SELECT last_access FROM results").fetchone()[0]
+
+    now[0] += result_store.TOUCH_INTERVAL_S / 2
+    store.get("optimal_geometry", key)
+    assert last_access() == 1000.0
+    now[0] += result_store.TOUCH_INTERVAL_S
+    store.get("optimal_geometry", key)
+    assert last_access() == now[0]
+
+
+def test_formula_version_bump_drops_old_entries(store, monkeypatch):
+    key = design_key("optimal_geometry", True, 0, 1000, 20, 10)
+    store.put("optimal_geometry", key, (1.0,))
+    monkeypatch.setitem(result_store.FORMULA_VERSIONS, "optimal_geometry", 99)
+    reopened = ResultStore(store.path)
+    assert reopened.get("optimal_geometry", key) is None
+    assert reopened.stats()["entries"] == 0
+
+
+def test_cli_entries_are_served_to_the_app(tmp_path, monkeypatch):
+    from src.utils import cache_helper
+
+    path = str(tmp_path / "results.db")
+    chunk = {"vol": np.array([1000.0, 250.0]), "c_base": np.array([20.0, 5.0]), "c_lat": np.array([10.0, 30.0]),
+             "num_sides": np.array([0.0, 6.0])}
+    cli.process_chunk(chunk, store_path=path)
+    monkeypatch.setenv("TANK_RESULT_STORE", path)
+    monkeypatch.setattr(result_store, "_default_store", None)
+
+    def not_cached():
+        raise AssertionError("o app recalculou um resultado publicado pelo CLI")
+
+    for geo_type, n, vol, c_base, c_lat in ((CYLINDER, 0, 1000.0, 20.0, 10.0), (PRISM, 6, 250.0, 5.0, 30.0)):
+        geometry = cache_helper.stored("optimal_geometry", not_cached, geo_type, n, vol, c_base, c_lat)
+        assert geometry[4] == calculate_optimal_geometry(geo_type, n, vol, c_base, c_lat)[4]
+        np.testing.assert_allclose(geometry[:4], calculate_optimal_geometry(geo_type, n, vol, c_base, c_lat)[:4],
+                                   rtol=1e-12)
+        mass = cache_helper.stored("mass_properties", not_cached, geo_type, n, vol, c_base, c_lat, 8000.0, 7500.0)
+        np.testing.assert_allclose(mass, calculate_mass_properties(geo_type, n, vol, c_base, c_lat, 8000.0, 7500.0),
+                                   rtol=1e-12)
+
+
+def test_non_integer_sides_do_not_hit_the_integer_entry(store):
+    key_6 = design_key("optimal_geometry", False, 6, 1000, 20, 10)
+    store.put("optimal_geometry", key_6, (1.0, 2.0, 3.0, 4.0, "Lado (L)"))
+    assert store.get("optimal_geometry", design_key("optimal_geometry", False, 6.7, 1000, 20, 10)) is None
+    assert store.get("optimal_geometry", design_key("optimal_geometry", False, 6.0, 1000, 20, 10)) is not None
@@ -0,0 +1,81 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.controllers.sensor_logic import FleetEstimator, MIN_READINGS, SEQUENTIAL_BELOW
+from src.controllers.thermal_logic import calculate_time_to_failure, cooling_temperature
+
+
+def _readings(k, t_amb, t_initial, times):
+    """Leituras exatas de Newton para cada tanque, embaralhadas num lote só."""
+    ids = np.repeat(np.arange(k.size), times.size)
+    t = np.tile(times, k.size)
+    temp = cooling_temperature(t, np.repeat(t_amb, times.size), np.repeat(t_initial, times.size), np.repeat(k, times.size))
+    order = np.random.default_rng(1).permutation(ids.size)
+    return ids[order], t[order], temp[order]
+
+
+def test_rls_recovers_k_and_ambient():
+    rng = np.random.default_rng(0)
+    k, t_amb = rng.uniform(0.05, 0.3, 40), rng.uniform(20, 40, 40)
+    estimator = FleetEstimator(capacity=8)
+    estimator.update(*_readings(k, t_amb, np.full(40, 5.0), np.arange(0, 6, 0.1)))
+
+    ids, k_est, t_amb_est, t_now, t_last, count = estimator.estimates()
+    assert ids.tolist() == list(range(40))
+    # Resta o viés do prior fraco (INITIAL_P) e o da diferença central
+    np.testing.assert_allclose(k_est, k, rtol=5e-3)
+    np.testing.assert_allclose(t_amb_est, t_amb, rtol=5e-3)
+    assert (count == 59).all() and np.allclose(t_last, 5.9)
+
+    # Previsão rolante = solução exata a partir da última leitura
+    _, ttf = estimator.time_to_critical(18.0)
+    np.testing.assert_allclose(ttf, calculate_time_to_failure(t_amb, t_now, 18.0, k), rtol=1e-2)
+
+
+def test_batches_in_pieces_match_one_batch():
+    k, t_amb = np.array([0.1, 0.2]), np.array([30.0, 35.0])
+    ids, t, temp = _readings(k, t_amb, np.array([5.0, 8.0]), np.arange(0, 3, 0.25))
+    whole, pieces = FleetEstimator(), FleetEstimator()
+    whole.update(ids, t, temp)
+    order = np.argsort(t, kind="stable")
+    for part in np.array_split(order, 5):
+        pieces.update(ids[part], t[part], temp[part])
+    for name in ("theta0", "theta1", "count"):
+        np.testing.assert_allclose(pieces.state[name][:2], whole.state[name][:2], rtol=1e-12)
+
+
+def test_needs_min_readings_and_rejects_negative_ids():
+    estimator = FleetEstimator()
+    estimator.update([0, 1], [0.0, 0.0], [5.0, 30.0])
+    _, ttf = estimator.time_to_critical(25.0)
+    assert np.isnan(ttf[0]) and ttf[1] == 0.0  # o tanque 1 já está acima do limite
+    estimator.update([0] * MIN_READINGS, [1.0, 2.0, 3.0], [6.0, 7.0, 8.0])
+    assert estimator.risk_table(25.0)["tanque"].tolist() == [1, 0]
+    with pytest.raises(ValueError):
+        estimator.update([-1], [0.0], [5.0])
+
+
+def test_sequential_tail_matches_vectorized_rounds():
+    """Um tanque sozinho vai para o laço escalar; o mesmo tanque repetido em várias colunas, para as rodadas."""
+    times = np.arange(0, 20, 0.1)
+    temp = cooling_temperature(times, 30.0, 5.0, 0.15) + np.random.default_rng(2).normal(0, 0.01, times.size)
+    single, fleet = FleetEstimator(), FleetEstimator()
+    single.update(np.zeros(times.size), times, temp)
+    copies = SEQUENTIAL_BELOW + 4
+    fleet.update(np.repeat(np.arange(copies), times.size), np.tile(times, copies), np.tile(temp, copies))
+    for name in ("theta0", "theta1", "p00", "p01", "p11", "last_t", "last_T", "count"):
+        np.testing.assert_allclose(single.state[name][0], fleet.state[name][:copies], rtol=1e-12)
+
+
+def test_replaying_a_long_log_stays_fast():
+    """50k leituras de um único tanque (replay de um log) num lote só: O(1) por leitura."""
+    times = np.arange(50_000) * 0.001
+    temp = cooling_temperature(times, 30.0, 5.0, 0.1)
+    estimator = FleetEstimator()
+    start = time.perf_counter()
+    estimator.update(np.zeros(times.size, dtype=int), times, temp)
+    assert time.perf_counter() - start < 1.0
+    assert estimator.estimates()[5][0] == times.size - 1
+    assert estimator.estimates()[1][0] == pytest.approx(0.1, rel=1e-3)
@@ -0,0 +1,86 @@
+import socket
+import time
+
+import numpy as np
+import pytest
+
+from src.utils import sensor_sources
+from src.utils.sensor_sources import FileTail, SocketSource, parse_lines
+
+
+def test_parse_lines_fast_path_and_fallback():
+    ids, t, temp = parse_lines("0,0.5,20.1\n1,0.5,21.0\n")
+    assert ids.dtype == np.intp and ids.tolist() == [0, 1]
+    assert t.tolist() == [0.5, 0.5] and temp.tolist() == [20.1, 21.0]
+
+    ids, t, temp = parse_lines("# cabeçalho\n0,1,20\n\nlixo\n1,2\n2,x,3\n3,4,25.5\n")
+    assert ids.tolist() == [0, 3] and t.tolist() == [1.0, 4.0] and temp.tolist() == [20.0, 25.5]
+    assert parse_lines("  \n")[0].size == 0
+
+
+def test_file_tail_reads_increments_and_survives_truncation(tmp_path):
+    path = tmp_path / "leituras.csv"
+    tail = FileTail(str(path))
+    assert tail.read_new()[0].size == 0  # arquivo ainda não existe
+
+    path.write_text("0,0,10\n1,0,1")
+    assert tail.read_new()[0].tolist() == [0]  # a linha sem quebra espera o resto
+    with open(path, "a") as f:
+        f.write("1\n2,0,12\n")
+    assert tail.read_new()[2].tolist() == [11.0, 12.0]
+    assert tail.read_new()[0].size == 0
+
+    path.write_text("5,1,30\n")
+    assert tail.read_new()[0].tolist() == [5]
+    assert FileTail(str(path), from_start=False).read_new()[0].size == 0
+
+
+def _wait_for(source, n, timeout=5.0):
+    got = []
+    deadline = time.monotonic() + timeout
+    while sum(len(ids) for ids in got) < n and time.monotonic() < deadline:
+        got.append(source.read_new()[0])
+        time.sleep(0.01)
+    return np.concatenate(got).tolist()
+
+
+def test_socket_source_collects_lines_and_frees_the_port_on_close():
+    source = SocketSource(port=0)
+    host, port = source.address
+    client = socket.create_connection((host, port))
+    client.sendall(b"0,0,10\n1,0,")
+    client.sendall(b"11\n")
+    assert _wait_for(source, 2) == [0, 1]
+
+    source.close()
+    assert not source._thread.is_alive()
+    client.settimeout(5)
+    assert client.recv(1) == b""  # a conexão aberta foi encerrada
+    client.close()
+    with socket.socket() as probe:
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        probe.bind((host, port))
+
+
+def test_default_feed_follows_the_server_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(sensor_sources, "_default_feed", None)
+    monkeypatch.setattr(sensor_sources, "_default_source", None)
+    monkeypatch.delenv("TANK_SENSOR_SOURCE", raising=False)
+    assert sensor_sources.default_feed() is None
+
+    first = tmp_path / "a.csv"
+    first.write_text("0,0,10\n0,1,12\n")
+    monkeypatch.setenv("TANK_SENSOR_SOURCE", f"arquivo:{first}")
+    feed = sensor_sources.default_feed()
+    assert sensor_sources.default_feed() is feed
+    assert feed.poll() == 2
+
+    monkeypatch.setenv("TANK_SENSOR_SOURCE", "socket:127.0.0.1:0")
+    socket_feed = sensor_sources.default_feed()
+    assert socket_feed is not feed and isinstance(socket_feed.source, SocketSource)
+    monkeypatch.delenv("TANK_SENSOR_SOURCE")
+    assert sensor_sources.default_feed() is None
+    assert not socket_feed.source._thread.is_alive()  # a fonte anterior foi fechada
+
+    with pytest.raises(ValueError):
+        sensor_sources.open_feed("serial", "/dev/ttyS0")
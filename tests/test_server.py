@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+import server
+from src.controllers.optimization_logic import calculate_optimal_geometry
+from src.controllers.physics_logic import calculate_mass_properties
+from src.controllers.thermal_logic import calculate_time_to_failure
+
+
+def _post(service, path, payload):
+    return service.dispatch("POST", path, json.dumps(payload).encode())
+
+
+def test_optimize_and_mass_match_scalar():
+    service = server.TankService(window=0.001)
+    designs = [{"vol": 1000, "c_base": 20, "c_lat": 10}, {"vol": 250, "c_base": 5, "c_lat": 30, "num_sides": 6}]
+
+    async def scenario():
+        return await _post(service, "/optimize", designs), await _post(service, "/mass", designs[1])
+
+    (status, optimized), (mass_status, mass) = asyncio.run(scenario())
+    assert status == mass_status == 200
+    for design, record in zip(designs, optimized):
+        n = design.get("num_sides", 0)
+        geo_type = "Cilindro (Padrão)" if n == 0 else "Prisma Regular (Polígono)"
+        expected = calculate_optimal_geometry(geo_type, n, design["vol"], design["c_base"], design["c_lat"])
+        np.testing.assert_allclose([record[c] for c in ("opt_dim", "opt_h", "min_cost", "k_area")], expected[:4], rtol=1e-12)
+    total_mass, z_cm, opt_h, _, B = calculate_mass_properties("Prisma Regular (Polígono)", 6, 250, 5, 30, 8000.0, 7500.0)
+    np.testing.assert_allclose([mass["total_mass"], mass["z_cm"], mass["opt_h"], mass["B"]], [total_mass, z_cm, opt_h, B],
+                               rtol=1e-12)
+
+
+def test_thermal_returns_null_when_it_never_crosses():
+    service = server.TankService(window=0.001)
+    payload = [{"t_amb": 30, "t_initial": 5, "t_critical": 25, "k_const": 0.1},
+               {"t_amb": 20, "t_initial": 5, "t_critical": 25, "k_const": 0.1}]
+    status, records = asyncio.run(_post(service, "/thermal", payload))
+    assert status == 200
+    assert records[0]["time_to_fail"] == pytest.approx(calculate_time_to_failure(30, 5, 25, 0.1))
+    assert records[1]["time_to_fail"] is None
+
+
+def test_concurrent_requests_share_one_batch():
+    service = server.TankService(window=0.05)
+
+    async def scenario():
+        requests = [_post(service, "/optimize", {"vol": 100 + i, "c_base": 20, "c_lat": 10}) for i in range(20)]
+        return await asyncio.gather(*requests)
+
+    responses = asyncio.run(scenario())
+    assert all(status == 200 for status, _ in responses)
+    assert [r["opt_dim"] for _, r in responses] == sorted(r["opt_dim"] for _, r in responses)
+    stats = service.health()["endpoints"]["/optimize"]
+    assert stats == {"batches": 1, "designs": 20, "mean_batch": 20.0}
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("POST", "/optimize", {"vol": 1, "c_base": 1}, 400),
+    ("POST", "/optimize", {"vol": "muito", "c_base": 1, "c_lat": 1}, 400),
+    ("POST", "/optimize", [], 400),
+    ("POST", "/nada", {}, 404),
+    ("GET", "/optimize", {}, 405),
+    ("POST", "/health", {}, 405),
+])
+def test_client_errors(method, path, body, status):
+    service = server.TankService(window=0.001)
+    assert asyncio.run(service.dispatch(method, path, json.dumps(body).encode()))[0] == status
+
+
+@pytest.mark.parametrize("design, message", [
+    ({"vol": 1000, "c_base": 20, "c_lat": 10, "num_sides": 1}, "num_sides"),
+    ({"vol": 1000, "c_base": 20, "c_lat": 10, "num_sides": 2.5}, "num_sides"),
+    ({"vol": 1000, "c_base": 20, "c_lat": 10, "geo_type": "Prisma Regular (Polígono)"}, "num_sides"),
+    ({"vol": -5, "c_base": 20, "c_lat": 10}, "vol"),
+    ({"vol": 1000, "c_base": 0, "c_lat": 10, "num_sides": 6}, "c_base"),
+    ({"vol": 1000, "c_base": 20, "c_lat": float("inf")}, "c_lat"),
+    ({"vol": float("nan"), "c_base": 20, "c_lat": 10}, "vol"),
+])
+@pytest.mark.parametrize("path", ["/optimize", "/mass"])
+def test_invalid_geometry_gets_400(path, design, message):
+    service = server.TankService(window=0.001)
+    valid = {"vol": 100, "c_base": 20, "c_lat": 10}
+    status, payload = asyncio.run(_post(service, path, [valid, design]))
+    assert status == 400
+    assert payload["erro"].startswith("Projeto 1:") and message in payload["erro"]
+
+
+def test_cylinder_label_ignores_num_sides():
+    service = server.TankService(window=0.001)
+    design = {"vol": 1000, "c_base": 20, "c_lat": 10, "num_sides": 1, "geo_type": "Cilindro (Padrão)"}
+    status, record = asyncio.run(_post(service, "/optimize", design))
+    assert status == 200
+    assert record["min_cost"] == pytest.approx(calculate_optimal_geometry("Cilindro (Padrão)", 0, 1000, 20, 10)[2])
+
+
+async def _raw_exchange(request):
+    """Sobe o serviço numa porta livre, envia bytes crus e devolve a resposta inteira."""
+    service = server.TankService(window=0.001)
+    srv = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    async with srv:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return response
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_invalid_content_length_gets_400(length):
+    response = asyncio.run(_raw_exchange(b"POST /optimize HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert "Content-Length" in json.loads(response.split(b"\r\n\r\n", 1)[1])["erro"]
+
+
+def test_keep_alive_serves_several_requests_per_connection():
+    body = json.dumps({"vol": 1000, "c_base": 20, "c_lat": 10}).encode()
+    request = b"POST /optimize HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    closing = b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n"
+    response = asyncio.run(_raw_exchange(request * 2 + closing))
+    assert response.count(b"HTTP/1.1 200 OK") == 3
+
+
+def test_oversized_body_gets_413():
+    request = b"POST /optimize HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (server.MAX_BODY_BYTES + 1)
+    assert asyncio.run(_raw_exchange(request)).startswith(b"HTTP/1.1 413 ")
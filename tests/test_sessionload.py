@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import sessionload
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _row(sessions, throughput, p95_ms):
+    return {"sessions": sessions, "throughput": throughput, "p95_ms": p95_ms}
+
+
+@pytest.mark.parametrize("rows, expected, reason", [
+    ([_row(1, 2.0, 100), _row(2, 3.9, 150), _row(4, 7.0, 300)], None, "não saturou"),
+    ([_row(1, 2.0, 100), _row(2, 3.9, 150), _row(4, 4.1, 300)], 4, "vazão"),  # cresceu só 5%
+    ([_row(1, 2.0, 100), _row(2, 3.9, 1500), _row(4, 7.0, 3000)], 2, "SLO"),
+    ([_row(1, 2.0, 1200)], 1, "SLO"),
+    ([], None, "não saturou"),
+])
+def test_saturation(rows, expected, reason):
+    n_saturated, message = sessionload.saturation(rows, slo_ms=1000)
+    assert n_saturated == expected
+    assert reason in message
+
+
+def test_short_run_without_errors(tmp_path):
+    """Duas sessões por 2 s num processo limpo: reruns medidos, nenhum erro."""
+    output = tmp_path / "carga.json"
+    done = subprocess.run([sys.executable, "sessionload.py", "--sessions", "2", "--duration", "2", "--think", "0",
+                           "--json", str(output)], cwd=ROOT, capture_output=True, text=True, timeout=300)
+    assert done.returncode == 0, done.stderr
+    (row,) = json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert row["sessions"] == 2 and row["reruns"] > 0 and row["errors"] == 0
+    assert row["p50_ms"] <= row["p95_ms"] <= row["max_ms"]
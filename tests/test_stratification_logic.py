@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.controllers import stratification_logic as strat
+from src.controllers.thermal_logic import calculate_time_to_failure, cooling_temperature
+
+
+def _dense(lower, diag, upper, tank):
+    return np.diag(diag[:, tank]) + np.diag(lower[1:, tank], -1) + np.diag(upper[:-1, tank], 1)
+
+
+def test_thomas_matches_dense_solve():
+    rng = np.random.default_rng(0)
+    n_z, n_tanks = 40, 7
+    lower, upper = rng.uniform(-1, 0, (n_z, n_tanks)), rng.uniform(-1, 0, (n_z, n_tanks))
+    lower[0] = upper[-1] = 0.0
+    diag = 2.5 + rng.random((n_z, n_tanks))
+    rhs = rng.normal(size=(n_z, n_tanks))
+
+    x = strat.solve_factored(strat.factor_tridiagonal(lower, diag, upper), rhs.copy())
+    for tank in range(n_tanks):
+        np.testing.assert_allclose(x[:, tank], np.linalg.solve(_dense(lower, diag, upper, tank), rhs[:, tank]),
+                                   rtol=1e-12, atol=1e-14)
+
+
+def test_operator_conserves_heat_without_exchange():
+    lower, diag, upper, amb, ground = strat.heat_operator([3.0, 12.0], 25, 0.05, 0.0, 0.0, 0.0)
+    assert not amb.any() and not ground.any()
+    for tank in range(2):
+        # Linhas somam zero (perfil uniforme é estacionário) e o calor total Σ w·T se conserva
+        a = _dense(lower, diag, upper, tank)
+        np.testing.assert_allclose(a.sum(axis=1), 0.0, atol=1e-12)
+        width = np.full(25, 1.0)
+        width[[0, -1]] = 0.5
+        np.testing.assert_allclose(width @ a, 0.0, atol=1e-12)
+    with pytest.raises(ValueError):
+        strat.heat_operator(3.0, 1, 0.05, 0.1, 0.0, 0.0)
+
+
+def test_uniform_profile_reduces_to_newton():
+    k, t_amb, dt = np.array([0.05, 0.2]), np.array([30.0, 35.0]), 0.01
+    t, temp, z, time_to_fail, z_fail = strat.solve_heat_profile(
+        t_amb, 5.0, 25.0, k, [4.0, 9.0], 24.0, dt=dt, n_z=20, h_top=0.0, h_bottom=0.0, output_step=1.0
+    )
+    assert z.shape == (2, 20)
+    np.testing.assert_allclose(temp, np.broadcast_to(temp[..., :1], temp.shape), rtol=1e-12)  # perfil continua uniforme
+    # Euler implícito: T_n = (T_{n-1} + dt·k·T_amb) / (1 + dt·k), exato passo a passo
+    steps = np.rint(t / dt)[:, None]
+    discrete = t_amb + (5.0 - t_amb) * (1 + dt * k) ** -steps
+    np.testing.assert_allclose(temp[..., 0], discrete, rtol=1e-12)
+    np.testing.assert_allclose(temp[..., 0], cooling_temperature(t[:, None], t_amb, 5.0, k), rtol=2e-3)
+    np.testing.assert_allclose(time_to_fail, calculate_time_to_failure(t_amb, 5.0, 25.0, k, 24.0), rtol=1e-2)
+    assert np.isnan(time_to_fail[0])  # o tanque mais lento não chega ao limite em 24 h
+
+
+def test_memmap_resume_is_bit_identical(tmp_path, monkeypatch):
+    rng = np.random.default_rng(1)
+    args = (rng.uniform(30, 40, 5), 5.0, 25.0, rng.uniform(0.05, 0.3, 5), rng.uniform(3, 20, 5), 48.0)
+    options = dict(dt=0.1, output_step=1.0, n_z=12, chunk_size=8)
+    full = strat.solve_heat_profile_to_memmap(str(tmp_path / "inteira"), *args, **options)
+
+    stream = strat.stream_heat_profile
+
+    def interrupted(*a, **kw):
+        chunks = stream(*a, **kw)
+        yield next(chunks)
+        yield next(chunks)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(strat, "stream_heat_profile", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        strat.solve_heat_profile_to_memmap(str(tmp_path / "retomada"), *args, **options)
+    monkeypatch.setattr(strat, "stream_heat_profile", stream)
+    resumed = strat.solve_heat_profile_to_memmap(str(tmp_path / "retomada"), *args, **options)
+
+    for a, b in zip(full, resumed):
+        np.testing.assert_array_equal(np.asarray(a), np.asarray(b))
+    assert np.asarray(full[1]).shape == (49, 5, 12)
+    with pytest.raises(ValueError):
+        strat.solve_heat_profile_to_memmap(str(tmp_path / "retomada"), *args, **dict(options, n_z=10))
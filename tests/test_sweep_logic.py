@@ -0,0 +1,53 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.controllers import sweep_logic
+from src.controllers.optimization_logic import calculate_optimal_geometry
+
+AXES = {"ratio": [0.5, 1.0, 2.0, 4.0], "num_sides": [0, 3, 4, 6], "vol": [50.0, 1000.0, 8000.0]}
+
+
+def test_grid_matches_scalar_optimizer():
+    cost, hw_ratio = sweep_logic.evaluate_grid(AXES)
+    assert cost.shape == (4, 4, 3)
+    c_lat = sweep_logic.SWEEP_AXES["c_lat"]
+    for (i, ratio), (j, n), (k, vol) in itertools.product(*(enumerate(v) for v in AXES.values())):
+        geo_type = "Cilindro (Padrão)" if n == 0 else "Prisma Regular (Polígono)"
+        opt_dim, opt_h, min_cost, _, _ = calculate_optimal_geometry(geo_type, n, vol, ratio * c_lat, c_lat)
+        width = 2 * opt_dim if n == 0 else opt_dim / np.sin(np.pi / n)
+        assert np.isclose(cost[i, j, k], min_cost, rtol=1e-12)
+        assert np.isclose(hw_ratio[i, j, k], opt_h / width, rtol=1e-12)
+
+
+@pytest.mark.parametrize("tile_size", [1, 7, 48, 10_000])
+def test_tiling_does_not_change_results(tile_size):
+    reference = sweep_logic.evaluate_grid(AXES)
+    tiled = sweep_logic.evaluate_grid(AXES, tile_size=tile_size)
+    np.testing.assert_array_equal(np.array(tiled), np.array(reference))
+
+
+@pytest.mark.parametrize("tile_size", [1, 5, 10_000])
+def test_find_cheapest_matches_full_grid(tile_size):
+    axes = dict(AXES, num_sides=[2, 0, 3, 4, 6])  # 2 lados é inviável (NaN) e não pode ganhar
+    cost, _ = sweep_logic.evaluate_grid(axes)
+    best_cost, best_point = sweep_logic.find_cheapest(axes, tile_size=tile_size)
+    index = np.unravel_index(np.nanargmin(cost), cost.shape)
+    assert best_cost == cost[index]
+    assert best_point == {name: float(values[i]) for (name, values), i in zip(axes.items(), index)}
+
+
+def test_infeasible_points_are_nan():
+    cost, hw_ratio = sweep_logic.evaluate_grid({"num_sides": [1, 2, 4.5, 4], "vol": [-10.0, 100.0]})
+    assert np.isnan(cost[:3]).all() and np.isnan(hw_ratio[:3]).all()
+    assert np.isnan(cost[3, 0]) and np.isfinite(cost[3, 1])
+
+
+def test_find_cheapest_without_feasible_design():
+    assert sweep_logic.find_cheapest({"num_sides": [1, 2], "vol": [100.0, 200.0]}, tile_size=1) == (np.inf, None)
+
+
+def test_unknown_axis():
+    with pytest.raises(ValueError, match="altura"):
+        sweep_logic.evaluate_grid({"altura": [1.0]})
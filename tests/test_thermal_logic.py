@@ -0,0 +1,50 @@
+import numpy as np
+
+from src.controllers import thermal_logic
+
+
+def test_crossing_time_lands_on_critical_temperature():
+    rng = np.random.default_rng(0)
+    t_amb, t_initial = rng.uniform(25, 40, 500), rng.uniform(0, 15, 500)
+    t_critical, k_const = rng.uniform(16, 24, 500), rng.uniform(0.01, 0.5, 500)
+    time_to_fail = thermal_logic.calculate_time_to_failure(t_amb, t_initial, t_critical, k_const)
+    assert np.isfinite(time_to_fail).all()
+    np.testing.assert_allclose(thermal_logic.cooling_temperature(time_to_fail, t_amb, t_initial, k_const), t_critical,
+                               rtol=1e-12)
+
+
+def test_crossing_time_matches_fine_grid_scan():
+    t = np.linspace(0, 100, 1_000_001)
+    temp = thermal_logic.cooling_temperature(t, 35.0, 4.0, 0.07)
+    first = t[np.argmax(temp >= 25.0)]
+    assert abs(thermal_logic.calculate_time_to_failure(35.0, 4.0, 25.0, 0.07) - first) <= t[1]
+
+
+def test_batch_matches_scalar_calls():
+    rng = np.random.default_rng(1)
+    args = (rng.uniform(0, 40, 200), rng.uniform(0, 40, 200), rng.uniform(10, 30, 200), rng.uniform(-0.1, 0.4, 200))
+    batch = thermal_logic.calculate_time_to_failure(*args, time_span=72.0)
+    scalar = [thermal_logic.calculate_time_to_failure(*row, time_span=72.0) for row in zip(*args)]
+    np.testing.assert_array_equal(batch, scalar)
+
+
+def test_edge_cases():
+    ttf = thermal_logic.calculate_time_to_failure
+    assert ttf(30.0, 26.0, 25.0, 0.1) == 0.0                  # já começa acima do limite
+    assert np.isnan(ttf(20.0, 5.0, 25.0, 0.1))                # o ambiente nunca chega ao limite
+    assert np.isnan(ttf(35.0, 25.0 - 1e-9, 25.0, 0.0))        # k = 0: a temperatura não muda
+    assert np.isnan(ttf(30.0, 5.0, 25.0, 0.1, time_span=10))  # cruza depois do horizonte (t* ≈ 16.1 h)
+    assert np.isclose(ttf(30.0, 5.0, 25.0, 0.1), np.log(5.0) / 0.1)
+    # k < 0 (instável): afasta-se do ambiente e cruza acima dele
+    assert np.isclose(ttf(10.0, 15.0, 25.0, -0.1), np.log(3.0) / 0.1)
+
+
+def test_simulate_cooling_passes_through_the_crossing():
+    t_values, temp_values, time_to_fail = thermal_logic.simulate_cooling(30.0, 5.0, 25.0, 48.0, 0.1)
+    assert time_to_fail == thermal_logic.calculate_time_to_failure(30.0, 5.0, 25.0, 0.1)
+    i = np.flatnonzero(t_values == time_to_fail)
+    assert i.size == 1 and np.isclose(temp_values[i[0]], 25.0)
+    assert np.all(np.diff(t_values) >= 0) and t_values.size == 101
+
+    _, _, never = thermal_logic.simulate_cooling(20.0, 5.0, 25.0, 48.0, 0.1)
+    assert never is None
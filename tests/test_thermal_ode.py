@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.controllers import thermal_logic
+
+
+def _exact_daily(t, t_mean, amplitude, t_initial, k, period=24.0, peak_hour=15.0):
+    """Solução exata de dT/dt = -k·(T - T_amb(t)) com T_amb senoidal (regime + transiente)."""
+    w = 2 * np.pi / period
+    particular = lambda s: t_mean + amplitude * k / (k**2 + w**2) * (k * np.cos(w * (s - peak_hour)) + w * np.sin(w * (s - peak_hour)))
+    return particular(t) + (t_initial - particular(0.0)) * np.exp(-k * t)
+
+
+def test_constant_ambient_matches_analytic_solution():
+    k = np.array([0.05, 0.2, 0.6])
+    t, temp, time_to_fail = thermal_logic.solve_cooling_ode(lambda t: 30.0, 5.0, 25.0, k, 72.0, output_step=0.5)
+    exact = thermal_logic.cooling_temperature(t[:, None], 30.0, 5.0, k)
+    np.testing.assert_allclose(temp, exact, atol=2e-5)
+    np.testing.assert_allclose(time_to_fail, thermal_logic.calculate_time_to_failure(30.0, 5.0, 25.0, k), atol=1e-5)
+
+
+def test_daily_cycle_matches_exact_solution():
+    t_mean, amplitude, k = np.array([22.0, 28.0]), np.array([6.0, 9.0]), np.array([0.1, 0.3])
+    t, temp, _ = thermal_logic.solve_cooling_ode(thermal_logic.daily_ambient(t_mean, amplitude), 4.0, 99.0, k, 24 * 7,
+                                                 output_step=1.0)
+    np.testing.assert_allclose(temp, _exact_daily(t[:, None], t_mean, amplitude, 4.0, k), atol=2e-5)
+
+
+def test_crossing_inside_a_step_is_found():
+    """O pico cruza o limite e volta dentro de um passo longo: a saída densa ainda acha o cruzamento."""
+    t = np.linspace(0, 48, 200_001)
+    exact = _exact_daily(t, 20.0, 10.0, 20.0, 0.5)
+    t_critical = exact.max() - 0.05
+    expected = t[np.argmax(exact >= t_critical)]
+
+    ambient = thermal_logic.daily_ambient(20.0, 10.0)
+    _, _, coarse = thermal_logic.solve_cooling_ode(ambient, 20.0, t_critical, 0.5, 48, rtol=1e-3, atol=1e-3, max_step=12)
+    assert abs(coarse[0] - expected) < 0.05
+
+
+def test_chunked_stream_equals_single_solve():
+    ambient = thermal_logic.tabulated_ambient([0, 12, 24, 48], [[20, 35, 25, 30], [10, 15, 12, 14]])
+    t, temp, time_to_fail = thermal_logic.solve_cooling_ode(ambient, [5.0, 5.0], 24.0, [0.2, 0.2], 48, output_step=0.25)
+    chunks = list(thermal_logic.stream_cooling_ode(ambient, [5.0, 5.0], 24.0, [0.2, 0.2], 48, output_step=0.25,
+                                                   chunk_size=16))
+    assert len(chunks) > 1
+    np.testing.assert_array_equal(np.concatenate([c[0] for c in chunks]), t)
+    np.testing.assert_array_equal(np.concatenate([c[1] for c in chunks]), temp)
+    np.testing.assert_array_equal(chunks[-1][2], time_to_fail)
+    np.testing.assert_allclose(np.diff(t), 0.25)
+    assert np.isfinite(time_to_fail[0]) and np.isnan(time_to_fail[1])  # o segundo nunca passa de 15 °C
+
+
+def test_non_finite_ambient_fails_instead_of_accepting_nan():
+    with pytest.raises(ValueError, match="h_min"):
+        thermal_logic.solve_cooling_ode(lambda t: np.nan if t > 3 else 20.0, 5.0, 25.0, 0.2, 48)
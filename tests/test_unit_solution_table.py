@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.controllers import optimization_logic as opt
+
+PRISM = "Prisma Regular (Polígono)"
+
+
+def test_table_columns_match_lagrange_formula():
+    table = opt.unit_solution_table()
+    assert table.shape == (4, opt.UNIT_TABLE_MAX_SIDES + 1)
+    assert not table.flags.writeable
+    assert np.isnan(table[:, 1:3]).all()
+
+    # Com V = c_lat = c_base = 1 a escala é 1 e o ótimo é a própria solução unitária
+    n = np.arange(3, opt.UNIT_TABLE_MAX_SIDES + 1)
+    formula = opt._optimal_geometry_formula(np.zeros(n.size, bool), n.astype(float), 1.0, 1.0, 1.0)
+    np.testing.assert_allclose(table[:, 3:], np.array(formula), rtol=1e-13)
+    cylinder = opt._optimal_geometry_formula(np.array([True]), np.array([0.0]), 1.0, 1.0, 1.0)
+    np.testing.assert_allclose(table[:, 0], np.ravel(cylinder), rtol=1e-13)
+
+
+@pytest.mark.parametrize("num_sides", [opt.UNIT_TABLE_MAX_SIDES, opt.UNIT_TABLE_MAX_SIDES + 1, 5000, 4.5, 2, 1])
+def test_rows_outside_the_table_fall_back_to_the_formula(num_sides):
+    vol = np.array([10.0, 1000.0, 50_000.0])
+    table = opt.calculate_optimal_geometry_batch(PRISM, num_sides, vol, 20.0, 10.0, method="table")
+    formula = opt.calculate_optimal_geometry_batch(PRISM, num_sides, vol, 20.0, 10.0, method="formula")
+    np.testing.assert_allclose(np.array(table), np.array(formula), rtol=1e-12)
+
+
+def test_unknown_method_fails():
+    with pytest.raises(ValueError):
+        opt.calculate_optimal_geometry_batch(PRISM, 6, 1000.0, 20.0, 10.0, method="spline")